@@ -0,0 +1,24 @@
+from services.session_io import run_session_dir
+import argparse
+import sys
+
+
+# Runs a day's session scripts in one process (or a process pool), see
+# session_io.run_session_dir
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python bank-atm-batch.py <input_file> <session_dir> <output_dir> [merged_file] [--workers N]")
+    parser.add_argument("input_file")  # current bank accounts
+    parser.add_argument("session_dir")  # session scripts
+    parser.add_argument("output_dir")  # bank account transaction files, one per session
+    parser.add_argument("merged_file", nargs="?")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run sessions across this many processes (default 1: all in this process)")
+    args = parser.parse_args()
+
+    failed = run_session_dir(args.input_file, args.session_dir, args.output_dir, args.merged_file, args.workers)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from models.transaction import Transaction
+from services.session_io import run_session_dir
+import argparse
+import os
+import re
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multi_day import MultiDayRunner
+
+
+# Removes one carriage return at the end of each line, like daily.sh's
+# `sed -i 's/\r$//'`, rewriting only the scripts that have any
+def normalize_line_endings(session_dir):
+    for name in sorted(os.listdir(session_dir)):
+        path = os.path.join(session_dir, name)
+        if not name.endswith(".txt") or not os.path.isfile(path):
+            continue
+        with open(path, "r", newline="") as file:
+            text = file.read()
+        if "\r" in text:
+            with open(path, "w", newline="") as file:
+                file.write(re.sub(r"\r(?=\n|\Z)", "", text))
+
+
+# Copies source over target if it exists (a failed first day leaves no new files)
+def copy_if_exists(source, target):
+    if os.path.exists(source):
+        shutil.copyfile(source, target)
+
+
+# Runs the week weekly.sh runs, with the same inputs and output files, in one
+# process: the frontend sessions of each day run in process
+# (session_io.run_session_dir) and the backend keeps the accounts in memory
+# from day to day (multi_day.MultiDayRunner) instead of re-reading
+# master_input.txt. The working and new accounts files are still written
+# every day; the frontend logs in against current_input.txt as before.
+def main():
+    parser = argparse.ArgumentParser(usage="python bank-week.py [--days N] [--workers N]")
+    parser.add_argument("--input-base", default="week_script_inputs")  # session scripts in dayN/
+    parser.add_argument("--output-dir", default="week_script_outputs")
+    parser.add_argument("--start-current", default="Current_Bank_Accounts.txt")
+    parser.add_argument("--start-master", default="../old_master_accounts.txt")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run each day's sessions across this many processes (default 1: in this process)")
+    args = parser.parse_args()
+
+    working_current = "current_input.txt"
+    working_master = "master_input.txt"
+
+    shutil.rmtree(args.output_dir, ignore_errors=True)
+    os.makedirs(args.output_dir)
+    for name in ("new_current_accounts.txt", "new_master_accounts.txt", working_current, working_master):
+        if os.path.exists(name):
+            os.remove(name)
+    shutil.copyfile(args.start_current, working_current)
+    shutil.copyfile(args.start_master, working_master)
+
+    runner = MultiDayRunner(working_master)
+    for day in range(1, args.days + 1):
+        print(f"📅 Running Day {day}")
+
+        input_folder = os.path.join(args.input_base, f"day{day}")
+        merged_file = os.path.join(args.output_dir, f"merged_day{day}.txt")
+        temp_output_folder = f"temp_day{day}_outputs"
+        shutil.rmtree(temp_output_folder, ignore_errors=True)
+        os.makedirs(temp_output_folder)
+        open(merged_file, "w").close()
+
+        print("🔧 Normalizing line endings in session input files...")
+        normalize_line_endings(input_folder)
+
+        print("🔁 Running frontend sessions...")
+        Transaction.accounts_cache = None  # current_input.txt was rewritten, possibly with the same size and mtime
+        run_session_dir(working_current, input_folder, temp_output_folder, merged_file, args.workers)
+        sys.stdout.flush()
+
+        print("🚀 Running backend with merged transactions...")
+        if runner.run_day(merged_file):
+            print("✅ Backend executed successfully.")
+        else:
+            print("❌ Backend failed to run properly.")
+        print("✅ Daily integration complete!")
+
+        # Merge all session outputs from this day into a single dayN.txt file
+        with open(os.path.join(args.output_dir, f"day{day}.txt"), "wb") as merged:
+            for name in sorted(os.listdir(temp_output_folder)):
+                if name.endswith(".txt"):
+                    with open(os.path.join(temp_output_folder, name), "rb") as source:
+                        merged.write(source.read())
+
+        # Update input files for the next day
+        copy_if_exists("new_current_accounts.txt", working_current)
+        copy_if_exists("new_master_accounts.txt", working_master)
+
+        print(f"✅ Day {day} complete")
+        print("")
+
+    print(f"🎉 Weekly script complete. All outputs saved in {args.output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
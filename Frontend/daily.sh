@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # --- CONFIG ---
-FRONTEND_SCRIPT="bank-atm.py"
+FRONTEND_SCRIPT="bank-atm-batch.py"
 BACKEND_SCRIPT="../main.py"
 
 # --- INPUT ARGS ---
@@ -10,6 +10,7 @@ MASTER_ACCOUNTS="${2:-../old_master_accounts.txt}"
 SESSION_INPUTS="${3:-daily_script_inputs}"
 SESSION_OUTPUTS="${4:-daily_script_outputs}"
 MERGED_FILE="${5:-../merged_transactions.txt}"
+FRONTEND_WORKERS="${6:-1}"
 
 # --- SETUP ---
 mkdir -p "$SESSION_OUTPUTS"
@@ -22,22 +23,12 @@ done
 
 echo "🔁 Running frontend sessions..."
 
-for INPUT_FILE in "$SESSION_INPUTS"/*.txt; do
-    TEST_NAME=$(basename "$INPUT_FILE" .txt)
-    TRANSACTION_FILE="$SESSION_OUTPUTS/${TEST_NAME}.txt"
-
-    echo "▶️ Session: $TEST_NAME"
-    python3 "$FRONTEND_SCRIPT" "$CURRENT_ACCOUNTS" "$TRANSACTION_FILE" < "$INPUT_FILE"
-
-    if [[ $? -eq 0 ]]; then
-        echo "✅ Output saved to $TRANSACTION_FILE"
-        cat "$TRANSACTION_FILE" >> "$MERGED_FILE"
-    else
-        echo "❌ Error in $TEST_NAME"
-    fi
-
-    echo "-------------------------------------------"
-done
+# Sessions run in one process, or across FRONTEND_WORKERS processes; the
+# transaction files of the sessions that ended normally are streamed into the
+# merged file in session order, checked (41-character records, one "00"
+# end-of-session record each) and indexed by session in merged_transactions.idx
+python3 "$FRONTEND_SCRIPT" "$CURRENT_ACCOUNTS" "$SESSION_INPUTS" "$SESSION_OUTPUTS" "$MERGED_FILE" \
+    --workers "$FRONTEND_WORKERS"
 
 # --- RUN BACKEND ---
 echo "🚀 Running backend with merged transactions..."
@@ -0,0 +1,69 @@
+import os
+
+class AccountsCache:
+    """
+    Parsed view of a current bank accounts file: names, account numbers, the
+    number -> name map, statuses and plans. refresh() stats the file and
+    re-parses it only when its mtime or size changed, so every validation in
+    a session is a dict or set lookup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.signature = None  # (mtime_ns, size) of the file last parsed
+        self.clear()
+
+    def clear(self) -> None:
+        self.names = set()
+        self.numbers = set()
+        self.name_map = {}  # account number -> name
+        self.status_map = {}  # account number -> A or D
+        self.plans = {}  # account number -> plan, see load()
+
+    # Reloads the file if it changed since the last load.
+    # Returns False (and an empty cache) when the file does not exist.
+    def refresh(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.signature = None
+            self.clear()
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self.signature:
+            self.load()
+            self.signature = signature
+        return True
+
+    def load(self) -> None:
+        self.clear()
+        accounts_done = False
+        with open(self.path, "r") as file:
+            for raw_line in file:
+                # Plans follow the old line scan: the last two characters of
+                # the raw line, so only a final line without a newline has one
+                plan = raw_line[-2:].strip()
+                if plan in ("SP", "NP"):
+                    self.plans.setdefault(raw_line[0:5], plan)
+
+                line = raw_line.rstrip('\n')
+                if accounts_done or len(line) < 37:  # skip invalid lines
+                    continue
+
+                account_number = line[0:5]
+                account_name = line[6:26].strip().lower()  # 20-char name, left-justified
+                if account_name == "end_of_file":
+                    accounts_done = True
+                    continue
+
+                self.names.add(account_name)
+                self.numbers.add(account_number)
+                self.name_map[account_number] = account_name
+                self.status_map[account_number] = line[27]  # A or D
+
+    def is_active(self, account_number: str) -> bool:
+        return self.status_map.get(account_number) == 'A'
+
+    def plan(self, account_number: str) -> str:
+        return self.plans.get(account_number, "NP")
@@ -1,5 +1,6 @@
 from models.transaction_logger import TransactionLogger
 from models.limit_manager import LimitManager
+from models.accounts_cache import AccountsCache
 import re
 from services.error_logger import ErrorLogger, LogLevel
 
@@ -9,6 +10,7 @@ class Transaction:
     input_file = None # Stores the current accounts file dynamically
     output_file = None # stores bank account transaction file
     limit_manager = LimitManager(500.0, 1000.0, 2000.0, 99999.99)
+    accounts_cache = None  # AccountsCache of the current accounts file, loaded at login
     
     #-------------------------------------------- Standard Transactions -----------------------------------------------------
     @staticmethod
@@ -66,18 +68,11 @@ class Transaction:
 
     @staticmethod
     def get_account_plan(account_number):
-        try:
-            with open(Transaction.input_file, "r") as file:
-                for line in file:
-                    if line.startswith(account_number):
-                        # Assume fixed format: last two characters are the plan
-                        plan = line[-2:].strip()
-                        if plan in ["SP", "NP"]:
-                            return plan
-        except FileNotFoundError:
+        cache = Transaction.get_accounts_cache(Transaction.input_file)
+        if not cache.refresh():
             print("Error: Current bank accounts file not found.")
         
-        return "NP"  # Default to NP if not found or invalid
+        return cache.plan(account_number)  # Default to NP if not found or invalid
 
     # Withdraws money from a bank account 
     def withdrawal(self, account_type):
@@ -416,8 +411,8 @@ class Transaction:
                 return
 
             # Get next account number
-            bank_accounts = TransactionLogger(new_name, initial_balance, Transaction.output_file)
-            new_account_number = TransactionLogger.next_account_number  # Use static variable
+            bank_accounts = TransactionLogger(new_name, initial_balance, Transaction.output_file, Transaction.input_file)
+            new_account_number = bank_accounts.allocate_account_number()
 
             # Log transaction with the given details
             bank_accounts.log_transaction("05", new_name, new_account_number, initial_balance, "NP")
@@ -544,38 +539,22 @@ class Transaction:
         log_transaction.log_transaction("08", name, account_number, 0, Transaction.get_account_plan(account_number))
 
     # ------- Helper Function to load current bank accounts file -------
+    # Returns the cached accounts, re-parsed only if the file changed since the last call
     @staticmethod
     def read_current_bank_accounts(current_bank_accounts):
-        valid_names = set()
-        valid_account_numbers = set()
-        account_info_map = {}
-        account_status_map = {}
-
-        try:
-            with open(current_bank_accounts, "r") as file:
-                for line in file:
-                    line = line.rstrip('\n')
-                    if len(line) < 37:  # skip invalid lines
-                        continue
-
-                    account_number = line[0:5]
-                    account_name = line[6:26].strip().lower()  # 20-char name, left-justified
-                    account_status = line[27]  # A or D
-
-                    # Optional: Stop parsing at END_OF_FILE
-                    if account_name == "end_of_file":
-                        break
-
-                    valid_names.add(account_name)
-                    valid_account_numbers.add(account_number)
-                    account_info_map[account_number] = account_name
-                    account_status_map[account_number] = account_status
-
-        except FileNotFoundError:
+        cache = Transaction.get_accounts_cache(current_bank_accounts)
+        if not cache.refresh():
             print("Error: Current bank accounts file not found")
             return set(), set(), {}, {}
 
-        return valid_names, valid_account_numbers, account_info_map, account_status_map
+        return cache.names, cache.numbers, cache.name_map, cache.status_map
+
+    # Cache for the given accounts file, replacing the cache of another file
+    @staticmethod
+    def get_accounts_cache(current_bank_accounts):
+        if Transaction.accounts_cache is None or Transaction.accounts_cache.path != current_bank_accounts:
+            Transaction.accounts_cache = AccountsCache(current_bank_accounts)
+        return Transaction.accounts_cache
 
     
     @staticmethod
@@ -1,7 +1,83 @@
+import atexit
 import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from account_allocator import AccountAllocator
+
+class SessionWriter:
+    """
+    Buffered appender for one transaction output file. Lines are kept in
+    memory and written with one write call when the buffer reaches max_bytes,
+    when the oldest buffered line is max_age seconds old (checked on each
+    write) or at flush(); with fsync set every flush is also synced to disk.
+    The file handle stays open until close(). Open writers are flushed from
+    an exit handler, so a session that ends abnormally still keeps its lines.
+    """
+    max_bytes = 64 * 1024
+    max_age = 1.0  # seconds
+    fsync = False
+    writers = {}  # output file -> open SessionWriter
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.file = None  # opened on the first flush, like the old per-line append
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.first_buffered = None
+
+    # Shared writer for the output file, created on first use
+    @staticmethod
+    def for_file(output_file):
+        writer = SessionWriter.writers.get(output_file)
+        if writer is None:
+            writer = SessionWriter.writers[output_file] = SessionWriter(output_file)
+        return writer
+
+    def write(self, line):
+        if not self.buffer:
+            self.first_buffered = time.monotonic()
+        self.buffer.append(line)
+        self.buffered_bytes += len(line)
+        if self.buffered_bytes >= self.max_bytes or time.monotonic() - self.first_buffered >= self.max_age:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.file is None:
+            self.file = open(self.output_file, "a")
+        self.file.write("".join(self.buffer))
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.buffer = []
+        self.buffered_bytes = 0
+
+    # Flushes and closes the file; the next write starts a new writer
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if SessionWriter.writers.get(self.output_file) is self:
+                del SessionWriter.writers[self.output_file]
+
+    @staticmethod
+    def close_all():
+        for writer in list(SessionWriter.writers.values()):
+            writer.close()
+
+
+atexit.register(SessionWriter.close_all)
+
 
 class TransactionLogger:
-    next_account_number = None  # Static variable for all instances
+    allocator = None  # AccountAllocator for all instances, built from the current accounts file
 
     def __init__(self, account_name, amount, output_file, current_accounts_file=None):
         self.account_name = account_name
@@ -9,31 +85,15 @@ class TransactionLogger:
         self.output_file = output_file
         self.current_accounts_file = current_accounts_file
 
-        if TransactionLogger.next_account_number is None:
-            TransactionLogger.next_account_number = (
-                self.get_next_account_number_from_accounts()
-                if current_accounts_file else 1000
-            )
-
-    # Finds the next available account number by checking the transaction log file (output_file)
-    def get_next_account_number_from_accounts(self):
-        if not os.path.exists(self.current_accounts_file):
-            return 1000
-
-        used_numbers = set()
-        with open(self.current_accounts_file, "r") as file:
-            for line in file:
-                if len(line) < 5:
-                    continue
-                acct_num = line[0:5]
-                if acct_num.isdigit():
-                    used_numbers.add(int(acct_num))
-
-        new_number = 1000
-        while new_number in used_numbers:
-            new_number += 1
+        if TransactionLogger.allocator is None and current_accounts_file:
+            TransactionLogger.allocator = AccountAllocator.from_file(current_accounts_file)
 
-        return new_number
+    # Reserves the number for a new account the way the backend assigns it
+    # (highest + 1), so later creates in the session get the numbers after it
+    def allocate_account_number(self):
+        if TransactionLogger.allocator is None:
+            TransactionLogger.allocator = AccountAllocator()
+        return TransactionLogger.allocator.allocate()
 
 
     # Logs a transaction into the provided transaction log file (output_file).
@@ -48,15 +108,15 @@ class TransactionLogger:
         # Format the full transaction line
         transaction_line = f"{transaction_code} {account_holder_name} {account_number} {formatted_amount} {misc_field}"
 
-        with open(self.output_file, "a") as file:
-            file.write(transaction_line + "\n")
+        SessionWriter.for_file(self.output_file).write(transaction_line + "\n")
 
 
-    # Writes the end-of-session transaction to the output file
+    # Writes the end-of-session transaction to the output file and flushes the session's lines
     def write_end_of_session(self):
         end_of_session_line = "00" + " " * 22 + "00000" + " " + "00000.00" + " 00"
 
-        with open(self.output_file, "a") as file:
-            file.write(end_of_session_line + "\n")  # Append newline for proper formatting
+        writer = SessionWriter.for_file(self.output_file)
+        writer.write(end_of_session_line + "\n")  # Append newline for proper formatting
+        writer.close()
         
         # print(f"Logged end-of-session transaction: {end_of_session_line}")
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Session running for the ATM frontend.
+
+atm_session() is the bank-atm.py loop: it reads commands with input() and
+reports with print(). run_script() runs one session in the current process
+with a session script as its input source and any text stream as its
+output sink, returning the exit status bank-atm.py would have exited with
+for the same stdin. Class-level session state (login, limits, the account
+number allocator, open transaction writers) is reset around every session;
+the parsed current accounts file (Transaction.accounts_cache) is kept and
+only re-parsed if the file changes.
+
+run_sessions() runs many sessions, optionally across a process pool, and
+hands back each session's exit status and captured output in session order;
+run_session_dir() does that for a directory of session scripts and merges
+the transaction files (session_merge.SessionMerger, which checks them and
+indexes the sessions), as bank-atm-batch.py and bank-week.py do for a day.
+Sessions only read the current accounts file and each writes its own
+transaction file, so running them concurrently doesn't change any output.
+"""
+
+import io
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
+from models.transaction import Transaction
+from models.transaction_logger import SessionWriter, TransactionLogger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from session_merge import SessionMerger
+
+
+# One ATM session: login, then transactions until logout
+def atm_session(input_file, output_file):
+    print("Welcome to the Banking System!")
+
+    while True:
+        login_result = Transaction.login(input_file, output_file)
+        if login_result == ("Error", None):
+            continue
+
+        account_type, account_name = login_result
+
+        while True:  # Keeps the user logged in until they log out
+            print("Enter transaction type:")
+            transaction_type = input().strip().lower()
+
+            if transaction_type == "logout":
+                transaction = Transaction()
+                transaction.logout()
+                break
+
+            elif transaction_type in ["withdrawal", "deposit", "transfer", "paybill", "create", "delete", "disable", "changeplan"]:
+                transaction = Transaction()
+                getattr(transaction, transaction_type)(account_type)
+            else:
+                print("Invalid transaction type. Try again.")
+
+        break
+
+
+# Puts the class-level session state back to what a fresh process starts with
+def reset_session_state():
+    SessionWriter.close_all()
+    Transaction.is_logged_in = False
+    Transaction.current_user = None
+    Transaction.input_file = None
+    Transaction.output_file = None
+    Transaction.limit_manager.reset_limits()
+    TransactionLogger.allocator = None
+
+
+# Runs one session with `script` (the text bank-atm.py would read from stdin)
+# as its input and `output` as its stdout. An exception that would end
+# bank-atm.py (e.g. EOFError when the script runs out) is printed to stderr
+# and gives exit status 1; the session's transaction lines are still written.
+def run_script(script, input_file, output_file, output=None):
+    reset_session_state()
+    saved_stdin = sys.stdin
+    sys.stdin = io.StringIO(script)
+    try:
+        with redirect_stdout(output if output is not None else sys.stdout):
+            atm_session(input_file, output_file)
+        return 0
+    except SystemExit as exit:
+        if exit.code is None:
+            return 0
+        return exit.code if isinstance(exit.code, int) else 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdin = saved_stdin
+        reset_session_state()
+
+
+# Runs one session with its stdout and stderr captured.
+# Returns (exit status, stdout text, stderr text).
+def run_captured(script, input_file, output_file):
+    output, errors = io.StringIO(), io.StringIO()
+    with redirect_stderr(errors):
+        status = run_script(script, input_file, output_file, output)
+    return status, output.getvalue(), errors.getvalue()
+
+
+# Runs the sessions (scripts[i] writing output_files[i]) and yields
+# run_captured's result for each, in session order. With workers > 1 they
+# run in a process pool; every worker parses the accounts file once.
+def run_sessions(scripts, input_file, output_files, workers=1):
+    if workers <= 1:
+        for script, output_file in zip(scripts, output_files):
+            yield run_captured(script, input_file, output_file)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(run_captured, scripts, [input_file] * len(scripts), output_files)
+
+
+# Runs every session script (*.txt) in session_dir, in name order. Each
+# session's transactions go to output_dir/<name>.txt, exactly as
+# `python3 bank-atm.py input_file output_dir/<name>.txt < script` would write
+# them. Session output is printed in name order whatever the worker count,
+# and with merged_file the transaction files of the sessions that ended
+# normally are merged into it in name order, replacing what it held, and
+# its session index is written next to it.
+# Returns the number of sessions that failed.
+def run_session_dir(input_file, session_dir, output_dir, merged_file=None, workers=1):
+    os.makedirs(output_dir, exist_ok=True)
+    script_names = sorted(name for name in os.listdir(session_dir) if name.endswith(".txt"))
+    scripts = []
+    for script_name in script_names:
+        with open(os.path.join(session_dir, script_name), "r") as file:
+            scripts.append(file.read())
+    transaction_files = [os.path.join(output_dir, script_name) for script_name in script_names]
+
+    failed = 0
+    with ExitStack() as stack:
+        merger = stack.enter_context(SessionMerger(merged_file)) if merged_file else None
+        results = run_sessions(scripts, input_file, transaction_files, workers)
+        for script_name, transaction_file, (status, output, errors) in zip(script_names, transaction_files, results):
+            session_name = script_name[:-len(".txt")]
+            print(f"▶️ Session: {session_name}")
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            sys.stderr.write(errors)
+            sys.stderr.flush()
+
+            if status == 0:
+                print(f"✅ Output saved to {transaction_file}")
+                if merger is not None and os.path.exists(transaction_file):
+                    merger.add(transaction_file)
+            else:
+                print(f"❌ Error in {session_name}")
+                failed += 1
+            print("-------------------------------------------")
+    return failed
@@ -0,0 +1,122 @@
+"""
+Account number allocation shared by the frontend and the backend.
+
+Account numbers are five digits, so the used numbers fit a 100,000-slot
+bitmap (12.5 KB). An AccountAllocator is built in one pass over a master or
+current accounts file (or filled by AccountStore as accounts come and go)
+and hands out new numbers by one of two policies:
+
+- MAX_PLUS_ONE: one above the highest number in use, EMPTY_NEXT when no
+  number is used. This is how the backend has always numbered accounts.
+  Once 99999 is in use it falls back to the lowest free number.
+- LOWEST_FREE: the lowest unused number from `first` up.
+
+Both lookups are O(1) amortized: the highest number only walks down when
+the highest account is released, and the lowest-free cursor only moves up
+except when a number below it is released.
+"""
+
+SLOTS = 100000
+MAX_PLUS_ONE = "max+1"
+LOWEST_FREE = "lowest-free"
+EMPTY_NEXT = 10001  # first number handed out by MAX_PLUS_ONE when nothing is used
+
+
+class AccountAllocator:
+    def __init__(self, policy: str = MAX_PLUS_ONE, first: int = 1000):
+        if policy not in (MAX_PLUS_ONE, LOWEST_FREE):
+            raise ValueError(f"Unknown allocation policy {policy!r}")
+        self.policy = policy
+        self.bits = bytearray(SLOTS // 8)
+        self.used = 0
+        self.highest = None  # highest number in use, None when empty
+        self._cursor = first  # no free number from `first` below this (lowest-free lookup)
+        self._first = first
+
+    # Builds an allocator from a master or current accounts file in one pass
+    # (END_OF_FILE records and lines without a number are skipped). A missing
+    # file gives an empty allocator.
+    @classmethod
+    def from_file(cls, path: str, policy: str = MAX_PLUS_ONE, first: int = 1000):
+        allocator = cls(policy, first)
+        try:
+            with open(path, "r") as file:
+                allocator.mark_all([int(line[0:5]) for line in file
+                                    if line[0:5].isdigit() and line[6:17] != "END_OF_FILE"])
+        except FileNotFoundError:
+            pass
+        return allocator
+
+    def copy(self) -> "AccountAllocator":
+        copied = AccountAllocator(self.policy, self._first)
+        copied.bits = bytearray(self.bits)
+        copied.used = self.used
+        copied.highest = self.highest
+        copied._cursor = self._cursor
+        return copied
+
+    def __contains__(self, number: int) -> bool:
+        return 0 <= number < SLOTS and bool(self.bits[number >> 3] & (1 << (number & 7)))
+
+    def __len__(self) -> int:
+        return self.used
+
+    def mark_used(self, number: int) -> None:
+        if not 0 <= number < SLOTS:
+            raise ValueError(f"Account number {number} is outside 00000-99999")
+        mask = 1 << (number & 7)
+        if self.bits[number >> 3] & mask:
+            return
+        self.bits[number >> 3] |= mask
+        self.used += 1
+        if self.highest is None or number > self.highest:
+            self.highest = number
+
+    # Marks many numbers at once (one bit operation per number, no per-number calls)
+    def mark_all(self, numbers) -> None:
+        numbers = list(numbers)
+        if not numbers:
+            return
+        highest = max(numbers)
+        if min(numbers) < 0 or highest >= SLOTS:
+            raise ValueError("Account numbers must be within 00000-99999")
+        bits = self.bits
+        for number in numbers:
+            bits[number >> 3] |= 1 << (number & 7)
+        self.used = sum(map(int.bit_count, bits))
+        if self.highest is None or highest > self.highest:
+            self.highest = highest
+
+    def release(self, number: int) -> None:
+        if number not in self:
+            return
+        self.bits[number >> 3] &= ~(1 << (number & 7)) & 0xFF
+        self.used -= 1
+        if self._first <= number < self._cursor:
+            self._cursor = number
+        if number == self.highest:
+            # Walk down to the next number still in use
+            while number >= 0 and number not in self:
+                number -= 1
+            self.highest = number if number >= 0 else None
+
+    # Next number the policy would hand out (not reserved), or None when
+    # every number from `first` up is taken. MAX_PLUS_ONE hands out the
+    # lowest free number once 99999 is in use.
+    def next_free(self):
+        if self.policy == MAX_PLUS_ONE:
+            if self.highest is None:
+                return EMPTY_NEXT
+            if self.highest + 1 < SLOTS:
+                return self.highest + 1
+        while self._cursor < SLOTS and self._cursor in self:
+            self._cursor += 1
+        return self._cursor if self._cursor < SLOTS else None
+
+    # Reserves and returns the next number
+    def allocate(self):
+        number = self.next_free()
+        if number is None:
+            raise ValueError("No account numbers left")
+        self.mark_used(number)
+        return number
@@ -1,127 +1,182 @@
+from collections import Counter
+from typing import NamedTuple
 import print_error as error_logger
+import log
+import money
+from account_record import AccountRecord
+from account_store import AccountStore
+from transaction_record import TransactionRecord
+
+class BatchResult(NamedTuple):
+    applied: Counter  # transaction code -> transactions applied
+    rejected: Counter  # transaction code -> transactions rejected
+
 
 class AccountManager:
     def __init__(self, accounts: dict):
-        self.accounts = accounts
+        # Indexed store so creates don't scan every account
+        self.accounts = accounts if isinstance(accounts, AccountStore) else AccountStore(accounts)
+        # Handler per transaction code, called with the padded number of an
+        # existing account and the TransactionRecord; returns whether the
+        # transaction was applied
+        self.handlers = {
+            "01": lambda account_number, t: self.withdrawal(account_number, t.amount),
+            "03": lambda account_number, t: self.paybill(account_number, t.misc, t.amount),
+            "04": lambda account_number, t: self.deposit(account_number, t.amount),
+            "05": lambda account_number, t: self.create_account(t),
+            "06": lambda account_number, t: self.delete_account(account_number),
+            "07": lambda account_number, t: self.disable_account(account_number),
+            "08": lambda account_number, t: self.changeplan(account_number, t.misc),
+        }
     
-    # Processes a transaction and updates the account balances
-    def process_transaction(self, transaction: dict) -> bool:
-        account_number = transaction["account_number"].strip().zfill(5)
-        amount = transaction["amount"]
-        transaction_code = transaction["code"]
+    # Applies one merged-file transaction through the handler for its code and
+    # bumps the account's transaction count when it succeeds. Returns whether
+    # the transaction was applied; an unknown code is fatal. Transaction dicts
+    # are converted to TransactionRecord first. The account number on a create
+    # is only the front end's guess at the new number, so a create acts on no
+    # existing account.
+    def apply_transaction(self, transaction) -> bool:
+        if type(transaction) is not TransactionRecord:
+            transaction = TransactionRecord.from_mapping(transaction)
+        accounts = self.accounts
+        handler = self.handlers.get(transaction.code)
+        if handler is None:
+            error_logger.log_constraint_error(f"Unknown transaction code {transaction.code} in merged transaction file.",
+                "banking_system.py",  # file causing the error
+                fatal=True, category="Unknown Transaction Code")
+
+        if transaction.code == "05":
+            return self.create_account(transaction)
+
+        account_number = transaction.account_number.strip().zfill(5)
+        if account_number not in accounts:
+            error_logger.log_constraint_error("Invalid Account", f"Account {account_number} does not exist.",
+                                              account=account_number)
+            return False
 
-        if account_number not in self.accounts:
-            error_logger.log_constraint_error("Invalid Account", f"Account {account_number} does not exist.")
-            return False
-
-        success = False
-        if transaction_code == "01":  # withdrawalal
-            success = self.withdrawal(account_number, amount)
-        elif transaction_code == "03":  # Paybill
-            success = self.paybill(account_number, transaction["misc"], amount)
-        elif transaction_code == "04":  # Deposit
-            success = self.deposit(account_number, amount)
-        elif transaction_code == "05":  # Create Account
-            success = self.create_account(transaction)
-        elif transaction_code == "06":  # Delete Account
-            success = self.delete_account(account_number)
-        elif transaction_code == "07":  # Disable Account
-            success = self.disable_account(account_number)
-        elif transaction_code == "08":  # Change Plan
-            success = self.changeplan(account_number, transaction["misc"])
-
-        # Ensure transaction count increments on success
-        if success and account_number in self.accounts:
-            self.accounts[account_number]["total_transactions"] += 1  # Increment transaction count
-
-        return success
+        if not handler(account_number, transaction):
+            return False
+
+        # Ensure transaction count increments on success (a deleted account has none)
+        account = accounts.get(account_number)
+        if account is not None:
+            account.total_transactions += 1
+            accounts.mark_dirty(account_number)
+        return True
+
+    # Applies transactions in order; returns per-code applied and rejected counts
+    def apply_batch(self, transactions) -> BatchResult:
+        result = BatchResult(Counter(), Counter())
+        apply_transaction = self.apply_transaction
+        for transaction in transactions:
+            if type(transaction) is not TransactionRecord:
+                transaction = TransactionRecord.from_mapping(transaction)
+            if apply_transaction(transaction):
+                result.applied[transaction.code] += 1
+            else:
+                result.rejected[transaction.code] += 1
+        return result
 
     def is_account_disabled(self, account_number: str) -> bool:
-        return self.accounts[account_number]["status"] == "D"
+        return self.accounts[account_number].status == "D"
 
-    # withdrawals money from an account
-    def withdrawal(self, account_number: str, amount: float) -> bool:
-        if account_number not in self.accounts or self.accounts[account_number]["balance"] < amount:
+    # withdrawals money from an account (amount in cents)
+    def withdrawal(self, account_number: str, amount: int) -> bool:
+        if account_number not in self.accounts or self.accounts[account_number].balance_cents < amount:
             error_logger.log_constraint_error("Insufficient Funds", 
-                f"Account {account_number} has {self.accounts[account_number]['balance']}, cannot withdraw {amount}.")
+                f"Account {account_number} has {money.from_cents(self.accounts[account_number].balance_cents)}, cannot withdraw {money.from_cents(amount)}.",
+                account=account_number)
             return False
         
         if self.is_account_disabled(account_number):
             error_logger.log_constraint_error(
                 f"Cannot withdraw from disabled account {account_number}.",
-                "account_manager.py"
+                "account_manager.py",
+                category="Disabled Account", account=account_number
             )
             return False
         
-        self.accounts[account_number]["balance"] -= amount
+        self.accounts[account_number].balance_cents -= amount
+        self.accounts.mark_dirty(account_number)
 
         return True
     
-    # Pays a bill from the account to an authorized company
-    def paybill(self, account_number: str, company: str, amount: float) -> bool:
+    # Pays a bill from the account to an authorized company (amount in cents)
+    def paybill(self, account_number: str, company: str, amount: int) -> bool:
         if account_number not in self.accounts:
             return False
         
         if self.is_account_disabled(account_number):
             error_logger.log_constraint_error(
                 f"Cannot pay bills from disabled account {account_number}.",
-                "account_manager.py"
+                "account_manager.py",
+                category="Disabled Account", account=account_number
             )
             return False
 
-        if self.accounts[account_number]["balance"] < amount:
+        if self.accounts[account_number].balance_cents < amount:
             error_logger.log_constraint_error("Insufficient Funds", 
-                f"Account {account_number} has {self.accounts[account_number]['balance']}, cannot pay bill {amount}.")
+                f"Account {account_number} has {money.from_cents(self.accounts[account_number].balance_cents)}, cannot pay bill {money.from_cents(amount)}.",
+                account=account_number)
             return False
 
         # Ensure the company is one of the allowed billers
         allowed_companies = ["EC", "CQ", "FI"]
         if company not in allowed_companies:
             error_logger.log_constraint_error("Invalid Payee", 
-                f"Account {account_number} tried to pay an invalid company: {company}.")
+                f"Account {account_number} tried to pay an invalid company: {company}.",
+                account=account_number)
             return False
 
-        self.accounts[account_number]["balance"] -= amount
+        self.accounts[account_number].balance_cents -= amount
+        self.accounts.mark_dirty(account_number)
 
         return True
 
-    # Deposits money into an account
-    def deposit(self, account_number: str, amount: float) -> bool:
+    # Deposits money into an account (amount in cents)
+    def deposit(self, account_number: str, amount: int) -> bool:
         if account_number not in self.accounts:
             return False
         
         if self.is_account_disabled(account_number):
             error_logger.log_constraint_error(
                 f"Cannot deposit into disabled account {account_number}.",
-                "account_manager.py"
+                "account_manager.py",
+                category="Disabled Account", account=account_number
             )
             return False
 
 
-        self.accounts[account_number]["balance"] += amount
+        self.accounts[account_number].balance_cents += amount
+        self.accounts.mark_dirty(account_number)
         return True
 
     # Creates a new bank account
     def create_account(self, transaction: dict) -> bool:
         # Check if the same name already exists
-        for acc in self.accounts.values():
-            if acc["name"] == transaction["name"]:
-                return False
-
-        # Generate a new unique account number
-        max_account_number = max(int(num) for num in self.accounts.keys()) if self.accounts else 10000
-        new_account_number = str(max_account_number + 1).zfill(5)  # Ensure 5-digit format
-
-        self.accounts[new_account_number] = {
-            "account_number": new_account_number,
-            "name": transaction["name"],
-            "status": "A",  # Active by default
-            "balance": transaction["amount"],  # Initial deposit
-            "total_transactions": 0,
-            "plan": transaction["misc"],  # SP or NP
-        }
+        if self.accounts.has_name(transaction["name"]):
+            return False
+
+        # Generate a new unique account number (highest + 1, 5-digit format)
+        new_account_number = self.accounts.next_account_number()
+        if new_account_number is None:
+            error_logger.log_constraint_error(
+                f"Cannot create account for {transaction['name']}: no account numbers left.",
+                "account_manager.py",
+                category="No Account Numbers Left"
+            )
+            return False
+
+        self.accounts[new_account_number] = AccountRecord(
+            int(new_account_number),
+            transaction["name"],
+            "A",  # Active by default
+            transaction["amount"],  # Initial deposit (cents)
+            0,
+            transaction["misc"],  # SP or NP
+        )
 
-        print(f"✅ New account created: {new_account_number} for {transaction['name']}.")
+        log.info("✅ New account created: %s for %s.", new_account_number, transaction["name"])
         return True
 
 
@@ -129,11 +184,11 @@ class AccountManager:
     def delete_account(self, account_number: str) -> bool:
         if account_number not in self.accounts:
             error_logger.log_constraint_error("Cannot delete account", 
-                f"Account {account_number} does not exist.")
+                f"Account {account_number} does not exist.", account=account_number)
             return False
 
         del self.accounts[account_number]
-        print(f"✅ Account {account_number} deleted successfully.")
+        log.info("✅ Account %s deleted successfully.", account_number)
 
         return True
 
@@ -141,11 +196,12 @@ class AccountManager:
     # Disables a bank account
     def disable_account(self, account_number: str) -> bool:
         if account_number in self.accounts:
-            self.accounts[account_number]["status"] = "D"  # Change status to Disabled
-            print(f"✅ Account {account_number} has been disabled.")
+            self.accounts[account_number].status = "D"  # Change status to Disabled
+            self.accounts.mark_dirty(account_number)
+            log.info("✅ Account %s has been disabled.", account_number)
             return True
         error_logger.log_constraint_error("Cannot disable account", 
-                f"Account {account_number} does not exist.")
+                f"Account {account_number} does not exist.", account=account_number)
         return False
 
     # Changes the account transaction plan
@@ -156,20 +212,23 @@ class AccountManager:
         if self.is_account_disabled(account_number):
             error_logger.log_constraint_error(
                 f"Cannot change plan on disabled account {account_number}.",
-                "account_manager.py"
+                "account_manager.py",
+                category="Disabled Account", account=account_number
             )
             return False
 
-        current_plan = self.accounts[account_number]["plan"].strip()
+        current_plan = self.accounts[account_number].plan.strip()
         new_plan = new_plan.strip()
 
         if current_plan != new_plan and new_plan in ("SP", "NP"):
-            self.accounts[account_number]["plan"] = new_plan
+            self.accounts[account_number].plan = new_plan
+            self.accounts.mark_dirty(account_number)
             return True
         else:
             error_logger.log_constraint_error(
                 f"Account {account_number} cannot change from {current_plan} to {new_plan}.",
-                "account_manager.py"
+                "account_manager.py",
+                category="Invalid Plan Change", account=account_number
             )
             return False
 
@@ -0,0 +1,111 @@
+from collections.abc import MutableMapping
+from typing import Optional
+from account_allocator import AccountAllocator
+from account_record import AccountRecord
+
+
+class AccountStore(MutableMapping):
+    """
+    Account number -> AccountRecord mapping used by AccountManager.
+    Keeps a name index and an AccountAllocator of the numbers in use in
+    step with every insert and delete, so duplicate-name checks and new
+    account numbers don't need a scan over all accounts. Plain account dicts stored in it
+    are converted to AccountRecord objects.
+
+    Also tracks changes since clear_changes(): `dirty` holds the account
+    numbers whose record changed (AccountManager and the fee stage call
+    mark_dirty; replacing a record marks it too) and `structure_changed`
+    is set by any insert of a new number or delete.
+    """
+
+    def __init__(self, accounts=None):
+        self._accounts = {}
+        self._names = {}  # name -> number of accounts holding that name
+        self._allocator = AccountAllocator()  # max+1 numbering
+        self.dirty = set()
+        self.structure_changed = False
+        if accounts:
+            self.update(accounts)
+
+    def __getitem__(self, account_number):
+        return self._accounts[account_number]
+
+    def __setitem__(self, account_number, account):
+        if not isinstance(account, AccountRecord):
+            account = AccountRecord.from_mapping(account)
+        self._allocator.mark_used(int(account_number))  # rejects an out-of-range number before any change
+        if account_number in self._accounts:
+            previous = self._accounts[account_number]
+            self._forget_name(previous.name)
+            if previous is not account:
+                self.dirty.add(account_number)
+        else:
+            self.structure_changed = True
+        self._accounts[account_number] = account
+        self._names[account.name] = self._names.get(account.name, 0) + 1
+
+    def __delitem__(self, account_number):
+        account = self._accounts.pop(account_number)
+        self._forget_name(account.name)
+        self.dirty.discard(account_number)
+        self.structure_changed = True
+        self._allocator.release(int(account_number))
+
+    def __iter__(self):
+        return iter(self._accounts)
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __contains__(self, account_number):
+        return account_number in self._accounts
+
+    def get(self, account_number, default=None):
+        return self._accounts.get(account_number, default)
+
+    def __repr__(self):
+        return f"AccountStore({self._accounts!r})"
+
+    def _forget_name(self, name):
+        count = self._names[name] - 1
+        if count:
+            self._names[name] = count
+        else:
+            del self._names[name]
+
+    # Records that the account's fields changed in place
+    def mark_dirty(self, account_number: str) -> None:
+        self.dirty.add(account_number)
+
+    # Returns a copy holding copies of the records, with no changes tracked yet
+    def copy(self) -> "AccountStore":
+        copied = AccountStore()
+        copied._accounts = {account_number: AccountRecord(acc.number, acc.name, acc.status, acc.balance_cents,
+                                                          acc.total_transactions, acc.plan)
+                            for account_number, acc in self._accounts.items()}
+        copied._names = dict(self._names)
+        copied._allocator = self._allocator.copy()
+        return copied
+
+    # Reorders the accounts by account number (iteration follows insertion order)
+    def sort(self) -> None:
+        self._accounts = dict(sorted(self._accounts.items(), key=lambda item: item[1].number))
+
+    # Starts change tracking afresh (after the initial load)
+    def clear_changes(self) -> None:
+        self.dirty = set()
+        self.structure_changed = False
+
+    # Returns True if any account is held under the given name
+    def has_name(self, name: str) -> bool:
+        return name in self._names
+
+    # Highest account number in use, or None when the store is empty
+    def highest_account_number(self):
+        return self._allocator.highest
+
+    # Next account number to assign (highest + 1, 10001 for an empty store,
+    # the lowest free number once 99999 is taken), or None when none is left
+    def next_account_number(self) -> Optional[str]:
+        number = self._allocator.next_free()
+        return str(number).zfill(5) if number is not None else None
@@ -1,17 +1,45 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator
 from account_manager import AccountManager
+from account_store import AccountStore
+from account_record import balance_cents, set_balance_cents
 import print_error as error_logger
+import columnar
+import fee_engine
+import log
+import master_patch
+import parallel_apply
+from profiler import NULL_PROFILER, profiled
 import read
+import session_index
 import write
+from transaction_record import TransactionRecord
 
 class BankingSystem:
-    def __init__(self, old_master_file: str, merged_transaction_file: str):
+    profiler = NULL_PROFILER  # replaced per instance by the profiler argument
+
+    def __init__(self, old_master_file: str, merged_transaction_file: str, vectorized_fees: bool = True,
+                 streaming: bool = False, parse_cache=None, write_sidecars: bool = False, workers: int = 1,
+                 profiler=None, patch_master: bool = False,
+                 patch_threshold: float = master_patch.DEFAULT_MAX_DIRTY_FRACTION, accounts=None,
+                 parse_workers: int = 1):
         self.old_master_file = old_master_file
         self.merged_transaction_file = merged_transaction_file
         self.new_master_file = "new_master_accounts.txt"
         self.new_current_file = "new_current_accounts.txt"
         self.accounts = {}  # Stores bank accounts as a dictionary
         self.transactions = []
+        self.vectorized_fees = vectorized_fees  # Uses the NumPy fee engine when installed
+        self.streaming = streaming  # Parse transactions lazily while they are applied
+        self.parse_cache = parse_cache  # Optional ParseCache for both input files
+        self.write_sidecars = write_sidecars  # Also write binary columnar .bin sidecars of the output files
+        self.workers = workers  # Worker processes for apply_transactions (1 = serial)
+        self.profiler = profiler or NULL_PROFILER  # StageProfiler hooks around each pipeline stage
+        self.patch_master = patch_master  # Patch changed records into a copy of the old master (master_patch)
+        self.patch_threshold = patch_threshold  # Largest fraction of changed accounts still patched
+        self.master_patched_bytes = None  # Record bytes patched by the last write_output_files, None if rewritten
+        self.transaction_counts = None  # Per-code applied/rejected counts of the last apply_transactions
+        self.initial_accounts = accounts  # AccountStore to start from instead of reading old_master_file
+        self.parse_workers = parse_workers  # Worker processes parsing the merged file by sessions (1 = serial)
 
 
         self.read_input_files()
@@ -19,107 +47,150 @@ class BankingSystem:
         self.account_manager = AccountManager(self.accounts)
 
     # Reads the Master Bank Accounts and Transaction Files
+    # In streaming mode the transactions are a generator consumed by apply_transactions
+    # Given accounts (e.g. carried over in memory by multi_day) replace the master file
+    @profiled("read_input_files")
     def read_input_files(self) -> None:
-        self.accounts = self.read_old_bank_accounts(self.old_master_file)
-        self.transactions = self.read_transactions(self.merged_transaction_file)
+        if self.initial_accounts is not None:
+            self.accounts = self.initial_accounts
+        else:
+            self.accounts = self.read_old_bank_accounts(self.old_master_file)
+        if self.streaming:
+            self.transactions = self.iter_transactions(self.merged_transaction_file)
+        else:
+            self.transactions = self.read_transactions(self.merged_transaction_file)
 
     # Applies transactions to accounts and confirms updates
+    # With workers > 1 the accounts are sharded across a process pool (parallel_apply)
+    @profiled("apply_transactions")
     def apply_transactions(self) -> None:
-        for transaction in self.transactions:
-            if transaction["code"] not in ["01", "03", "04", "05", "06", "07", "08"]:
-                error_logger.log_constraint_error(f"Unknown transaction code {transaction['code']} in merged transaction file.",
-                    "banking_system.py",  # file causing the error
-                    fatal=True)
-
-            self.account_manager.process_transaction(transaction)
-            if transaction["code"] == "05":  # Create account
-                success = self.account_manager.create_account(transaction)
-                if success:
-                    # Ensure the new account is reflected in self.accounts
-                    self.accounts = self.account_manager.accounts
-            elif transaction["code"] == "06": # delete account
-                success = self.account_manager.delete_account(transaction["account_number"])
-                if success:
-                    # Ensure the deleted account is reflected in self.accounts
-                    self.accounts = self.account_manager.accounts
-            elif transaction["code"] == "07": # disable account
-                success = self.account_manager.disable_account(transaction["account_number"])
-                if success:
-                    # Ensure the disabled account is reflected in self.accounts
-                    self.accounts = self.account_manager.accounts
-            elif transaction["code"] == "08": # change plan
-                success = self.account_manager.changeplan(transaction["account_number"], transaction["misc"])
-                if success:
-                    # Ensure the plan change is reflected in self.accounts
-                    self.accounts = self.account_manager.accounts
-            self.accounts = self.account_manager.accounts
+        if self.workers > 1:
+            self.transaction_counts = parallel_apply.apply_transactions(self.account_manager, self.transactions,
+                                                                        self.workers)
+        else:
+            self.transaction_counts = self.account_manager.apply_batch(self.transactions)
+        self.accounts = self.account_manager.accounts
+        log.debug("Transactions applied: %s, rejected: %s",
+                  dict(self.transaction_counts.applied), dict(self.transaction_counts.rejected))
 
     # Writes the updated account list to the new Master Bank Accounts File
     def update_master_file(self) -> None:
-        for acc in self.account_manager.accounts.values():
-            print(f"📝 MASTER WRITE: {acc['account_number']} | {acc['name']} | Balance: {acc['balance']} | Transactions: {acc['total_transactions']}")
+        if log.enabled(log.DEBUG):
+            for acc in self.account_manager.accounts.values():
+                log.debug("📝 MASTER WRITE: %s | %s | Balance: %s | Transactions: %s",
+                          acc['account_number'], acc['name'], acc['balance'], acc['total_transactions'])
 
         self.write_master_file(list(self.account_manager.accounts.values()), self.new_master_file)
+        if self.write_sidecars:
+            columnar.write_sidecar(sorted(self.accounts.values(), key=lambda x: int(x["account_number"])),
+                                   columnar.sidecar_path(self.new_master_file), "master")
+
+    # Writes the new Master and Current Bank Accounts Files in one pass (write.write_account_files)
+    @profiled("write_output_files")
+    def write_output_files(self) -> None:
+        if log.enabled(log.DEBUG):
+            for acc in self.account_manager.accounts.values():
+                log.debug("📝 MASTER WRITE: %s | %s | Balance: %s | Transactions: %s",
+                          acc['account_number'], acc['name'], acc['balance'], acc['total_transactions'])
+
+        patch = master_patch.prepare(self.accounts, self.old_master_file, self.patch_threshold) \
+            if self.patch_master else None
+        if patch is None:
+            write.write_account_files(self.accounts.values(), self.new_master_file, self.new_current_file)
+            self.master_patched_bytes = None
+        else:
+            write.write_account_files(self.accounts.values(), None, self.new_current_file)
+            self.master_patched_bytes = patch.write(self.new_master_file)
+            log.debug("Patched %d of %d master records", len(patch.lines), len(self.accounts))
+        if self.write_sidecars:
+            columnar.write_sidecar(sorted(self.accounts.values(), key=lambda x: int(x["account_number"])),
+                                   columnar.sidecar_path(self.new_master_file), "master")
+            columnar.write_sidecar(self.accounts.values(), columnar.sidecar_path(self.new_current_file), "current")
 
     # Writes the updated account list to the new Current Bank Accounts File
     def update_current_file(self) -> None:
         self.write_new_current_accounts(self.new_current_file)
+        if self.write_sidecars:
+            columnar.write_sidecar(self.accounts.values(), columnar.sidecar_path(self.new_current_file), "current")
 
 
-    # Deducts transaction fees based on transaction count
+    # Deducts transaction fees based on transaction count (in integer cents)
+    @profiled("calculate_transaction_fee")
     def calculate_transaction_fee(self) -> None:
-        print("\n📌 DEBUG: APPLYING TRANSACTION FEES")
+        log.debug("\n📌 DEBUG: APPLYING TRANSACTION FEES")
+
+        if self.vectorized_fees and fee_engine.available():
+            fee_engine.apply_transaction_fees(self.accounts)
+            return
 
+        mark_dirty = getattr(self.accounts, "mark_dirty", None)  # AccountStore change tracking
         for account_number, account in self.accounts.items():
             if account_number == "00000":  # Skip special "END OF FILE" account
                 continue
 
             if account["plan"] == "SP":
-                fee = 0.05
+                fee = 5
             elif account["plan"] == "NP":
-                fee = 0.10
+                fee = 10
             else:
                 error_logger.log_constraint_error(
                     f"Invalid account plan type: {account['plan']}",
                     f"account {account_number} has unsupported plan type",
-                    fatal=True
+                    fatal=True, category="Invalid Plan Type", account=account_number
                 )
             total_transactions = account.get("total_transactions", 0)
             total_fee = fee * total_transactions  # Apply fee for each transaction
 
             if total_transactions > 0:
 
+                balance = balance_cents(account)
+
                 # Prevent negative balances
-                if account["balance"] - total_fee < 0:
-                    error_logger.log_constraint_error('Insufficient funds', f'account {account_number} cannot pay transaction fees')
-                    account['balance'] = 0.0
+                if balance - total_fee < 0:
+                    error_logger.log_constraint_error('Insufficient funds', f'account {account_number} cannot pay transaction fees',
+                                                      category='Insufficient Fee Funds', account=account_number)
+                    set_balance_cents(account, 0)
+                    if mark_dirty:
+                        mark_dirty(account_number)
                     continue  # Skip fee deduction if insufficient balance
 
-                account["balance"] -= total_fee  # Deduct total fee
+                set_balance_cents(account, balance - total_fee)  # Deduct total fee
+                if mark_dirty:
+                    mark_dirty(account_number)
 
     # Reads the old Master Bank Accounts file and returns a dictionary of accounts
-    def read_old_bank_accounts(self, file_path: str) -> Dict[str, Dict]:
-        accounts = {}
-        accounts_list = read.read_old_bank_accounts(file_path)
+    def read_old_bank_accounts(self, file_path: str) -> AccountStore:
+        accounts = AccountStore()
+        if columnar.is_sidecar(file_path):  # binary sidecar: no text parsing needed
+            accounts_list = columnar.read_sidecar(file_path)[1]
+        elif self.parse_cache is not None:
+            accounts_list = self.parse_cache.load(file_path, "master", read.read_old_bank_accounts_mmap)
+        else:
+            accounts_list = read.read_old_bank_accounts_mmap(file_path)
+        verbose = log.enabled(log.DEBUG)
         for account in accounts_list:
             if account['name'] == 'END_OF_FILE':
                 continue
             account_number = account["account_number"].zfill(5)
             accounts[account_number] = account
-            print(account)
+            if verbose:
+                log.debug("%s", account)
 
+        accounts.clear_changes()  # track changes from here on
         return accounts
 
     # Writes the updated Current Bank Accounts file
+    @profiled("write_new_current_accounts")
     def write_new_current_accounts(self, file_path):
         write.write_new_current_accounts(self.accounts.values(), file_path)
 
     # Writes the updated Master Bank Accounts file
+    @profiled("write_master_file")
     def write_master_file(self, accounts: List[Dict], file_path: str) -> None:
         with open(file_path, "w") as file:
             # Write all active accounts
             for acc in sorted(self.accounts.values(), key=lambda x: int(x["account_number"])):
-                file.write(f"{acc['account_number'].zfill(5)} {acc['name'].ljust(20, ' ')} {acc['status']} {acc['balance']:08.2f} {str(acc['total_transactions']).zfill(4)} {acc['plan']}\n")
+                file.write(write.format_master_line(acc))
 
             # Ensure only one EOF entry exists
             if self.accounts:  # Ensure there are accounts left
@@ -127,24 +198,22 @@ class BankingSystem:
             else:
                 last_account_number = 10000  # Default if no accounts exist
 
-            eof_account_number = str(last_account_number + 1).zfill(5)
-            file.write(f"{eof_account_number} END_OF_FILE          A 00000.00 0000 NP\n")
-
-    # Reads the merged transaction file
-    def read_transactions(self, file_path: str) -> List[Dict]:
-        transactions = []
-        with open(file_path, "r") as file:
-            for line in file:
-                if line.startswith("00"):  # End of session
-                    continue
-                transaction = {
-                    "code": line[:2].strip(),
-                    "name": line[3:23].strip(),
-                    "account_number": line[24:29].strip(),
-                    "amount": float(line[30:38].strip()),
-                    "misc": line[39:].strip(),
-                }
-                transactions.append(transaction)
-       
-        return transactions
+            file.write(write.format_master_eof_line(last_account_number))
+
+    # Reads the merged transaction file (amounts in integer cents)
+    def read_transactions(self, file_path: str) -> List[TransactionRecord]:
+        if self.parse_cache is not None:
+            return self.parse_cache.load(file_path, "transactions", self.parse_transaction_file)
+        return self.parse_transaction_file(file_path)
+
+    # Parses the whole merged transaction file, split on session boundaries
+    # across parse_workers processes when more than one (session_index)
+    def parse_transaction_file(self, file_path: str) -> List[TransactionRecord]:
+        if self.parse_workers > 1:
+            return session_index.parse_parallel(file_path, self.parse_workers)
+        return list(self.iter_transactions(file_path))
+
+    # Lazily parses the merged transaction file a chunk at a time (read.iter_transactions)
+    def iter_transactions(self, file_path: str) -> Iterator[TransactionRecord]:
+        return read.iter_transactions(file_path)
 
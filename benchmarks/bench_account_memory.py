@@ -0,0 +1,53 @@
+"""
+Compares the memory held by 99,999 accounts stored as one dict per account
+(the old read.read_old_bank_accounts output) against AccountRecord objects.
+
+Usage: python3 benchmarks/bench_account_memory.py [account_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_record import AccountRecord
+
+
+def build_dicts(count):
+    return [{
+        'account_number': str(10000 + i),
+        'name': f"user_{i}",
+        'status': 'A',
+        'balance': float(i % 100000) + 0.25,
+        'total_transactions': i % 10000,
+        'plan': 'SP' if i % 2 else 'NP'
+    } for i in range(count)]
+
+
+def build_records(count):
+    return [AccountRecord(10000 + i, f"user_{i}", 'A', (i % 100000) * 100 + 25, i % 10000, 'SP' if i % 2 else 'NP')
+            for i in range(count)]
+
+
+def measure(builder, count):
+    tracemalloc.start()
+    accounts = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del accounts
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 99999
+    dict_bytes = measure(build_dicts, count)
+    record_bytes = measure(build_records, count)
+    print(f"accounts:          {count}")
+    print(f"dict per account:  {dict_bytes / 1e6:.1f} MB")
+    print(f"AccountRecord:     {record_bytes / 1e6:.1f} MB")
+    print(f"saved:             {(1 - record_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
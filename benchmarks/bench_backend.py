@@ -0,0 +1,119 @@
+"""
+Backend benchmark suite.
+
+Generates a seeded workload (benchmarks/workload.py), then times each
+backend stage separately: read_input_files, apply_transactions,
+calculate_transaction_fee, the master writer (write_master_file) and the
+current writer (write_new_current_accounts). Each stage is run on a fresh
+BankingSystem `repeat` times and the best time is kept. Runs offline, with
+console output at ERROR level and errors counted but not printed.
+
+Profiles:
+    ci      5,000 accounts, 50,000 transactions (a few seconds)
+    full    90,000 accounts, 2,000,000 transactions
+
+Usage: python3 benchmarks/bench_backend.py [--profile ci|full] [--repeat N]
+           [--seed N] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import log
+import print_error as error_logger
+from account_manager import AccountManager
+from banking_system import BankingSystem
+from profiler import StageProfiler
+import workload
+
+PROFILES = {
+    "ci": {"accounts": 5000, "transactions": 50000},
+    "full": {"accounts": 90000, "transactions": 2000000},
+}
+STAGES = ("read_input_files", "apply_transactions", "calculate_transaction_fee",
+          "write_master_file", "write_new_current_accounts")
+
+
+def run_once(master, transactions, output_dir):
+    """
+    Runs the pipeline once on a fresh BankingSystem and returns the wall time
+    of every stage from its StageProfiler hooks. The constructor's own read
+    of the inputs is superseded by the second read_input_files entry, which
+    hands the fresh accounts to a new AccountManager.
+    """
+    profiler = StageProfiler(memory=False)
+    system = BankingSystem(master, transactions, profiler=profiler)
+    system.new_master_file = os.path.join(output_dir, "new_master_accounts.txt")
+    system.new_current_file = os.path.join(output_dir, "new_current_accounts.txt")
+
+    system.read_input_files()
+    system.account_manager = AccountManager(system.accounts)
+    system.apply_transactions()
+    system.calculate_transaction_fee()
+    system.write_master_file(list(system.accounts.values()), system.new_master_file)
+    system.write_new_current_accounts(system.new_current_file)
+    return {stage: profiler.last(stage)["wall_seconds"] for stage in STAGES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each backend stage on a generated workload")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="ci")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE as JSON")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    log.set_level(log.ERROR)
+    error_logger.configure(echo=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        transactions = os.path.join(tmp, "transactions.txt")
+        start = time.perf_counter()
+        book = workload.write_master(master, profile["accounts"], args.seed)
+        workload.write_transactions(transactions, book, profile["transactions"], args.seed)
+        generate = time.perf_counter() - start
+
+        best = {stage: float("inf") for stage in STAGES}
+        for _ in range(args.repeat):
+            for stage, elapsed in run_once(master, transactions, tmp).items():
+                best[stage] = min(best[stage], elapsed)
+        sizes = {"master_bytes": os.path.getsize(master), "transactions_bytes": os.path.getsize(transactions)}
+
+    results = {
+        "profile": args.profile,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "accounts": profile["accounts"],
+        "transactions": profile["transactions"],
+        **sizes,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "generate_seconds": round(generate, 4),
+        "stages": {stage: round(best[stage], 4) for stage in STAGES},
+        "total_seconds": round(sum(best.values()), 4),
+    }
+
+    print(f"{args.profile}: {profile['accounts']} accounts, {profile['transactions']} transactions "
+          f"(generated in {generate:.2f} s), best of {args.repeat}")
+    for stage in STAGES:
+        print(f"  {stage:28} {best[stage]:8.3f} s")
+    print(f"  {'total':28} {results['total_seconds']:8.3f} s")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
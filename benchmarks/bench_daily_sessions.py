@@ -0,0 +1,95 @@
+"""
+Times a day of frontend sessions three ways on a generated current accounts
+file and session scripts: one bank-atm.py process per session (the old
+daily.sh loop), bank-atm-batch.py in one process, and bank-atm-batch.py
+across 2 and 4 worker processes. Checks every run produces the same merged
+transaction file.
+
+Usage: python3 benchmarks/bench_daily_sessions.py [account_count] [session_count] [transactions_per_session]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+FRONTEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Frontend")
+
+
+def write_accounts(path, accounts):
+    with open(path, "w") as file:
+        for number in range(1, accounts + 1):
+            file.write(f"{number:05d} {'user_' + str(number):<20} A 01000.00 NP\n")
+        file.write("00000 END_OF_FILE          A 00000.00 NP")
+
+
+def write_sessions(directory, accounts, sessions, transactions):
+    rng = random.Random(0)
+    os.makedirs(directory)
+    for session in range(sessions):
+        lines = ["admin"]
+        for _ in range(transactions):
+            number = rng.randint(1, accounts)
+            kind = rng.choice(["deposit", "withdrawal", "transfer"])
+            lines += [kind, f"user_{number}", f"{number:05d}"]
+            if kind == "transfer":
+                lines.append(f"{rng.randint(1, accounts):05d}")
+            lines.append(str(rng.randint(1, 400)))
+        lines.append("logout")
+        with open(os.path.join(directory, f"session{session:03d}.txt"), "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+def per_process(accounts_file, session_dir, output_dir, merged):
+    os.makedirs(output_dir)
+    for name in sorted(os.listdir(session_dir)):
+        output = os.path.join(output_dir, name)
+        with open(os.path.join(session_dir, name)) as script:
+            result = subprocess.run([sys.executable, "bank-atm.py", accounts_file, output], stdin=script,
+                                    cwd=FRONTEND, stdout=subprocess.DEVNULL)
+        if result.returncode == 0:
+            with open(output, "rb") as source, open(merged, "ab") as target:
+                target.write(source.read())
+
+
+def batch(accounts_file, session_dir, output_dir, merged, workers):
+    subprocess.run([sys.executable, "bank-atm-batch.py", accounts_file, session_dir, output_dir, merged,
+                    "--workers", str(workers)], cwd=FRONTEND, stdout=subprocess.DEVNULL, check=True)
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    transactions = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        accounts_file = os.path.join(tmp, "current.txt")
+        session_dir = os.path.join(tmp, "sessions")
+        write_accounts(accounts_file, accounts)
+        write_sessions(session_dir, accounts, sessions, transactions)
+
+        runs = [("per-process", lambda out, merged: per_process(accounts_file, session_dir, out, merged))]
+        for workers in (1, 2, 4):
+            runs.append((f"batch, {workers} worker{'s' if workers > 1 else ''}",
+                         lambda out, merged, workers=workers: batch(accounts_file, session_dir, out, merged, workers)))
+
+        print(f"{sessions} sessions x {transactions} transactions, {accounts} accounts, {os.cpu_count()} CPUs")
+        merged_files = []
+        baseline = None
+        for index, (label, run) in enumerate(runs):
+            merged = os.path.join(tmp, f"merged_{index}.txt")
+            start = time.perf_counter()
+            run(os.path.join(tmp, f"out_{index}"), merged)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            merged_files.append(open(merged, "rb").read())
+            print(f"{label:<20} {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+        assert all(merged == merged_files[0] for merged in merged_files), "merged files differ"
+        print("merged transaction files identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures the master file write on a low-activity day: a full rewrite
+(write.write_account_files) against the incremental patch (master_patch),
+both through BankingSystem.write_output_files. Reports time and the bytes
+the process hands to write()/sendfile (wchar in /proc/self/io, Linux only)
+for the master file alone.
+
+Usage: python3 benchmarks/bench_master_patch.py [account_count] [transaction_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log
+import print_error as error_logger
+import master_patch
+from banking_system import BankingSystem
+
+
+def write_day(directory, accounts, transactions):
+    rng = random.Random(0)
+    master = os.path.join(directory, "master.txt")
+    merged = os.path.join(directory, "transactions.txt")
+    with open(master, "w") as file:
+        for number in range(1, accounts + 1):
+            file.write(f"{number:05d} {'user_' + str(number):<20} A {rng.randint(0, 50000):05d}.00 0000 "
+                       f"{rng.choice(['SP', 'NP'])}\n")
+        file.write(f"{accounts + 1:05d} END_OF_FILE          A 00000.00 0000 NP\n")
+    with open(merged, "w") as file:
+        for _ in range(transactions):
+            number = rng.randint(1, accounts)
+            file.write(f"04 {'user_' + str(number):<20} {number:05d} {rng.randint(1, 900):05d}.00 NP\n")
+        file.write("00                      00000 00000.00 00\n")
+    return master, merged
+
+
+def written_chars():
+    try:
+        with open("/proc/self/io") as file:
+            for line in file:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def master_write(files, directory, patch):
+    system = BankingSystem(*files, patch_master=patch, patch_threshold=master_patch.DEFAULT_MAX_DIRTY_FRACTION)
+    system.new_master_file = os.path.join(directory, "new_master_accounts.txt")
+    system.new_current_file = os.path.join(directory, "new_current_accounts.txt")
+    system.apply_transactions()
+    system.calculate_transaction_fee()
+
+    # The current file is written either way; time it on its own to leave the master's share
+    start, chars = time.perf_counter(), written_chars()
+    system.write_output_files()
+    elapsed, total_chars = time.perf_counter() - start, written_chars() - chars
+
+    start, chars = time.perf_counter(), written_chars()
+    system.write_new_current_accounts(system.new_current_file)
+    current, current_chars = time.perf_counter() - start, written_chars() - chars
+    return elapsed - current, total_chars - current_chars, system.master_patched_bytes
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 99000
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    log.set_level(log.ERROR)
+    error_logger.configure(echo=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_day(tmp, accounts, transactions)
+        size = os.path.getsize(files[0])
+        full, full_chars, _ = min(master_write(files, tmp, False) for _ in range(5))
+        patched, patched_chars, patched_bytes = min(master_write(files, tmp, True) for _ in range(5))
+
+    print(f"{accounts} accounts, {transactions} deposits, master file {size:,} bytes")
+    print(f"full rewrite  {full:.4f} s  {full_chars:,} bytes written")
+    print(f"patch         {patched:.4f} s  {patched_chars:,} bytes written ({patched_bytes:,} bytes of records "
+          f"patched, the rest copied in the kernel)")
+
+
+if __name__ == "__main__":
+    main()
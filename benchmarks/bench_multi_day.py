@@ -0,0 +1,88 @@
+"""
+Times a week of backend runs two ways on a generated workload: main.py
+once per day with the new master copied over the working master (the
+weekly.sh chain), and multi_day.MultiDayRunner keeping the accounts in
+memory in one process. Checks both write the same files every day.
+
+Usage: python3 benchmarks/bench_multi_day.py [account_count] [transactions_per_day] [days]
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from multi_day import MultiDayRunner
+import workload
+
+
+def chain(master, merged_files, directory):
+    os.makedirs(directory)
+    shutil.copyfile(master, os.path.join(directory, "master_input.txt"))
+    outputs = []
+    for merged in merged_files:
+        subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "master_input.txt", merged],
+                       cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        outputs.append(read_outputs(directory))
+        shutil.copyfile(os.path.join(directory, "new_master_accounts.txt"), os.path.join(directory, "master_input.txt"))
+    return outputs
+
+
+def in_memory(master, merged_files, directory):
+    os.makedirs(directory)
+    outputs = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = MultiDayRunner(master)
+        for merged in merged_files:
+            runner.run_day(merged, os.path.join(directory, "new_master_accounts.txt"),
+                           os.path.join(directory, "new_current_accounts.txt"))
+            outputs.append(read_outputs(directory))
+    return outputs
+
+
+def read_outputs(directory):
+    files = []
+    for name in ("new_master_accounts.txt", "new_current_accounts.txt"):
+        with open(os.path.join(directory, name), "rb") as file:
+            files.append(file.read())
+    return files
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        book = workload.write_master(master, accounts)
+        merged_files = []
+        for day in range(1, days + 1):
+            merged = os.path.join(tmp, f"merged_day{day}.txt")
+            workload.write_transactions(merged, book, transactions, seed=day)
+            merged_files.append(merged)
+
+        print(f"{days} days x {transactions} transactions, {accounts} accounts")
+        results = []
+        baseline = None
+        for label, run in (("main.py per day", chain), ("in memory", in_memory)):
+            start = time.perf_counter()
+            results.append(run(master, merged_files, os.path.join(tmp, label.replace(" ", "_"))))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{label:<16} {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+        assert results[0] == results[1], "daily output files differ"
+        print("daily master and current files identical")
+
+
+if __name__ == "__main__":
+    main()
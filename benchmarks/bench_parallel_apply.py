@@ -0,0 +1,67 @@
+"""
+Times the serial apply_transactions against the account-sharded parallel
+apply at 1, 2, 4 and 8 workers on a generated master and transaction file,
+and checks every run ends in the same account state.
+
+Usage: python3 benchmarks/bench_parallel_apply.py [account_count] [transaction_count]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from banking_system import BankingSystem
+from bench_read_master import write_master
+
+
+def write_transactions(path, count, accounts):
+    rng = random.Random(0)
+    codes = ["01"] * 30 + ["03"] * 15 + ["04"] * 45 + ["05", "06", "07", "08"] * 2
+    with open(path, "w") as file:
+        for i in range(count):
+            code = rng.choice(codes)
+            number = rng.randint(1, accounts)
+            name = f"new_{i}" if code == "05" else f"user_{number}"
+            misc = "EC" if code == "03" else rng.choice(["SP", "NP"])
+            file.write(f"{code} {name.ljust(20)} {number:05d} {rng.randint(0, 999):05d}.00 {misc}\n")
+            if i % 20 == 19:
+                file.write("00                      00000 00000.00 00\n")
+
+
+def run(master, transactions, workers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        system = BankingSystem(master, transactions, workers=workers)
+        start = time.perf_counter()
+        system.apply_transactions()
+        elapsed = time.perf_counter() - start
+    state = [(n, a.status, a.balance_cents, a.total_transactions, a.plan) for n, a in system.accounts.items()]
+    return elapsed, state
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        transactions = os.path.join(tmp, "transactions.txt")
+        write_master(master, accounts)
+        write_transactions(transactions, count, accounts)
+
+        serial, expected = run(master, transactions, 0)
+        print(f"{accounts} accounts, {count} transactions, {os.cpu_count()} CPUs")
+        print(f"serial      {serial:.3f} s")
+        for workers in (1, 2, 4, 8):
+            elapsed, state = run(master, transactions, workers)
+            assert state == expected, f"{workers} workers: final state differs from the serial run"
+            print(f"{workers} worker(s) {elapsed:.3f} s  ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Times read.read_old_bank_accounts (per-line) against
+read.read_old_bank_accounts_mmap (bulk) on a generated master file.
+
+Usage: python3 benchmarks/bench_read_master.py [account_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import read
+
+
+def write_master(path, count):
+    with open(path, 'w') as file:
+        for i in range(count):
+            number = i + 1
+            file.write(f"{number:05d} {('user_' + str(number)).ljust(20)} {'AD'[i % 7 == 0]} "
+                       f"{i % 100000:05d}.{i % 100:02d} {i % 10000:04d} {'SP' if i % 2 else 'NP'}\n")
+        file.write(f"{count + 1:05d} END_OF_FILE          A 00000.00 0000 NP\n")
+
+
+def best_of(fn, path, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 99999
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "master.txt")
+        write_master(path, count - 1)
+        assert read.read_old_bank_accounts(path) == read.read_old_bank_accounts_mmap(path)
+
+        line_time = best_of(read.read_old_bank_accounts, path)
+        mmap_time = best_of(read.read_old_bank_accounts_mmap, path)
+    print(f"records:      {count}")
+    print(f"per-line:     {line_time * 1000:.1f} ms")
+    print(f"mmap bulk:    {mmap_time * 1000:.1f} ms")
+    print(f"speedup:      {line_time / mmap_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Times the old per-line merged transaction reader (a dict per line) against
+read.iter_transactions (chunked bulk parse into TransactionRecord tuples)
+on a generated workload, in lines per second, and compares the memory the
+parsed transactions hold (tracemalloc).
+
+Usage: python3 benchmarks/bench_read_transactions.py [transaction_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import money
+import read
+import workload
+
+
+# The reader BankingSystem.iter_transactions used before read.iter_transactions
+def read_lines(file_path):
+    transactions = []
+    with open(file_path, "r") as file:
+        for line in file:
+            if line.startswith("00"):  # End of session
+                continue
+            transactions.append({
+                "code": line[:2].strip(),
+                "name": line[3:23].strip(),
+                "account_number": line[24:29].strip(),
+                "amount": money.parse_cents(line[30:38].strip()),
+                "misc": line[39:].strip(),
+            })
+    return transactions
+
+
+def read_bulk(file_path):
+    return list(read.iter_transactions(file_path))
+
+
+def best_of(fn, path, repeat=7):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        fn(path)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def held_memory(fn, path):
+    tracemalloc.start()
+    result = fn(path)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        path = os.path.join(tmp, "transactions.txt")
+        workload.write_transactions(path, workload.write_master(master, 50000), count)
+        with open(path) as file:
+            lines = sum(1 for _ in file)
+        assert read_lines(path) == [record._asdict() for record in read_bulk(path)]
+
+        line_time = best_of(read_lines, path)
+        bulk_time = best_of(read_bulk, path)
+        line_memory = held_memory(read_lines, path)
+        bulk_memory = held_memory(read_bulk, path)
+    print(f"lines:        {lines} ({count} transactions)")
+    print(f"per-line:     {line_time * 1000:7.1f} ms  {lines / line_time:10,.0f} lines/s  {line_memory / 2**20:6.1f} MB")
+    print(f"bulk:         {bulk_time * 1000:7.1f} ms  {lines / bulk_time:10,.0f} lines/s  {bulk_memory / 2**20:6.1f} MB")
+    print(f"speedup:      {line_time / bulk_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Times the session index (session_index.py) on a generated merged
+transaction file: building the sidecar, parsing the file serially against
+parsing it split on session boundaries across worker processes
+(parse_parallel), and reading one session from its indexed offset against
+scanning the file up to it. The parallel parse pays for starting the pool
+and sending the records back, so it needs as many free cores as workers
+to gain; the timings are wall-clock for that reason.
+
+Usage: python3 benchmarks/bench_session_index.py [transaction_count] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import read
+import session_index
+import workload
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Session n found by parsing the file from the start, without the index
+def scan_to_session(path, n):
+    session = []
+    with open(path) as file:
+        for line in file:
+            if line.startswith("00"):
+                if n == 0:
+                    return session
+                n -= 1
+            elif n == 0:
+                session.append(line)
+    return session
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        path = os.path.join(tmp, "merged_transactions.txt")
+        workload.write_transactions(path, workload.write_master(master, 50000), count)
+        index = session_index.load_index(path)
+        last = len(index) - 1
+        assert session_index.parse_parallel(path, max(workers, 2), index) == list(read.iter_transactions(path))
+        assert len(index.read_session(path, last)) == len(scan_to_session(path, last))
+
+        build_time = best_of(lambda: session_index.build_index(path))
+        load_time = best_of(lambda: session_index.load_index(path))
+        serial_time = best_of(lambda: list(read.iter_transactions(path)))
+        parallel_time = best_of(lambda: session_index.parse_parallel(path, workers, index))
+        scan_time = best_of(lambda: scan_to_session(path, last))
+        seek_time = best_of(lambda: index.read_session(path, last))
+        size = os.path.getsize(session_index.index_path(path))
+    print(f"sessions:     {len(index)} ({count} transactions), index {size / 1024:.1f} KB, {os.cpu_count()} CPUs")
+    print(f"build index:  {build_time * 1000:7.1f} ms   load sidecar: {load_time * 1000:7.2f} ms")
+    print(f"parse serial: {serial_time * 1000:7.1f} ms")
+    print(f"parse {workers} procs:{parallel_time * 1000:7.1f} ms  ({serial_time / parallel_time:.2f}x)")
+    print(f"last session: {scan_time * 1000:7.2f} ms scanning, {seek_time * 1000:7.3f} ms from the index "
+          f"({scan_time / seek_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Times merging many small session transaction files into one merged file:
+the append run_session_dir did before session_merge (open the merged file
+and append one session file at a time), then building the session index
+with a rescan, against session_merge.SessionMerger, which checks and
+indexes the sessions in the same pass. Wall-clock, best of 5.
+
+Usage: python3 benchmarks/bench_session_merge.py [session_count] [transactions_per_session]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_index
+from session_merge import END_OF_SESSION, SessionMerger
+
+
+# The merge run_session_dir did before SessionMerger
+def append_sessions(merged_file, session_files):
+    open(merged_file, "wb").close()
+    for session_file in session_files:
+        with open(session_file, "rb") as source, open(merged_file, "ab") as merged:
+            merged.write(source.read())
+
+
+def append_and_index(merged_file, session_files):
+    append_sessions(merged_file, session_files)
+    session_index.write_index(session_index.build_index(merged_file), session_index.index_path(merged_file))
+
+
+def stream_sessions(merged_file, session_files):
+    with SessionMerger(merged_file) as merger:
+        for session_file in session_files:
+            merger.add(session_file)
+
+
+def best_of(fn, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_sessions(directory, sessions, per_session):
+    rng = random.Random(0)
+    paths = []
+    for session in range(sessions):
+        lines = []
+        for _ in range(rng.randint(0, 2 * per_session)):
+            number = rng.randint(1000, 99999)
+            lines.append(f"04 {'user_' + str(number):<20} {number:05d} {rng.randint(0, 99999):08.2f} NP\n")
+        path = os.path.join(directory, f"session{session:06d}.txt")
+        with open(path, "wb") as file:
+            file.write("".join(lines).encode() + END_OF_SESSION)
+        paths.append(path)
+    return paths
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sessions(tmp, sessions, per_session)
+        merged = os.path.join(tmp, "merged_transactions.txt")
+        append_sessions(merged, paths)
+        expected = open(merged, "rb").read()
+        stream_sessions(merged, paths)
+        assert open(merged, "rb").read() == expected
+
+        append_time = best_of(append_sessions, merged, paths)
+        indexed_time = best_of(append_and_index, merged, paths)
+        stream_time = best_of(stream_sessions, merged, paths)
+    print(f"sessions:        {sessions} ({len(expected) / 2**20:.1f} MB merged)")
+    print(f"append:          {append_time * 1000:7.1f} ms")
+    print(f"append + index:  {indexed_time * 1000:7.1f} ms")
+    print(f"streaming merge: {stream_time * 1000:7.1f} ms  ({indexed_time / stream_time:.2f}x, checked and indexed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Times the per-file writers (BankingSystem.write_master_file followed by
+write.write_new_current_accounts) against the single-pass
+write.write_account_files on a full book of accounts, and reports write
+throughput for both output files together.
+
+Usage: python3 benchmarks/bench_write_accounts.py [account_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import write
+from account_record import AccountRecord
+from account_store import AccountStore
+from banking_system import BankingSystem
+
+
+def make_store(count):
+    store = AccountStore()
+    for number in range(1, count + 1):
+        store[str(number).zfill(5)] = AccountRecord(
+            number, f"user_{number}", "AD"[number % 7 == 0], number * 37 % 10000000,
+            number % 10000, "SP" if number % 2 else "NP")
+    return store
+
+
+def per_file(accounts, master, current):
+    system = BankingSystem.__new__(BankingSystem)
+    system.accounts = accounts
+    system.write_master_file(list(accounts.values()), master)
+    write.write_new_current_accounts(accounts.values(), current)
+
+
+def single_pass(accounts, master, current):
+    write.write_account_files(accounts.values(), master, current)
+
+
+def best_of(fn, accounts, master, current, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(accounts, master, current)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 99999
+    accounts = make_store(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        master = os.path.join(tmp, "master.txt")
+        current = os.path.join(tmp, "current.txt")
+        megabytes = None
+        for label, fn in (("per-file writers", per_file), ("single pass", single_pass)):
+            elapsed = best_of(fn, accounts, master, current)
+            megabytes = (os.path.getsize(master) + os.path.getsize(current)) / 1e6
+            print(f"{label:17} {elapsed:.3f} s  {count / elapsed:,.0f} accounts/s  {megabytes / elapsed:.1f} MB/s")
+        print(f"{count} accounts, {megabytes:.1f} MB written per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Seeded synthetic workload generator for the backend.
+
+Writes a valid master accounts file (up to 99,999 accounts) and a merged
+transaction file of front-end sessions, each ended by a "00" record. The
+same seed always gives byte-identical files.
+
+Transactions follow a realistic code mix (mostly deposits, withdrawals and
+bill payments, a few account administration records). The generator keeps
+a shadow of each account's status and balance the way the backend applies
+them, so it never emits a deposit that would push a balance past
+$99,999.99 and never creates an account number above 99999. Around 2% of
+transactions name an account that does not exist, as typos do.
+
+Usage: python3 benchmarks/workload.py <master_out> <transactions_out>
+           [--accounts N] [--transactions N] [--seed N]
+"""
+
+import argparse
+import random
+
+MAX_CENTS = 9999999  # $99,999.99, the largest balance the file formats hold
+CODE_MIX = {"04": 36, "01": 30, "03": 22, "08": 5, "05": 3, "07": 2, "06": 2}
+PAYEES = ("EC", "CQ", "FI")
+SESSION_LENGTH = (1, 30)  # transactions per front-end session
+WRITE_LINES = 65536
+
+
+def write_master(path, accounts, seed=0, highest=None):
+    """
+    Writes a sorted master file of `accounts` accounts numbered between 1 and
+    `highest` (default: a little above the count, leaving room for creates).
+    Returns {account number: (name, status, balance cents, plan)}.
+    """
+    rng = random.Random(seed)
+    highest = min(99999, highest or accounts + accounts // 20)
+    numbers = sorted(rng.sample(range(1, highest + 1), accounts))
+
+    book = {}
+    lines = []
+    for number in numbers:
+        name = f"user_{number}"
+        status = "D" if rng.random() < 0.03 else "A"
+        balance = rng.randint(0, 2000000)
+        count = rng.randint(0, 40)
+        plan = "SP" if rng.random() < 0.3 else "NP"
+        book[number] = (name, status, balance, plan)
+        lines.append(f"{number:05d} {name:<20} {status} {balance // 100:05d}.{balance % 100:02d} {count:04d} {plan}\n")
+
+    eof_number = numbers[-1] + 1 if numbers and numbers[-1] < 99999 else 0
+    lines.append(f"{eof_number:05d} END_OF_FILE          A 00000.00 0000 NP\n")
+    _write_lines(path, lines)
+    return book
+
+
+def write_transactions(path, book, count, seed=0):
+    """
+    Writes `count` transactions against the accounts in `book` (as returned
+    by write_master), grouped into sessions ended by "00" records
+    """
+    rng = random.Random(seed + 1)
+    codes = rng.choices(list(CODE_MIX), list(CODE_MIX.values()), k=count)
+
+    live = {number: list(fields) for number, fields in book.items()}
+    numbers = list(live)
+    highest = max(live) if live else 10000
+    created = 0
+
+    lines = []
+    remaining = rng.randint(*SESSION_LENGTH)
+    with open(path, "w") as file:
+        for code in codes:
+            if code == "05" and highest >= 99999:
+                code = "04"  # the account number space is full
+
+            if code == "05":
+                created += 1
+                highest += 1
+                name = f"new_{created}"
+                balance = rng.randint(0, 500000)
+                plan = rng.choice(("SP", "NP"))
+                live[highest] = [name, "A", balance, plan]
+                numbers.append(highest)
+                lines.append(_record(code, name, highest, balance, plan))  # the front end's highest + 1
+            else:
+                number = rng.choice(numbers)
+                # Deleted and disabled accounts: the front end turns most of these away
+                while (number not in live or live[number][1] == "D") and rng.random() < 0.95:
+                    number = rng.choice(numbers)
+                if rng.random() < 0.02:
+                    number = rng.randint(1, 99999)  # typo'd account number
+                lines.append(_transaction(rng, code, number, live.get(number)))
+                if number in live:
+                    highest = _shadow(number, live, highest, lines[-1])
+
+            remaining -= 1
+            if remaining == 0:
+                lines.append("00                      00000 00000.00 00\n")
+                remaining = rng.randint(*SESSION_LENGTH)
+            if len(lines) >= WRITE_LINES:
+                file.write("".join(lines))
+                lines = []
+
+        if remaining != 0 or not count:
+            lines.append("00                      00000 00000.00 00\n")
+        file.write("".join(lines))
+
+
+def _transaction(rng, code, number, account):
+    name = account[0] if account else f"user_{number}"
+    if code == "04":
+        amount = rng.randint(1000, 200000)
+        if account and account[2] + amount > MAX_CENTS:
+            code, amount = "01", min(amount, account[2])
+        return _record(code, name, number, amount, account[3] if account else "NP")
+    if code == "01":
+        return _record(code, name, number, rng.randint(2000, 50000), account[3] if account else "NP")
+    if code == "03":
+        return _record(code, name, number, rng.randint(1000, 100000), rng.choice(PAYEES))
+    if code == "08":
+        plan = account[3] if account else "NP"
+        return _record(code, name, number, 0, "NP" if plan == "SP" else "SP")
+    return _record(code, name, number, 0, account[3] if account else "NP")
+
+
+# Mirrors what the backend does to an existing account's status and balance
+def _shadow(number, live, highest, line):
+    account = live[number]
+    amount = int(line[30:35]) * 100 + int(line[36:38])
+    code = line[:2]
+    active = account[1] == "A"
+    if code == "04" and active:
+        account[2] += amount
+    elif code in ("01", "03") and active and account[2] >= amount:
+        account[2] -= amount
+    elif code == "07":
+        account[1] = "D"
+    elif code == "08" and active:
+        account[3] = line[39:41]
+    elif code == "06":
+        del live[number]
+        if number == highest:
+            while highest > 0 and highest not in live:
+                highest -= 1
+            highest = highest or 10000
+    return highest
+
+
+def _record(code, name, number, cents, misc):
+    return f"{code} {name:<20} {number:05d} {cents // 100:05d}.{cents % 100:02d} {misc}\n"
+
+
+def _write_lines(path, lines):
+    with open(path, "w") as file:
+        for start in range(0, len(lines), WRITE_LINES):
+            file.write("".join(lines[start:start + WRITE_LINES]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded master file and merged transaction file")
+    parser.add_argument("master_out")
+    parser.add_argument("transactions_out")
+    parser.add_argument("--accounts", type=int, default=10000)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    book = write_master(args.master_out, args.accounts, args.seed)
+    write_transactions(args.transactions_out, book, args.transactions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Binary columnar sidecar for the master and current accounts files.
+
+Layout (little-endian), loadable with one read or mmap:
+    header   magic b"SQAC", version u16, kind u8 (0 master, 1 current),
+             1 pad byte, account count u32, END_OF_FILE account number u32,
+             8 reserved bytes (24 bytes in total)
+    int64    balances in cents      [count]
+    uint32   account numbers        [count]
+    uint32   transaction counts     [count]
+    uint8    status (b"A" / b"D")   [count]
+    uint8    plan (b"S" SP / b"N" NP) [count]
+    20 bytes name, space padded     [count]
+
+Accounts keep the order they were written in. Master names are stored as
+read.py's master reader reads them (the first 19 characters of the name
+field, stripped), so a master sidecar loads the same accounts as its text
+file; a text file converted to a sidecar and back is byte-identical unless
+a master name fills the whole field.
+
+Usage: python3 columnar.py <input> <output> [--kind master|current]
+       (text -> sidecar, or sidecar -> text when <input> is a sidecar)
+"""
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+from account_record import AccountRecord, balance_cents
+import money
+import write
+
+MAGIC = b"SQAC"
+VERSION = 1
+KINDS = {"master": 0, "current": 1}
+HEADER = struct.Struct("<4sHBxII8x")
+
+_PLAN_BYTES = {"SP": b"S", "NP": b"N"}
+_PLANS = {ord("S"): "SP", ord("N"): "NP"}
+
+
+# Sidecar path written next to an accounts text file (new_master_accounts.bin)
+def sidecar_path(text_path: str) -> str:
+    return os.path.splitext(text_path)[0] + ".bin"
+
+
+# True if the file starts with the sidecar magic bytes
+def is_sidecar(file_path: str) -> bool:
+    with open(file_path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_sidecar(accounts, file_path: str, kind: str = "master", eof_number: int = None) -> None:
+    """
+    Writes accounts (AccountRecord objects or account dicts) as a sidecar.
+    eof_number defaults to the END_OF_FILE number the text writers use:
+    highest account + 1 (10001 when empty) for master, 0 for current.
+    """
+    accounts = list(accounts)
+    numbers = array("I", (int(acc["account_number"]) for acc in accounts))
+    if eof_number is None:
+        eof_number = 0 if kind == "current" else (max(numbers) if numbers else 10000) + 1
+
+    balances = array("q", (balance_cents(acc) for acc in accounts))
+    counts = array("I", (acc.get("total_transactions", 0) for acc in accounts))
+    statuses = b"".join(acc["status"].encode() for acc in accounts)
+    plans = b"".join(_PLAN_BYTES[acc.get("plan", "NP")] for acc in accounts)
+    if kind == "master":
+        names = b"".join(_pack_name(_master_name(acc["name"])) for acc in accounts)
+    else:
+        names = b"".join(_pack_name(acc["name"]) for acc in accounts)
+
+    with open(file_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, KINDS[kind], len(accounts), eof_number))
+        for column in (balances, numbers, counts):
+            file.write(_little_endian(column).tobytes())
+        file.write(statuses)
+        file.write(plans)
+        file.write(names)
+
+
+def read_sidecar(file_path: str):
+    """
+    Loads a sidecar with a single read.
+    Returns (kind, list of AccountRecord, END_OF_FILE account number).
+    """
+    with open(file_path, "rb") as file:
+        data = memoryview(file.read())
+
+    magic, version, kind_code, count, eof_number = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{file_path} is not an accounts sidecar file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported sidecar version {version} in {file_path}")
+
+    offset = HEADER.size
+    columns = []
+    for typecode in ("q", "I", "I"):
+        column = array(typecode)
+        size = count * column.itemsize
+        column.frombytes(data[offset:offset + size])
+        columns.append(_little_endian(column))
+        offset += size
+    balances, numbers, counts = columns
+
+    statuses = [chr(code) for code in data[offset:offset + count]]
+    offset += count
+    plans = [_PLANS[code] for code in data[offset:offset + count]]
+    offset += count
+    raw_names = bytes(data[offset:offset + 20 * count])
+    names = [raw_names[i:i + 20].decode().rstrip(" ") for i in range(0, len(raw_names), 20)]
+
+    kind = "current" if kind_code == KINDS["current"] else "master"
+    accounts = list(map(AccountRecord, numbers, names, statuses, balances, counts, plans))
+    return kind, accounts, eof_number
+
+
+def text_to_sidecar(text_path: str, output_path: str, kind: str = None) -> None:
+    """
+    Converts a master or current accounts text file into a sidecar.
+    The kind is detected from the line length (45 master, 40 current)
+    unless given.
+    """
+    accounts = []
+    eof_number = None
+    with open(text_path, "r") as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.rstrip("\n")
+            if kind is None:
+                kind = "master" if len(line) == 45 else "current"
+            if len(line) != (45 if kind == "master" else 40):
+                raise ValueError(f"Line {line_num}: invalid {kind} record length ({len(line)} chars)")
+
+            name = _master_name(line[6:26]) if kind == "master" else line[6:26].rstrip(" ")
+            if name == "END_OF_FILE":
+                eof_number = int(line[0:5])
+                break
+            accounts.append(AccountRecord(
+                int(line[0:5]),
+                name,
+                line[27],
+                money.parse_cents(line[29:37]),
+                int(line[38:42]) if kind == "master" else 0,
+                line[43:45] if kind == "master" else line[38:40],
+            ))
+    write_sidecar(accounts, output_path, kind or "master", eof_number)
+
+
+def sidecar_to_text(input_path: str, text_path: str) -> None:
+    """
+    Renders a sidecar back into its master or current accounts text format
+    """
+    kind, accounts, eof_number = read_sidecar(input_path)
+    with open(text_path, "w") as file:
+        if kind == "master":
+            file.writelines(write.format_master_line(acc) for acc in accounts)
+            file.write(write.format_master_eof_line(eof_number - 1))
+        else:
+            file.writelines(write.format_current_line(acc) for acc in accounts)
+            file.write(write.CURRENT_EOF_LINE)
+
+
+# A master name as read._parse_account_line keeps it
+def _master_name(name):
+    return name[:19].strip()
+
+
+def _pack_name(name):
+    encoded = name.encode()
+    if len(encoded) > 20:
+        raise ValueError(f"Account name exceeds 20 bytes: {name}")
+    return encoded.ljust(20, b" ")
+
+
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert between accounts text files and binary sidecars")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--kind", choices=sorted(KINDS), help="text file kind (detected when omitted)")
+    args = parser.parse_args()
+
+    if is_sidecar(args.input):
+        sidecar_to_text(args.input, args.output)
+    else:
+        text_to_sidecar(args.input, args.output, args.kind)
+
+
+if __name__ == "__main__":
+    main()
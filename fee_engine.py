@@ -0,0 +1,91 @@
+"""
+Vectorized transaction fee engine.
+
+Gathers plan codes, transaction counts and balances (integer cents) into
+NumPy columns and computes per-plan fees, the clamp-to-zero on
+insufficient funds and the clamped accounts as whole-array operations.
+Gives the same balances and error lines as the loop in
+BankingSystem.calculate_transaction_fee. NumPy is optional; use
+available() to check before calling apply_transaction_fees.
+"""
+
+from account_record import AccountRecord, balance_cents, set_balance_cents
+import print_error as error_logger
+
+try:
+    import numpy as np
+except ImportError:  # fall back to the loop in BankingSystem
+    np = None
+
+FEE_CENTS = {"SP": 5, "NP": 10}  # per transaction
+
+
+# True if NumPy is installed and the vectorized engine can run
+def available() -> bool:
+    return np is not None
+
+
+def apply_transaction_fees(accounts) -> list:
+    """
+    Deducts transaction fees from every account except the "00000" END OF FILE
+    record. Accounts that cannot pay are clamped to a zero balance and
+    reported as 'Insufficient funds'. An unsupported plan is a fatal error,
+    raised after the accounts before it were charged, like the loop version.
+    Returns the account numbers that were clamped.
+    """
+    numbers = [number for number in accounts if number != "00000"]
+    rows = [accounts[number] for number in numbers]
+
+    records = all(type(acc) is AccountRecord for acc in rows)
+    plan_column, count_column, balance_column = _columns(rows, records)
+
+    plans = np.array(plan_column, dtype=object)
+    is_sp = plans == "SP"
+    invalid = np.flatnonzero(~is_sp & (plans != "NP"))
+    stop = int(invalid[0]) if invalid.size else len(rows)
+
+    is_sp = is_sp[:stop]
+    counts = np.array(count_column[:stop], dtype=np.int64)
+    balances = np.array(balance_column[:stop], dtype=np.int64)
+
+    fees = np.where(is_sp, FEE_CENTS["SP"], FEE_CENTS["NP"]) * counts
+    charged = counts > 0
+    clamped = charged & (balances < fees)
+    new_balances = np.where(clamped, 0, balances - fees)
+
+    clamped_numbers = [numbers[i] for i in np.flatnonzero(clamped)]
+    for account_number in clamped_numbers:
+        error_logger.log_constraint_error('Insufficient funds', f'account {account_number} cannot pay transaction fees',
+                                          category='Insufficient Fee Funds', account=account_number)
+
+    # Only charged accounts change; write their new balances back
+    charged_rows = np.flatnonzero(charged)
+    for i, balance in zip(charged_rows.tolist(), new_balances[charged_rows].tolist()):
+        if records:
+            rows[i].balance_cents = balance
+        else:
+            set_balance_cents(rows[i], balance)
+    if hasattr(accounts, "mark_dirty"):  # AccountStore change tracking
+        for i in charged_rows.tolist():
+            accounts.mark_dirty(numbers[i])
+
+    if invalid.size:
+        error_logger.log_constraint_error(
+            f"Invalid account plan type: {rows[stop]['plan']}",
+            f"account {numbers[stop]} has unsupported plan type",
+            fatal=True, category="Invalid Plan Type", account=numbers[stop]
+        )
+
+    return clamped_numbers
+
+
+# Plan, transaction count and balance (cents) columns, read from the record
+# slots directly when every account is an AccountRecord
+def _columns(rows, records):
+    if records:
+        return ([acc.plan for acc in rows],
+                [acc.total_transactions for acc in rows],
+                [acc.balance_cents for acc in rows])
+    return ([acc["plan"] for acc in rows],
+            [acc.get("total_transactions", 0) for acc in rows],
+            [balance_cents(acc) for acc in rows])
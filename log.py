@@ -0,0 +1,62 @@
+"""
+Backend logging.
+
+Messages go through the stdlib "banking" logger and are printed to stdout
+as the bare message, so they read like the old print output. Levels:
+    DEBUG    per-record output (each account read, each MASTER WRITE line)
+    INFO     create / delete / disable confirmations and run status
+    ERROR    constraint and fatal errors (print_error)
+The default level is INFO. Call sites pass %-style arguments, so a message
+at a disabled level is never formatted, and per-record loops check
+enabled(DEBUG) once before iterating.
+"""
+
+import logging
+import sys
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+ERROR = logging.ERROR
+
+logger = logging.getLogger("banking")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    # Looks up sys.stdout on every record so redirected or captured stdout
+    # (contextlib.redirect_stdout, pytest capsys) still gets the messages
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_handler = _StdoutHandler()
+_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_handler)
+logger.setLevel(INFO)
+logger.propagate = False
+
+
+# Sets the backend verbosity (DEBUG, INFO or ERROR)
+def set_level(level: int) -> None:
+    logger.setLevel(level)
+
+
+# True if messages at this level are shown; guards per-record loops
+def enabled(level: int) -> bool:
+    return logger.isEnabledFor(level)
+
+
+def debug(message, *args):
+    logger.debug(message, *args)
+
+
+def info(message, *args):
+    logger.info(message, *args)
+
+
+def error(message, *args):
+    logger.error(message, *args)
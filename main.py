@@ -19,35 +19,86 @@ Output Files:
 
 
 from banking_system import BankingSystem
-import sys
+from parse_cache import ParseCache
+import argparse
+import os
+import log
+import print_error as error_logger
+from profiler import StageProfiler
 
-if len(sys.argv) != 3:
-    print("Usage: python3 main.py <old_master_file> <merged_transaction_file>")
-    sys.exit(1)
+parser = argparse.ArgumentParser(usage="python3 main.py <old_master_file> <merged_transaction_file> [options]")
+parser.add_argument("old_master_file")
+parser.add_argument("merged_transaction_file")
+parser.add_argument("--stream", action="store_true",
+                    help="apply transactions while the merged file is read instead of loading it first")
+parser.add_argument("--cache", action="store_true",
+                    help="keep parsed input files in a content-hash cache (~/.cache/sqa_banking) and reuse them "
+                         "when the same input is read again")
+parser.add_argument("--sidecar", action="store_true",
+                    help="also write binary columnar .bin sidecars of the new master and current files")
+verbosity = parser.add_mutually_exclusive_group()
+verbosity.add_argument("--quiet", action="store_true", help="only print errors")
+verbosity.add_argument("--verbose", action="store_true",
+                       help="also print every account read and written (per-record debug output)")
+parser.add_argument("--error-report", metavar="FILE",
+                    help="write constraint errors to FILE in bulk instead of printing each one")
+parser.add_argument("--profile", nargs="?", const="profile.json", metavar="FILE",
+                    help="record wall time, CPU time and tracemalloc peak per stage to a JSON report "
+                         "(default profile.json)")
+parser.add_argument("--profile-no-memory", action="store_true",
+                    help="with --profile, skip tracemalloc (it slows allocation-heavy stages several times)")
+parser.add_argument("--cprofile", action="append", default=[], metavar="STAGE",
+                    help="with --profile, also run STAGE under cProfile and write STAGE.pstats next to the report "
+                         "(repeatable)")
+parser.add_argument("--patch-master", action="store_true",
+                    help="when no account was created or deleted, patch the changed records into a copy of the "
+                         "old master instead of rewriting it")
+parser.add_argument("--patch-threshold", type=float, default=0.1, metavar="FRACTION",
+                    help="with --patch-master, rewrite in full once more than FRACTION of the accounts changed "
+                         "(default 0.1)")
+parser.add_argument("--workers", type=int, default=1,
+                    help="apply transactions on this many account-sharded worker processes (default 1, serial)")
+parser.add_argument("--parse-workers", type=int, default=1, metavar="N",
+                    help="parse the merged transaction file on N worker processes, split on session boundaries "
+                         "with its session index (.idx, built when missing; default 1, serial)")
+args = parser.parse_args()
+log.set_level(log.ERROR if args.quiet else log.DEBUG if args.verbose else log.INFO)
+error_logger.configure(report_path=args.error_report, echo=args.error_report is None)
+profiler = None
+if args.profile:
+    profiler = StageProfiler(memory=not args.profile_no_memory, cprofile_stages=args.cprofile,
+                             pstats_dir=os.path.dirname(os.path.abspath(args.profile)))
 
 #File Paths
-old_master_file = sys.argv[1]
-merged_transaction_file = sys.argv[2]
+old_master_file = args.old_master_file
+merged_transaction_file = args.merged_transaction_file
 
 
 # # File paths
 # old_master_file = "old_master_accounts.txt"
 # merged_transaction_file = "merged_transactions.txt"
 
-# Initialize Banking System
-banking_system = BankingSystem(old_master_file, merged_transaction_file)
+# A fatal error raises print_error.FatalError (exit code 1) before any output
+# file is replaced; the error report and summary are written either way
+try:
+    # Initialize Banking System; Step 1, reading the input files, happens here
+    banking_system = BankingSystem(old_master_file, merged_transaction_file, streaming=args.stream,
+                                   parse_cache=ParseCache() if args.cache else None, write_sidecars=args.sidecar,
+                                   workers=args.workers, profiler=profiler, patch_master=args.patch_master,
+                                   patch_threshold=args.patch_threshold, parse_workers=args.parse_workers)
 
-# Step 1: Read Input Files
-banking_system.read_input_files()
+    # Step 2: Apply Transactions
+    banking_system.apply_transactions()
 
-# Step 2: Apply Transactions
-banking_system.apply_transactions()
+    # Step 3: Apply Transaction Fees
+    banking_system.calculate_transaction_fee()
 
-# Step 3: Apply Transaction Fees
-banking_system.calculate_transaction_fee()
-    
-# Step 4: Update Master & Current Account Files
-banking_system.update_master_file()
-banking_system.update_current_file()
+    # Step 4: Update Master & Current Account Files
+    banking_system.write_output_files()
 
-print("Banking system executed successfully!")
+    log.info("Banking system executed successfully!")
+finally:
+    error_logger.sink.close()
+    if profiler:
+        profiler.write_json(args.profile)
+        profiler.close()
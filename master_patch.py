@@ -0,0 +1,104 @@
+"""
+Incremental master file update.
+
+Master records are fixed width, so when no account was created or deleted
+the new master file is the old one with the changed records replaced. A
+MasterPatch copies the old master and rewrites only the dirty records
+(AccountStore.dirty) in a memory-mapped copy, then renames the copy into
+place.
+
+The result must equal a full write.write_account_files rewrite byte for
+byte, so prepare() only agrees when the old master is exactly what a full
+rewrite of the loaded accounts would produce: LF line endings, sorted
+account numbers matching the store, names that survive the reader's
+19-character name field, and the END_OF_FILE record a rewrite would write.
+Otherwise, or when accounts were created or deleted, or too many accounts
+changed, it returns None and the caller does a full rewrite.
+"""
+
+import mmap
+import os
+import shutil
+from bisect import bisect_left
+from account_store import AccountStore
+import write
+
+RECORD_BYTES = 46  # 45 characters + "\n"
+DEFAULT_MAX_DIRTY_FRACTION = 0.1
+
+
+class MasterPatch:
+    def __init__(self, accounts: AccountStore, old_master_path: str, keys: list):
+        self.accounts = accounts
+        self.old_master_path = old_master_path
+        self.keys = keys  # account numbers in file order
+        self.lines = {}
+        for account_number in accounts.dirty:
+            line = write.format_master_line(accounts[account_number]).encode()
+            if len(line) != RECORD_BYTES:  # e.g. a transaction count past 9999
+                raise ValueError(f"Master record for {account_number} is not {RECORD_BYTES} bytes")
+            self.lines[account_number] = line
+
+    def write(self, new_master_path: str) -> int:
+        """
+        Writes the new master file as a patched copy of the old one.
+        Returns the number of record bytes patched.
+        """
+        temp_path = f"{new_master_path}.{os.getpid()}.tmp"
+        try:
+            shutil.copyfile(self.old_master_path, temp_path)
+            if self.lines:
+                with open(temp_path, "r+b") as file, mmap.mmap(file.fileno(), 0) as new_map:
+                    for account_number, line in self.lines.items():
+                        offset = bisect_left(self.keys, account_number) * RECORD_BYTES
+                        new_map[offset:offset + RECORD_BYTES] = line
+                    new_map.flush()
+            os.replace(temp_path, new_master_path)  # readers never see a partial file
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return len(self.lines) * RECORD_BYTES
+
+
+def prepare(accounts, old_master_path: str, max_dirty_fraction: float = DEFAULT_MAX_DIRTY_FRACTION):
+    """
+    Returns a MasterPatch for the accounts, or None when a full rewrite is
+    needed (see the module docstring)
+    """
+    if not isinstance(accounts, AccountStore) or accounts.structure_changed or not accounts:
+        return None
+    if len(accounts.dirty) > max_dirty_fraction * len(accounts):
+        return None
+    try:
+        if os.path.getsize(old_master_path) != (len(accounts) + 1) * RECORD_BYTES:
+            return None
+        keys = _canonical_keys(accounts, old_master_path)
+        if keys is None:
+            return None
+        return MasterPatch(accounts, old_master_path, keys)
+    except (OSError, ValueError):
+        return None
+
+
+# Account numbers of the old master in file order, if every record is what
+# format_master_line would render for the loaded account
+def _canonical_keys(accounts, old_master_path):
+    keys = list(accounts)  # load order, unchanged while structure_changed is False
+    with open(old_master_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as old_map:
+        previous = ""
+        for index, account_number in enumerate(keys):
+            row = old_map[index * RECORD_BYTES:(index + 1) * RECORD_BYTES]
+            if row[:5].decode() != account_number or account_number <= previous:
+                return None
+            if row[45] != 10 or row[5] != 32 or row[26] != 32 or row[28] != 32 or row[37] != 32 or row[42] != 32:
+                return None
+            name = row[6:26]
+            if name != name[:19].strip().ljust(20):  # reader keeps 19 stripped characters
+                return None
+            previous = account_number
+
+        eof = write.format_master_eof_line(int(keys[-1])).encode()
+        if old_map[len(keys) * RECORD_BYTES:] != eof:
+            return None
+    return keys
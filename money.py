@@ -0,0 +1,30 @@
+"""
+Integer-cents helpers for the fixed-width money fields (XXXXX.XX).
+Balances and amounts are held as int cents from parsing through to
+formatting, so fee deductions don't accumulate float drift.
+"""
+
+
+# Parses a money field such as "00300.00" into integer cents
+def parse_cents(text: str) -> int:
+    if len(text) == 8 and text[5] == '.' and text[:5].isdigit() and text[6:].isdigit():
+        return int(text[:5]) * 100 + int(text[6:])
+    # Non fixed-width input (e.g. "300" or "1.5"); raises ValueError like float()
+    return round(float(text) * 100)
+
+
+# Converts a dollar amount (int or float) into integer cents
+def to_cents(amount) -> int:
+    return round(amount * 100)
+
+
+# Converts integer cents back into a dollar float for the dict-style views
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+
+# Formats integer cents exactly like f"{dollars:08.2f}"
+def format_cents(cents: int) -> str:
+    if cents < 0:
+        return f"{cents / 100:08.2f}"
+    return f"{cents // 100:05d}.{cents % 100:02d}"
@@ -0,0 +1,158 @@
+"""
+Multi-day backend runs with the accounts kept in memory between days.
+
+The shell chain (Frontend/weekly.sh) runs main.py once per day and has the
+next day parse the master file the day before wrote. MultiDayRunner reads
+the first master file once, then for each day applies that day's merged
+transaction file to the accounts it holds, charges fees and writes the
+day's master and current files for audit, without reading them back.
+
+The carried accounts are what reading the written master file back would
+give (carry_accounts): account number order, the reader's 19-character
+name field, and records whose master line the reader rejects dropped with
+the reader's error line. A day that fails (a fatal constraint error or an
+output file that can't be written) writes nothing and leaves the accounts
+as they were before it, like main.py leaves the previous day's files in
+place. Each day's output is the same as main.py's for the same input.
+With patch_master, a day patches the master file the day before wrote (or
+the first master file) if it is unchanged since, and rewrites it in full
+otherwise.
+
+Usage: python3 multi_day.py <old_master_file> <merged_transaction_file> [...] [--output-dir DIR]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import traceback
+from account_record import AccountRecord
+from banking_system import BankingSystem
+import log
+import print_error as error_logger
+import read
+import write
+
+
+def carry_accounts(accounts) -> None:
+    """
+    Brings an AccountStore, in place, to what
+    BankingSystem.read_old_bank_accounts reads back from the master file
+    write.write_account_files writes for it, printing the reader's error
+    lines for the records it rejects. Records that read back unchanged (the
+    usual case) are kept as they are.
+    """
+    records = list(accounts.values())
+    if any(a.number >= b.number for a, b in zip(records, records[1:])):
+        records.sort(key=lambda acc: acc.number)
+        accounts.sort()
+
+    for line_num, acc in enumerate(records, 1):
+        account_number = str(acc.number).zfill(5)
+        if 0 <= acc.number <= 99999 and len(acc.name) <= 20 and acc.status in ('A', 'D') \
+                and 0 <= acc.balance_cents <= 9999999 and 0 <= acc.total_transactions <= 9999 \
+                and acc.plan in ('SP', 'NP'):
+            name = acc.name[:19].strip()  # the reader's name field
+            if name == acc.name and name != 'END_OF_FILE':
+                continue
+            record = AccountRecord(acc.number, name, acc.status, acc.balance_cents, acc.total_transactions, acc.plan)
+        else:  # the reader rejects or rewrites this line; let it say so
+            record = read._parse_account_line(write.format_master_line(acc), line_num)
+
+        if record is None or record.name == 'END_OF_FILE':
+            del accounts[account_number]
+        else:
+            accounts[account_number] = record
+
+    if records and records[-1].number >= 99999:  # the END_OF_FILE record number has six digits
+        read._parse_account_line(write.format_master_eof_line(records[-1].number), len(records) + 1)
+    accounts.clear_changes()
+
+
+class MultiDayRunner:
+    """
+    Holds the accounts between days: self.accounts is what the last
+    successful day's master file (or the first master file) reads back as,
+    and self.reader_output what reading that file prints.
+    """
+
+    def __init__(self, old_master_file: str, **options):
+        self.options = options  # further BankingSystem options for every day
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            self.accounts = BankingSystem(old_master_file, os.devnull, **options).accounts
+        self.reader_output = captured.getvalue()
+        self.master_file = old_master_file  # the master file self.accounts were read from or written to
+        self.master_stat = _file_stat(old_master_file)
+
+    # Runs one day: the merged transaction file against a copy of the carried
+    # accounts, writing the new master and current files. Returns False if
+    # the day failed; nothing is written then and the accounts stay as they were.
+    def run_day(self, merged_transaction_file: str, new_master_file: str = "new_master_accounts.txt",
+                new_current_file: str = "new_current_accounts.txt") -> bool:
+        sys.stdout.write(self.reader_output)  # what main.py's read of the master file prints
+        error_logger.configure()
+        options = dict(self.options)
+        master_file = self.master_file if _file_stat(self.master_file) == self.master_stat else None
+        if master_file is None:
+            options["patch_master"] = False  # nothing unchanged left to patch
+        try:
+            # The accounts replace reading master_file; patch_master copies it
+            system = BankingSystem(master_file, merged_transaction_file, accounts=self.accounts.copy(), **options)
+            system.new_master_file = new_master_file
+            system.new_current_file = new_current_file
+            system.apply_transactions()
+            system.calculate_transaction_fee()
+            system.write_output_files()
+            log.info("Banking system executed successfully!")
+        except error_logger.FatalError:
+            return False
+        except Exception:
+            traceback.print_exc()
+            return False
+        finally:
+            error_logger.sink.close()
+
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            carry_accounts(system.accounts)
+        self.accounts = system.accounts
+        self.reader_output = captured.getvalue()
+        self.master_file = new_master_file
+        self.master_stat = _file_stat(new_master_file)
+        return True
+
+
+# Size and modification time of a file, None if it can't be read
+def _file_stat(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python3 multi_day.py <old_master_file> <merged_transaction_file> [...] [--output-dir DIR]")
+    parser.add_argument("old_master_file")
+    parser.add_argument("merged_transaction_files", nargs="+", metavar="merged_transaction_file")
+    parser.add_argument("--output-dir", default=".",
+                        help="write each day's files to DIR/dayN/ (default: the current directory)")
+    args = parser.parse_args()
+
+    runner = MultiDayRunner(args.old_master_file)
+    failed = 0
+    for day, merged_file in enumerate(args.merged_transaction_files, 1):
+        directory = os.path.join(args.output_dir, f"day{day}")
+        os.makedirs(directory, exist_ok=True)
+        log.info("📅 Day %d: %s", day, merged_file)
+        if not runner.run_day(merged_file, os.path.join(directory, "new_master_accounts.txt"),
+                              os.path.join(directory, "new_current_accounts.txt")):
+            failed += 1
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Account-sharded parallel transaction application.
+
+Accounts are split into contiguous account number ranges, one shard per
+worker process. Every transaction goes to the shard that owns its account
+number, in the original order, and each worker applies its transactions
+with an ordinary AccountManager.
+
+Creates and deletes change the account number space (duplicate-name checks,
+highest + 1 numbering), so they are sequenced in the parent first: the
+parent runs each create against the full account store, then sends the new
+record to the shard that owns its number (new numbers are always above the
+last range boundary, so they land on the last shard). Deletes are mirrored
+in the parent store so later creates see the same names and numbers as the
+serial run. The final balances, statuses, plans, transaction counts and
+account order are identical to BankingSystem.apply_transactions; only the
+interleaving of printed messages differs.
+"""
+
+import sys
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from account_manager import AccountManager, BatchResult
+from account_record import AccountRecord
+from account_store import AccountStore
+from transaction_record import TransactionRecord
+import print_error as error_logger
+
+
+def apply_transactions(manager: AccountManager, transactions, workers: int) -> BatchResult:
+    """
+    Applies transactions to manager.accounts using the given number of shards
+    and returns the per-code counts, as AccountManager.apply_batch does. With
+    workers == 1 the single shard runs in this process. An unknown
+    transaction code is fatal after the transactions before it were applied,
+    as in the serial loop.
+    """
+    accounts = manager.accounts
+    bounds = _shard_bounds(accounts, workers)
+    shards = _split_accounts(accounts, bounds, workers)
+    ops = [[] for _ in range(workers)]
+    counts = BatchResult(Counter(), Counter())
+    unknown = None
+
+    for transaction in transactions:
+        if type(transaction) is not TransactionRecord:
+            transaction = TransactionRecord.from_mapping(transaction)
+        code = transaction.code
+        if code not in manager.handlers:
+            unknown = transaction
+            break
+
+        if code == "05":
+            _sequence_create(manager, transaction, bounds, ops, counts)
+            continue
+        account_number = transaction.account_number.strip().zfill(5)
+        if code == "06" and account_number in accounts:
+            del accounts[account_number]  # mirrored so later creates see the same number space
+        ops[_shard_of(account_number, bounds)].append(("apply", transaction))
+
+    if workers == 1:
+        results = [_apply_shard(shards[0], ops[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_run_shard, shards, ops))
+        results = [result for result, _ in outputs]
+        for _, errors in outputs:
+            for error in errors:
+                error_logger.sink.add(error)
+
+    # Take back the records the shards changed; assigning existing keys keeps
+    # the parent's (serial) account order
+    for records, dirty, shard_counts in results:
+        for record in records:
+            account_number = str(record.number).zfill(5)
+            if account_number in dirty:
+                accounts[account_number] = record
+                accounts.mark_dirty(account_number)
+        counts.applied.update(shard_counts.applied)
+        counts.rejected.update(shard_counts.rejected)
+
+    if unknown is not None:
+        manager.apply_transaction(unknown)  # fatal
+    return counts
+
+
+# Runs a create in the parent and routes the new record to the shard that
+# owns its number. Existing records belong to the shards and are not touched here.
+def _sequence_create(manager, transaction, bounds, ops, counts):
+    accounts = manager.accounts
+    new_account_number = accounts.next_account_number()
+    if not manager.create_account(transaction):
+        counts.rejected["05"] += 1
+        return
+    counts.applied["05"] += 1
+    created = accounts[new_account_number]
+    ops[_shard_of(new_account_number, bounds)].append(("insert", AccountRecord(
+        created.number, created.name, created.status, created.balance_cents, 0, created.plan)))
+
+
+# Upper range boundaries splitting the current accounts into equal shards
+def _shard_bounds(accounts, workers):
+    numbers = sorted(int(number) for number in accounts)
+    if not numbers:
+        return []
+    return [numbers[len(numbers) * i // workers] for i in range(1, workers)]
+
+
+def _shard_of(account_number, bounds):
+    try:
+        return bisect_right(bounds, int(account_number))
+    except ValueError:  # not a number, no shard holds it
+        return 0
+
+
+def _split_accounts(accounts, bounds, workers):
+    shards = [[] for _ in range(workers)]
+    for number, account in accounts.items():
+        shards[_shard_of(number, bounds)].append(account)
+    return shards
+
+
+# Pool worker: runs a shard against a fresh error sink and hands the error
+# records back, so the parent's counts and error report include them
+def _run_shard(records, ops):
+    sink = error_logger.configure(echo=error_logger.sink.echo, buffer_size=sys.maxsize)
+    return _apply_shard(records, ops), sink.records
+
+
+# Applies one shard's operations in order and returns its records, the
+# account numbers it changed and its per-code counts
+def _apply_shard(records, ops):
+    store = AccountStore()
+    for record in records:
+        store[str(record.number).zfill(5)] = record
+    store.clear_changes()
+    manager = AccountManager(store)
+    counts = BatchResult(Counter(), Counter())
+
+    for op, value in ops:
+        if op == "apply":
+            if manager.apply_transaction(value):
+                counts.applied[value.code] += 1
+            else:
+                counts.rejected[value.code] += 1
+        else:  # insert
+            store[str(value.number).zfill(5)] = value
+    return list(store.values()), store.dirty, counts
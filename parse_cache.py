@@ -0,0 +1,105 @@
+"""
+On-disk cache of parsed input files, keyed by a hash of the file content.
+
+A hit returns the parsed result without reading the text format again and
+replays whatever the parser printed (e.g. line errors), so output is the
+same as a fresh parse. Entries are evicted by age and by total size.
+"""
+
+import contextlib
+import hashlib
+import io
+import os
+import pickle
+import sys
+import time
+
+FORMAT_VERSION = 2  # bump when a parser's result format changes
+DEFAULT_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "sqa_banking")
+
+
+class ParseCache:
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_age: float = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024, enabled: bool = True):
+        self.directory = directory
+        self.max_age = max_age  # seconds since an entry was last used
+        self.max_bytes = max_bytes  # total size of all entries
+        self.enabled = enabled
+
+    # Returns parser(file_path), from the cache when this content was parsed before
+    def load(self, file_path: str, kind: str, parser):
+        if not self.enabled:
+            return parser(file_path)
+
+        entry = self._entry_path(file_path, kind)
+        try:
+            with open(entry, "rb") as file:
+                result, output = pickle.load(file)
+            os.utime(entry)  # mark as recently used
+            sys.stdout.write(output)
+            return result
+        except Exception:
+            pass  # missing or unreadable entry: parse the file again
+
+        captured = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(captured):
+                result = parser(file_path)
+        finally:
+            output = captured.getvalue()
+            sys.stdout.write(output)  # also what a failing parser printed before it raised
+
+        self._store(entry, result, output)
+        return result
+
+    # Removes entries unused for longer than max_age, then the least recently
+    # used ones until the total size is within max_bytes
+    def evict(self) -> None:
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self._remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    # Deletes every cache entry
+    def clear(self) -> None:
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                self._remove(os.path.join(self.directory, name))
+
+    def _entry_path(self, file_path, kind):
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return os.path.join(self.directory, f"{kind}-v{FORMAT_VERSION}-{digest.hexdigest()}.pickle")
+
+    def _store(self, entry, result, output):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{entry}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                pickle.dump((result, output), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry)  # readers never see a partial entry
+            self.evict()
+        except OSError:
+            pass  # the cache is best-effort; a failed write only costs a re-parse
+
+    @staticmethod
+    def _remove(path):
+        with contextlib.suppress(OSError):
+            os.remove(path)
@@ -1,6 +1,108 @@
 import sys
+from collections import Counter
+from typing import NamedTuple, Optional
+import log
 
-def log_constraint_error(description, context, fatal=False):
+
+class FatalError(SystemExit):
+    """
+    Raised by a fatal constraint error. A SystemExit with exit code 1, so an
+    uncaught one ends the run like sys.exit(1), after finally blocks (error
+    report flush, summary) have run.
+    """
+
+    def __init__(self, description: str):
+        super().__init__(1)
+        self.description = description
+
+
+class ErrorRecord(NamedTuple):
+    category: str
+    account: Optional[str]
+    context: str
+    description: str
+    fatal: bool
+
+    # The original ERROR: line for this record
+    def line(self) -> str:
+        if self.fatal:
+            return f"ERROR: Fatal error - File {self.context} - {self.description}"
+        return f"ERROR: {self.context}: {self.description}"
+
+
+class ErrorSink:
+    """
+    Collects constraint errors as ErrorRecord tuples with counts per category
+    and per account. Every buffer_size records the buffer is flushed in bulk
+    to the report file as ERROR: lines (one write), or dropped when there is
+    no report file; the counts are kept either way. echo also logs each
+    ERROR: line as it happens, like the old print_error.
+    """
+
+    def __init__(self, report_path: str = None, echo: bool = True, buffer_size: int = 10000):
+        self.report_path = report_path
+        self.echo = echo
+        self.buffer_size = buffer_size
+        self.records = []
+        self.categories = Counter()
+        self.accounts = Counter()
+        self.total = 0
+        self.fatal = 0
+        if report_path:
+            open(report_path, "w").close()
+
+    def add(self, record: ErrorRecord) -> None:
+        self.records.append(record)
+        self.categories[record.category] += 1
+        if record.account is not None:
+            self.accounts[record.account] += 1
+        self.total += 1
+        self.fatal += record.fatal
+        if len(self.records) >= self.buffer_size:
+            self.flush()
+
+    # Appends the buffered records to the report file and empties the buffer
+    def flush(self) -> None:
+        if self.report_path and self.records:
+            with open(self.report_path, "a") as file:
+                file.write("".join(record.line() + "\n" for record in self.records))
+        self.records = []
+
+    # Summary lines: totals, errors per category, accounts with the most errors
+    def summary(self, top: int = 10) -> list:
+        if not self.total:
+            return []
+        lines = [f"Error summary: {self.total} errors ({self.fatal} fatal)"]
+        lines += [f"  {category}: {count}" for category, count in self.categories.most_common()]
+        if self.accounts:
+            lines.append("  Accounts with the most errors: " + ", ".join(
+                f"{account} ({count})" for account, count in self.accounts.most_common(top)))
+        return lines
+
+    # Flushes the buffer and writes the summary to stderr (unless quiet), so
+    # stdout keeps the run's own output, and to the report file
+    def close(self) -> None:
+        self.flush()
+        lines = self.summary()
+        if lines and log.enabled(log.INFO):
+            sys.stdout.flush()  # the summary still comes last when both streams go to one file
+            sys.stderr.write("".join(line + "\n" for line in lines))
+        if self.report_path and lines:
+            with open(self.report_path, "a") as file:
+                file.write("\n".join(lines) + "\n")
+
+
+sink = ErrorSink()
+
+
+# Replaces the module sink (main.py calls this once per run)
+def configure(report_path: str = None, echo: bool = True, buffer_size: int = 10000) -> ErrorSink:
+    global sink
+    sink = ErrorSink(report_path, echo, buffer_size)
+    return sink
+
+
+def log_constraint_error(description, context, fatal=False, category=None, account=None):
     """
     Logs errors in the required format and exits if fatal.
 
@@ -8,11 +110,17 @@ def log_constraint_error(description, context, fatal=False):
         message: The main error message/type
         description: Detailed error description
         context: File name (if fatal) or constraint type (if non-fatal)
-        fatal: If True, treats as fatal error and exits program
+        fatal: If True, treats as fatal error and raises FatalError
+        category: Error category for the summary (defaults to description)
+        account: Account number the error is about, if any
     """
+    record = ErrorRecord(category or description, account, context, description, fatal)
+    sink.add(record)
+    if sink.echo:
+        if fatal:
+            log.error("ERROR: Fatal error - File %s - %s", context, description)
+        else:
+            log.error("ERROR: %s: %s", context, description)
     if fatal:
-        print(f"ERROR: Fatal error - File {context} - {description}")
-        # exit system code here
-        sys.exit(1)
-    else:
-        print(f"ERROR: {context}: {description}")
+        # stop the run; main.py flushes the error report on the way out
+        raise FatalError(description)
@@ -0,0 +1,113 @@
+"""
+Per-stage profiling for the backend pipeline.
+
+BankingSystem takes a profiler and runs each pipeline stage inside
+profiler.stage(name) (see the @profiled methods). StageProfiler records
+wall time, CPU time and, optionally, the tracemalloc peak for every stage,
+and can run chosen stages under cProfile, writing <stage>.pstats files.
+The default NULL_PROFILER does nothing: a stage costs one method call and
+an empty context manager.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class NullProfiler:
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageProfiler:
+    """
+    Records one entry per stage run, in order: wall and CPU seconds, and with
+    memory=True the tracemalloc peak during the stage (tracing starts here if
+    it isn't on yet; close() stops it again). Stages named in cprofile_stages
+    also write a pstats file to pstats_dir.
+    """
+
+    def __init__(self, memory: bool = True, cprofile_stages=(), pstats_dir: str = "."):
+        self.memory = memory
+        self.cprofile_stages = set(cprofile_stages)
+        self.pstats_dir = pstats_dir
+        self.stages = []
+        self._started_tracing = memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = {"stage": name}
+        profile = cProfile.Profile() if name in self.cprofile_stages else None
+        if self.memory:
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield entry
+        finally:
+            if profile:
+                profile.disable()
+            entry["wall_seconds"] = time.perf_counter() - wall
+            entry["cpu_seconds"] = time.process_time() - cpu
+            if self.memory:
+                entry["current_bytes"], entry["peak_bytes"] = tracemalloc.get_traced_memory()
+            if profile:
+                entry["pstats"] = os.path.join(self.pstats_dir, f"{name}.pstats")
+                profile.dump_stats(entry["pstats"])
+            self.stages.append(entry)
+
+    # Last recorded entry for a stage, or None
+    def last(self, name: str):
+        for entry in reversed(self.stages):
+            if entry["stage"] == name:
+                return entry
+        return None
+
+    def report(self) -> dict:
+        report = {
+            "python": platform.python_version(),
+            "stages": self.stages,
+            "total_wall_seconds": sum(entry["wall_seconds"] for entry in self.stages),
+            "total_cpu_seconds": sum(entry["cpu_seconds"] for entry in self.stages),
+        }
+        if self.memory:
+            report["peak_bytes"] = max((entry["peak_bytes"] for entry in self.stages), default=0)
+        return report
+
+    # Stops tracemalloc if this profiler started it
+    def close(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def write_json(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+            file.write("\n")
+
+
+def profiled(name: str):
+    """
+    Method decorator: runs the method as stage `name` of self.profiler
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
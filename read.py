@@ -1,82 +1,391 @@
+import itertools
+import locale
+import mmap
+import re
+import sys
+from account_record import AccountRecord
+import money
+from transaction_record import TransactionRecord
+
+try:
+    import numpy as np
+except ImportError:  # bulk decode falls back to the regex path
+    np = None
+
+# One valid 45-character master record; separators must be spaces and the
+# name printable ASCII, anything else is left to the per-line diagnostics
+_VALID_RECORD = (rb"(\d{5}) ([\x20-\x7e]{20}) ([AD]) (\d{5})\.(\d{2}) (\d{4}) (SP|NP)"
+                 rb"|(?P<bad>[^\r\n]{45})")
+_STATUSES = {b"A": "A", b"D": "D"}
+_PLANS = {b"SP": "SP", b"NP": "NP"}
+
+
 def read_old_bank_accounts(file_path):
     """
     Reads and validates the bank account file format with plan type (SP/NP)
-    Returns list of accounts and prints fatal errors for invalid format
+    Returns list of AccountRecord objects and prints fatal errors for invalid format
     """
     accounts = []
     with open(file_path, 'r') as file:
         for line_num, line in enumerate(file, 1):
-            clean_line = line.rstrip('\n')
+            account = _parse_account_line(line, line_num)
+            if account is not None:
+                accounts.append(account)
+    return accounts
 
-            # Validate line length (now 45 chars to include plan type)
-            if len(clean_line) != 45:
-                print(f"ERROR: Fatal error - Line {line_num}: Invalid length ({len(clean_line)} chars, expected 45)")
-                continue
 
-            try:
-                # Extract fields with positional validation
-                account_number = clean_line[0:5]
-                name = clean_line[6:25]  # 20 characters
-                status = clean_line[27]
-                balance_str = clean_line[29:37]  # 8 characters
-                transactions_str = clean_line[38:42]  # 4 characters
-                plan_type = clean_line[43:45]  # 2 characters (SP/NP)
-
-                # Validate account number
-                if not account_number.isdigit():
-                    print(f"ERROR: Fatal error - Line {line_num}: Account number must be 5 digits")
-                    continue
+def _parse_account_line(line, line_num):
+    """
+    Validates one master file line and returns its AccountRecord,
+    or prints the fatal error for the line and returns None
+    """
+    clean_line = line.rstrip('\n')
 
-                # Validate status
-                if status not in ('A', 'D'):
-                    print(f"ERROR: Fatal error - Line {line_num}: Invalid status '{status}'. Must be 'A' or 'D'")
-                    continue
+    # Validate line length (now 45 chars to include plan type)
+    if len(clean_line) != 45:
+        print(f"ERROR: Fatal error - Line {line_num}: Invalid length ({len(clean_line)} chars, expected 45)")
+        return None
 
-                # Validate balance format with explicit negative check
-                if balance_str[0] == '-':
-                    print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected: {balance_str}")
-                    continue
+    try:
+        # Extract fields with positional validation
+        account_number = clean_line[0:5]
+        name = clean_line[6:25]  # 20 characters
+        status = clean_line[27]
+        balance_str = clean_line[29:37]  # 8 characters
+        transactions_str = clean_line[38:42]  # 4 characters
+        plan_type = clean_line[43:45]  # 2 characters (SP/NP)
 
-                if (len(balance_str) != 8 or
-                        balance_str[5] != '.' or
-                        not balance_str[:5].isdigit() or
-                        not balance_str[6:].isdigit()):
-                    print(
-                        f"ERROR: Fatal error - Line {line_num}: Invalid balance format. Expected XXXXX.XX, got {balance_str}")
-                    continue
+        # Validate account number
+        if not account_number.isdigit():
+            print(f"ERROR: Fatal error - Line {line_num}: Account number must be 5 digits")
+            return None
 
-                # Validate transaction count
-                if not transactions_str.isdigit():
-                    print(f"ERROR: Fatal error - Line {line_num}: Transaction count must be 4 digits")
-                    continue
+        # Validate status
+        if status not in ('A', 'D'):
+            print(f"ERROR: Fatal error - Line {line_num}: Invalid status '{status}'. Must be 'A' or 'D'")
+            return None
 
-                # Validate plan type
-                if plan_type not in ('SP', 'NP'):
-                    print(f"ERROR: Fatal error - Line {line_num}: Invalid plan type '{plan_type}'. Must be SP or NP")
-                    continue
+        # Validate balance format with explicit negative check
+        if balance_str[0] == '-':
+            print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected: {balance_str}")
+            return None
 
-                # Convert values
-                balance = float(balance_str)
-                transactions = int(transactions_str)
+        if (len(balance_str) != 8 or
+                balance_str[5] != '.' or
+                not balance_str[:5].isdigit() or
+                not balance_str[6:].isdigit()):
+            print(
+                f"ERROR: Fatal error - Line {line_num}: Invalid balance format. Expected XXXXX.XX, got {balance_str}")
+            return None
 
-                # Business rule validation
-                if balance < 0:
-                    print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected")
-                    continue
-                if transactions < 0:
-                    print(f"ERROR: Fatal error - Line {line_num}: Negative transaction not allowed")
+        # Validate transaction count
+        if not transactions_str.isdigit():
+            print(f"ERROR: Fatal error - Line {line_num}: Transaction count must be 4 digits")
+            return None
+
+        # Validate plan type
+        if plan_type not in ('SP', 'NP'):
+            print(f"ERROR: Fatal error - Line {line_num}: Invalid plan type '{plan_type}'. Must be SP or NP")
+            return None
+
+        # Convert values (balance in integer cents)
+        balance = money.parse_cents(balance_str)
+        transactions = int(transactions_str)
+
+        # Business rule validation
+        if balance < 0:
+            print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected")
+            return None
+        if transactions < 0:
+            print(f"ERROR: Fatal error - Line {line_num}: Negative transaction not allowed")
+            return None
+
+        return AccountRecord(
+            int(account_number),
+            name.strip(),
+            status,
+            balance,
+            transactions,
+            plan_type
+        )
+
+    except Exception as e:
+        print(f"ERROR: Fatal error - Line {line_num}: Unexpected error - {str(e)}")
+        return None
+
+
+def read_old_bank_accounts_mmap(file_path):
+    """
+    Fast loader for the master accounts file, same result and error lines as
+    read_old_bank_accounts. Memory-maps the file, checks once that every
+    record is 45 characters plus the same line ending, then validates and
+    decodes all records in bulk (NumPy over the whole buffer when installed,
+    otherwise one precompiled pattern). Records failing the bulk check get
+    the per-line diagnostics; a file that fails the layout check is read
+    with read_old_bank_accounts.
+    """
+    with open(file_path, 'rb') as file:
+        if file.seek(0, 2) == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            newline = b"\r\n" if buffer[45:47] == b"\r\n" else b"\n"
+            if np is not None:
+                accounts = _decode_records_numpy(buffer, newline)
+            else:
+                accounts = _decode_records_regex(buffer, newline)
+    if accounts is None:
+        return read_old_bank_accounts(file_path)
+    return accounts
+
+
+# Bulk decode with one precompiled pattern; None if the layout check fails
+def _decode_records_regex(buffer, newline):
+    escaped = re.escape(newline)
+    layout = re.compile(rb"(?:[^\r\n]{45}" + escaped + rb")*(?:[^\r\n]{45})?")
+    if not layout.fullmatch(buffer):
+        return None
+
+    accounts = []
+    records = re.compile(rb"(?:" + _VALID_RECORD + rb")(?:" + escaped + rb")?")
+    for line_num, match in enumerate(records.finditer(buffer), 1):
+        if match.lastgroup == 'bad':
+            account = _parse_account_line(match.group('bad').decode(), line_num)
+            if account is not None:
+                accounts.append(account)
+            continue
+
+        number, name, status, dollars, cents, transactions, plan = match.groups()[:7]
+        accounts.append(AccountRecord(
+            int(number),
+            name[:19].decode().strip(),  # same 19 characters as read_old_bank_accounts
+            _STATUSES[status],
+            int(dollars) * 100 + int(cents),
+            int(transactions),
+            _PLANS[plan]
+        ))
+    return accounts
+
+
+# Bulk decode with NumPy on a (records x stride) view; None if the layout check fails
+def _decode_records_numpy(buffer, newline):
+    stride = 45 + len(newline)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) % stride == 45:  # last record without a line ending
+        data = np.concatenate([data, np.frombuffer(newline, dtype=np.uint8)])
+    if len(data) % stride:
+        return None
+
+    rows = data.reshape(-1, stride)
+    fields = rows[:, :45]
+    if (rows[:, 45:] != np.frombuffer(newline, dtype=np.uint8)).any() or \
+            ((fields == 10) | (fields == 13)).any():
+        return None
+
+    def digits(start, stop):
+        return ((rows[:, start:stop] >= 48) & (rows[:, start:stop] <= 57)).all(axis=1)
+
+    def number(start, stop):
+        weights = 10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64)
+        return (rows[:, start:stop].astype(np.int64) - 48) @ weights
+
+    name_field = rows[:, 6:26]
+    status = rows[:, 27]
+    is_sp = (rows[:, 43] == 83) & (rows[:, 44] == 80)
+    valid = (digits(0, 5) & digits(29, 34) & digits(35, 37) & digits(38, 42)
+             & (rows[:, [5, 26, 28, 37, 42]] == 32).all(axis=1)
+             & ((name_field >= 32) & (name_field <= 126)).all(axis=1)
+             & ((status == 65) | (status == 68))
+             & (rows[:, 34] == 46)
+             & (is_sp | ((rows[:, 43] == 78) & (rows[:, 44] == 80))))
+
+    numbers = number(0, 5).tolist()
+    names = np.ascontiguousarray(rows[:, 6:25]).view('S19').ravel().tolist()  # same 19 characters as the line reader
+    statuses = np.where(status == 65, "A", "D").tolist()
+    balances = (number(29, 34) * 100 + number(35, 37)).tolist()
+    transactions = number(38, 42).tolist()
+    plans = np.where(is_sp, "SP", "NP").tolist()
+
+    def build(start, stop):
+        return map(AccountRecord, numbers[start:stop], [name.decode().strip() for name in names[start:stop]],
+                   statuses[start:stop], balances[start:stop], transactions[start:stop], plans[start:stop])
+
+    # Valid runs are built in bulk; each invalid record gets the per-line diagnostics in order
+    accounts = []
+    start = 0
+    for index in np.flatnonzero(~valid).tolist():
+        accounts.extend(build(start, index))
+        account = _parse_account_line(bytes(rows[index, :45]).decode(), index + 1)
+        if account is not None:
+            accounts.append(account)
+        start = index + 1
+    accounts.extend(build(start, len(rows)))
+    return accounts
+
+
+# Merged transaction file records: "CC NAME(20) NNNNN DDDDD.CC MM", 41 characters.
+# A chunk whose lines all have this layout is decoded in bulk (NumPy at a
+# fixed stride when installed, otherwise string slicing at fixed offsets);
+# in any other chunk every line is matched against the pattern, and lines
+# without the layout are reported and parsed field by field.
+_TRANSACTION_RECORD = re.compile(r"(\d\d) (.{20}) (\d{5}) (\d{5})\.(\d\d) (.{2})", re.ASCII)
+_TRANSACTION_DIGITS = [0, 1, 24, 25, 26, 27, 28, 30, 31, 32, 33, 34, 36, 37]
+_TRANSACTION_SPACES = [2, 23, 29, 38]
+_TRANSACTION_CODES = [f"{code:02d}" for code in range(100)]
+TRANSACTION_CHUNK_SIZE = 1 << 20  # bytes read and parsed at a time
+
+
+def iter_transactions(file_path, chunk_size=TRANSACTION_CHUNK_SIZE, start=0, stop=None, first_line=1):
+    """
+    Parses the merged transaction file in large chunks of whole lines and
+    yields a TransactionRecord per transaction; end-of-session records
+    (code "00") are skipped. Lines are split and decoded like the text
+    mode line reader did (universal newlines, locale encoding). Lines
+    without the record layout are reported with their line number and
+    parsed field by field like that reader.
+    With start/stop only those bytes are parsed (a run of whole sessions
+    from a session_index, whose first line is line first_line).
+    """
+    encoding = locale.getpreferredencoding(False)
+    line_num = first_line - 1
+    pending = b""
+    remaining = None if stop is None else stop - start
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        while True:
+            chunk = file.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if remaining is not None:
+                remaining -= len(chunk)
+            if chunk:
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                if not cut:
+                    pending = data
                     continue
+                data, pending = data[:cut], data[cut:]
+            elif pending:
+                data, pending = pending, b""  # last line has no line ending
+            else:
+                break
 
-                accounts.append({
-                    'account_number': account_number.lstrip('0') or '0',
-                    'name': name.strip(),
-                    'status': status,
-                    'balance': balance,
-                    'total_transactions': transactions,
-                    'plan': plan_type
-                })
-
-            except Exception as e:
-                print(f"ERROR: Fatal error - Line {line_num}: Unexpected error - {str(e)}")
+            decoded = _decode_transactions_numpy(data) if np is not None else None
+            if decoded is not None:
+                records, count = decoded
+                yield from records
+                line_num += count
                 continue
-    return accounts
\ No newline at end of file
+
+            text = data.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+            lines = (text[:-1] if text.endswith("\n") else text).split("\n")
+            if _has_record_layout(text, len(lines)):
+                new = tuple.__new__
+                yield from [new(TransactionRecord, (line[:2], line[3:23].strip(), line[24:29],
+                                                    int(line[30:35] + line[36:38]), line[39:].strip()))
+                            for line in lines if line[:2] != "00"]
+            else:
+                for offset, line in enumerate(lines, line_num + 1):
+                    record = _match_transaction_line(line, offset)
+                    if record is not None:
+                        yield record
+            line_num += len(lines)
+
+
+# Bulk decode of a chunk of whole lines with NumPy on a (lines x stride)
+# view; (records, line count), or None if any line lacks the record layout
+# or isn't printable ASCII
+def _decode_transactions_numpy(data):
+    newline = b"\r\n" if data[41:43] == b"\r\n" else b"\n"
+    stride = 41 + len(newline)
+    if len(data) % stride == 41:  # last line without a line ending
+        data += newline
+    if len(data) % stride:
+        return None
+
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+    fields = rows[:, :41]
+    digits = rows[:, _TRANSACTION_DIGITS]
+    if (rows[:, 41:] != np.frombuffer(newline, dtype=np.uint8)).any() or \
+            ((fields < 32) | (fields > 126)).any() or ((digits < 48) | (digits > 57)).any() or \
+            (rows[:, _TRANSACTION_SPACES] != 32).any() or (rows[:, 35] != 46).any():
+        return None
+
+    digits = digits.astype(np.int64) - 48
+    codes = digits[:, 0] * 10 + digits[:, 1]
+    keep = codes != 0  # end-of-session records
+    rows, digits = rows[keep], digits[keep]
+
+    def text(start, stop):
+        return map(bytes.decode, np.ascontiguousarray(rows[:, start:stop]).view(f"S{stop - start}").ravel().tolist())
+
+    amounts = digits[:, 7:] @ (10 ** np.arange(6, -1, -1, dtype=np.int64))
+    records = list(map(tuple.__new__, itertools.repeat(TransactionRecord), zip(
+        map(_TRANSACTION_CODES.__getitem__, codes[keep].tolist()),
+        map(str.strip, text(3, 23)),
+        text(24, 29),
+        amounts.tolist(),
+        map(sys.intern, map(str.strip, text(39, 41))),
+    )))
+    return records, len(keep)
+
+
+# Checks in bulk (one string operation per column, at a 42-character stride)
+# that every one of the count lines in text has the transaction record layout
+def _has_record_layout(text, count):
+    stride = 42
+    text = text[:-1] if text.endswith("\n") else text
+    if len(text) != stride * count - 1 or text[stride - 1::stride] != "\n" * (count - 1):
+        return False
+    digits = "".join(text[i::stride] for i in _TRANSACTION_DIGITS)
+    spaces = "".join(text[i::stride] for i in _TRANSACTION_SPACES)
+    return _is_digits(digits) and spaces == " " * len(spaces) and text[35::stride] == "." * count
+
+
+def _is_digits(text):
+    return text.isascii() and text.isdigit()
+
+
+# Returns the TransactionRecord of one line (None for an end-of-session record
+# or a skipped line)
+def _match_transaction_line(line, line_num):
+    match = _TRANSACTION_RECORD.fullmatch(line)
+    if match is None:
+        return _parse_transaction_line(line, line_num)
+    code, name, number, dollars, cents, misc = match.groups()
+    if code == "00":
+        return None
+    return TransactionRecord(code, name.strip(), number, int(dollars + cents), misc.strip())
+
+
+def _parse_transaction_line(line, line_num):
+    """
+    Reports a merged transaction file line without the record layout and
+    returns its TransactionRecord as the old line reader parsed it, or None
+    for an end-of-session record. A line whose amount can't be parsed at all
+    (a blank or short line) is reported as skipped and also gives None.
+    """
+    if len(line) != 41:
+        problem = f"Invalid length ({len(line)} chars, expected 41)"
+    elif not _is_digits(line[:2]):
+        problem = f"Transaction code must be 2 digits, got '{line[:2]}'"
+    elif not _is_digits(line[24:29]):
+        problem = f"Account number must be 5 digits, got '{line[24:29]}'"
+    elif not (_is_digits(line[30:35]) and line[35] == '.' and _is_digits(line[36:38])):
+        problem = f"Invalid amount format. Expected XXXXX.XX, got {line[30:38]}"
+    else:
+        problem = "Fields must be separated by single spaces"
+
+    if line.startswith("00"):  # End of session
+        print(f"ERROR: Malformed transaction - Line {line_num}: {problem}")
+        return None
+    try:
+        amount = money.parse_cents(line[30:38].strip())
+    except ValueError:
+        print(f"ERROR: Malformed transaction - Line {line_num}: {problem}; line skipped")
+        return None
+    print(f"ERROR: Malformed transaction - Line {line_num}: {problem}")
+    return TransactionRecord(
+        line[:2].strip(),
+        line[3:23].strip(),
+        line[24:29].strip(),
+        amount,
+        line[39:].strip()
+    )
@@ -0,0 +1,226 @@
+"""
+Session offset index for merged transaction files.
+
+A merged transaction file is the frontend sessions' transaction files
+concatenated, each session ending with a "00" end-of-session record. The
+index is a binary sidecar next to it (merged_transactions.idx) recording
+where every session starts and how many transactions it holds, so a
+session can be read without scanning the sessions before it and the file
+can be split on session boundaries for parallel parsing.
+
+Layout (little-endian):
+    header   magic b"SQAI", version u16, 2 pad bytes, session count u32,
+             indexed file size u64, indexed file mtime_ns u64 (28 bytes)
+    uint64   session start byte offsets, plus the file size  [count + 1]
+    uint32   transactions per session (end record excluded) [count]
+
+Lines end with "\n" or "\r\n". Any line starting with "00" ends a session,
+as it does for read.iter_transactions; lines after the last one form a
+final, unterminated session. The index is rebuilt when the merged file's
+size or modification time no longer match.
+
+Usage: python3 session_index.py <merged_transaction_file> [--session N]
+"""
+
+import argparse
+import io
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import read
+
+MAGIC = b"SQAI"
+VERSION = 1
+HEADER = struct.Struct("<4sH2xIQQ")
+
+_SESSION_END = re.compile(rb"^00[^\n]*(?:\n|\Z)", re.M)
+
+
+class SessionIndex:
+    def __init__(self, offsets, counts, size: int, mtime_ns: int):
+        self.offsets = offsets  # array("Q"): session start offsets, then the file size
+        self.counts = counts  # array("I"): transactions per session
+        self.size = size  # size and mtime_ns of the indexed file
+        self.mtime_ns = mtime_ns
+        self._first_lines = None
+
+    def __len__(self):
+        return len(self.counts)
+
+    # Byte range [start, stop) of session n (0-based)
+    def session_range(self, n: int):
+        return self.offsets[n], self.offsets[n + 1]
+
+    # Line number of the first line of session n
+    def first_line(self, n: int) -> int:
+        if self._first_lines is None:
+            lines = array("Q", [1])
+            for count in self.counts:
+                lines.append(lines[-1] + count + 1)  # the session's transactions and its end record
+            self._first_lines = lines
+        return self._first_lines[n]
+
+    # True if the index still describes the file at file_path
+    def matches(self, file_path: str) -> bool:
+        stat = os.stat(file_path)
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    # Transactions of session n, read straight from its offset
+    def read_session(self, file_path: str, n: int):
+        start, stop = self.session_range(n)
+        return list(read.iter_transactions(file_path, start=start, stop=stop, first_line=self.first_line(n)))
+
+    # Splits the sessions into at most `parts` contiguous runs of similar
+    # byte size; returns (start, stop, first line) per run
+    def split(self, parts: int):
+        bounds = [0]
+        for part in range(1, parts):
+            target = self.offsets[-1] * part // parts
+            session = bisect_left(self.offsets, target, bounds[-1] + 1, len(self))
+            if session < len(self):
+                bounds.append(session)
+        bounds.append(len(self))
+        return [(self.offsets[first], self.offsets[last], self.first_line(first))
+                for first, last in zip(bounds, bounds[1:]) if last > first]
+
+
+# Sidecar path written next to a merged transaction file (merged_transactions.idx)
+def index_path(merged_path: str) -> str:
+    return os.path.splitext(merged_path)[0] + ".idx"
+
+
+def build_index(merged_path: str) -> SessionIndex:
+    """
+    Scans the merged transaction file once and returns its SessionIndex
+    """
+    stat = os.stat(merged_path)
+    with open(merged_path, "rb") as file:
+        data = file.read()
+
+    offsets = array("Q", [0])
+    counts = array("I")
+    for match in _SESSION_END.finditer(data):
+        start = offsets[-1]
+        counts.append(data.count(b"\n", start, match.start()))
+        offsets.append(match.end())
+    if offsets[-1] < len(data):  # lines after the last end record
+        start = offsets[-1]
+        counts.append(data.count(b"\n", start) + (not data.endswith(b"\n")))
+        offsets.append(len(data))
+    return SessionIndex(offsets, counts, stat.st_size, stat.st_mtime_ns)
+
+
+def write_index(index: SessionIndex, file_path: str) -> None:
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(index), index.size, index.mtime_ns))
+        file.write(_little_endian(index.offsets).tobytes())
+        file.write(_little_endian(index.counts).tobytes())
+    os.replace(temp_path, file_path)
+
+
+def read_index(file_path: str) -> SessionIndex:
+    with open(file_path, "rb") as file:
+        data = file.read()
+
+    magic, version, count, size, mtime_ns = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{file_path} is not a session index file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported session index version {version} in {file_path}")
+
+    offsets, counts = array("Q"), array("I")
+    end = HEADER.size + 8 * (count + 1)
+    offsets.frombytes(data[HEADER.size:end])
+    counts.frombytes(data[end:end + 4 * count])
+    return SessionIndex(_little_endian(offsets), _little_endian(counts), size, mtime_ns)
+
+
+def load_index(merged_path: str) -> SessionIndex:
+    """
+    Returns the index of the merged transaction file from its sidecar, or
+    builds it (and writes the sidecar, best-effort) when the sidecar is
+    missing, unreadable or out of date
+    """
+    path = index_path(merged_path)
+    try:
+        index = read_index(path)
+        if index.matches(merged_path):
+            return index
+    except (OSError, ValueError, struct.error):
+        pass
+
+    index = build_index(merged_path)
+    try:
+        write_index(index, path)
+    except OSError:
+        pass  # a missing sidecar only costs another scan
+    return index
+
+
+def parse_parallel(merged_path: str, workers: int, index: SessionIndex = None):
+    """
+    Parses the merged transaction file with read.iter_transactions split on
+    session boundaries across worker processes. Returns the same records
+    in the same order and prints the same malformed line reports as one
+    read.iter_transactions pass.
+    """
+    if index is None:
+        index = load_index(merged_path)
+    runs = index.split(workers)
+    if workers <= 1 or len(runs) <= 1:
+        return list(read.iter_transactions(merged_path))
+
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for run_records, output, error in pool.map(_parse_run, [merged_path] * len(runs), runs):
+            sys.stdout.write(output)
+            if error is not None:
+                raise error  # where the serial parse stops, after the same output
+            records.extend(run_records)
+    return records
+
+
+# Pool worker: parses one run of sessions, returning its records, printed
+# output and the exception that ended the parse, if any
+def _parse_run(merged_path, run):
+    start, stop, first_line = run
+    captured = io.StringIO()
+    try:
+        with redirect_stdout(captured):
+            records = list(read.iter_transactions(merged_path, start=start, stop=stop, first_line=first_line))
+    except Exception as error:
+        return None, captured.getvalue(), error
+    return records, captured.getvalue(), None
+
+
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a merged transaction file's session index")
+    parser.add_argument("merged_transaction_file")
+    parser.add_argument("--session", type=int, metavar="N", help="print the transactions of session N (from 1)")
+    args = parser.parse_args()
+
+    index = load_index(args.merged_transaction_file)
+    if args.session is None:
+        print(f"{len(index)} sessions, {sum(index.counts)} transactions: {index_path(args.merged_transaction_file)}")
+        return
+    if not 1 <= args.session <= len(index):
+        sys.exit(f"No session {args.session} (the file has {len(index)})")
+    for record in index.read_session(args.merged_transaction_file, args.session - 1):
+        print(" ".join(str(field) for field in record))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Streaming merge of frontend session transaction files.
+
+SessionMerger appends session transaction files, one at a time and in the
+order given, to a merged transaction file through one large write buffer,
+so any number of sessions can be merged with at most two files open. Each
+session file is read in chunks of whole lines and checked as it is copied:
+
+- every record is 41 characters (a wrong length is reported, the line
+  copied as is);
+- the file ends with its one end-of-session ("00") record (an earlier one
+  is reported and copied as is; a missing one is reported and appended,
+  so the session doesn't run into the next one);
+- a last line without a line ending gets one.
+
+Problems are printed like the backend reader's errors. The session index
+(session_index.py) is collected in the same pass and written to the
+merged file's sidecar on close, so parsers don't have to rescan the file.
+
+Usage: python3 session_merge.py <merged_file> <session_file_or_dir> [...]
+"""
+
+import argparse
+import locale
+import os
+import sys
+from array import array
+import session_index
+
+RECORD_LENGTH = 41
+END_OF_SESSION = b"00" + b" " * 22 + b"00000 00000.00 00\n"
+MERGE_CHUNK_SIZE = 1 << 20
+
+_LINE = RECORD_LENGTH + 1
+
+
+class SessionMerger:
+    """
+    Merges session files into merged_file, which is truncated on open, and
+    writes its session index when closed. Use as a context manager or call
+    close().
+    """
+
+    def __init__(self, merged_file: str, chunk_size: int = MERGE_CHUNK_SIZE):
+        self.merged_file = merged_file
+        self.chunk_size = chunk_size
+        self.offsets = array("Q", [0])  # session start offsets, then the merged file size
+        self.counts = array("I")  # transactions per session
+        self.problems = 0  # problems reported so far
+        self._encoding = locale.getpreferredencoding(False)  # what the backend reader decodes with
+        self._size = 0
+        self._output = open(merged_file, "wb", buffering=MERGE_CHUNK_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._output.close()
+
+    # Appends one session file; returns the number of problems reported for it
+    def add(self, session_file: str) -> int:
+        problems = self.problems
+        line_num = 0  # lines of the session file copied so far
+        session_start = 0  # index of the current session's first line
+        last_end = None  # line number of an end record on the last line copied so far
+        rest = b""
+        with open(session_file, "rb") as source:
+            while True:
+                data = source.read(self.chunk_size)
+                if data:
+                    data = rest + data
+                    cut = data.rfind(b"\n") + 1
+                    chunk, rest = data[:cut], data[cut:]
+                    if not chunk:
+                        continue
+                elif rest:
+                    chunk, rest = rest + b"\n", b""  # the last line had no line ending
+                else:
+                    break
+
+                lines, ends, bad = self._check_chunk(chunk)
+                reports = [(line_num + index + 1, f"Invalid length ({length} chars, expected {RECORD_LENGTH})")
+                           for index, length in bad]
+                if last_end is not None:
+                    reports.append((last_end, "End-of-session record before the end of the session"))
+                    last_end = None
+                for index, end in ends:
+                    if index < lines - 1:
+                        reports.append((line_num + index + 1, "End-of-session record before the end of the session"))
+                    else:
+                        last_end = line_num + index + 1
+                    self.counts.append(line_num + index - session_start)
+                    self.offsets.append(self._size + end)
+                    session_start = line_num + index + 1
+                for report in sorted(reports):
+                    self._report(session_file, *report)
+
+                self._output.write(chunk)
+                self._size += len(chunk)
+                line_num += lines
+
+        if line_num == 0:
+            self._report(session_file, 1, "Empty session file")
+        elif last_end is None:
+            self._report(session_file, line_num, "No end-of-session record, one is appended")
+            self._output.write(END_OF_SESSION)
+            self._size += len(END_OF_SESSION)
+            self.counts.append(line_num - session_start)
+            self.offsets.append(self._size)
+        return self.problems - problems
+
+    # Closes the merged file and writes its session index sidecar (best-effort)
+    def close(self) -> session_index.SessionIndex:
+        self._output.close()
+        stat = os.stat(self.merged_file)
+        index = session_index.SessionIndex(self.offsets, self.counts, stat.st_size, stat.st_mtime_ns)
+        try:
+            session_index.write_index(index, session_index.index_path(self.merged_file))
+        except OSError:
+            pass  # parsers rebuild a missing index
+        return index
+
+    # Checks a chunk of whole lines. Returns its line count, the end records
+    # as (line index, offset after the line) and the records of the wrong
+    # length as (line index, length in characters).
+    def _check_chunk(self, chunk: bytes):
+        lines = len(chunk) // _LINE
+        if len(chunk) == lines * _LINE and chunk[RECORD_LENGTH::_LINE] == b"\n" * lines \
+                and chunk.count(b"\n") == lines:  # every record 41 bytes, "\n" endings
+            ends = [(0, _LINE)] if chunk.startswith(b"00") else []
+            newline = chunk.find(b"\n00")
+            while newline != -1:
+                index = newline // _LINE + 1
+                ends.append((index, (index + 1) * _LINE))
+                newline = chunk.find(b"\n00", newline + _LINE)
+            return lines, ends, []
+
+        ends, bad = [], []
+        position = 0
+        records = chunk.split(b"\n")
+        records.pop()  # the chunk ends with "\n"
+        for index, record in enumerate(records):
+            position += len(record) + 1
+            if record.startswith(b"00"):
+                ends.append((index, position))
+            if record.endswith(b"\r"):
+                record = record[:-1]
+            if len(record) != RECORD_LENGTH:
+                length = len(record.decode(self._encoding, "replace"))
+                if length != RECORD_LENGTH:
+                    bad.append((index, length))
+        return len(records), ends, bad
+
+    def _report(self, session_file, line_num, problem):
+        print(f"ERROR: Malformed session - {session_file} line {line_num}: {problem}")
+        self.problems += 1
+
+
+# Session files named on the command line: files as given, directories as
+# their *.txt files in name order
+def session_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".txt"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge session transaction files and index the sessions")
+    parser.add_argument("merged_file")
+    parser.add_argument("sessions", nargs="+", metavar="session_file_or_dir")
+    args = parser.parse_args()
+
+    with SessionMerger(args.merged_file) as merger:
+        for path in session_files(args.sessions):
+            merger.add(path)
+    print(f"{len(merger.counts)} sessions, {sum(merger.counts)} transactions merged into {args.merged_file}")
+    sys.exit(1 if merger.problems else 0)
+
+
+if __name__ == "__main__":
+    main()
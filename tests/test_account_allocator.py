@@ -0,0 +1,74 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the bitmap account number allocator in account_allocator.py
+# -------------------------------------------------------------------------------------------
+
+import pytest
+from account_allocator import AccountAllocator, EMPTY_NEXT, LOWEST_FREE, SLOTS
+from banking_system import BankingSystem
+
+
+def test_max_plus_one_walks_down_after_release():
+    allocator = AccountAllocator()
+    assert allocator.next_free() == EMPTY_NEXT
+    for number in (1000, 1001, 1005):
+        allocator.mark_used(number)
+    assert allocator.next_free() == 1006 and len(allocator) == 3
+
+    allocator.release(1005)
+    assert allocator.next_free() == 1002
+    assert allocator.allocate() == 1002 and 1002 in allocator
+
+    for number in (1000, 1001, 1002):
+        allocator.release(number)
+    assert allocator.highest is None and allocator.next_free() == EMPTY_NEXT
+
+
+def test_lowest_free_reuses_released_numbers():
+    allocator = AccountAllocator(LOWEST_FREE)
+    for number in (5, 1000, 1001, 1003):
+        allocator.mark_used(number)
+    assert allocator.allocate() == 1002
+    assert allocator.allocate() == 1004
+    allocator.release(1001)
+    assert allocator.next_free() == 1001
+
+
+def test_bounds():
+    allocator = AccountAllocator()
+    with pytest.raises(ValueError):
+        allocator.mark_used(SLOTS)
+    allocator.mark_used(SLOTS - 1)
+    assert SLOTS not in allocator and -1 not in allocator
+
+
+def test_max_plus_one_falls_back_to_lowest_free_after_99999():
+    allocator = AccountAllocator()
+    allocator.mark_all([1000, 1001, 1003, SLOTS - 1])
+    assert allocator.allocate() == 1002
+    assert allocator.allocate() == 1004
+
+    allocator.mark_all(range(1000, SLOTS))
+    assert allocator.next_free() is None
+    with pytest.raises(ValueError):
+        allocator.allocate()
+    allocator.release(5000)
+    assert allocator.next_free() == 5000
+
+
+@pytest.mark.parametrize("file_name", ["master.txt", "current.txt"])
+def test_from_file_matches_backend_numbering(tmp_path, file_name):
+    master = tmp_path / "master.txt"
+    master.write_text("01000 user_one             A 01000.00 0000 NP\n"
+                      "01007 user_two             A 00500.00 0000 SP\n"
+                      "01008 END_OF_FILE          A 00000.00 0000 NP\n")
+    (tmp_path / "current.txt").write_text("01000 user_one             A 01000.00 NP\n"
+                                          "01007 user_two             A 00500.00 SP\n"
+                                          "00000 END_OF_FILE          A 00000.00 NP")
+    transactions = tmp_path / "transactions.txt"
+    transactions.write_text("00                      00000 00000.00 00\n")
+
+    system = BankingSystem(str(master), str(transactions))
+    allocator = AccountAllocator.from_file(str(tmp_path / file_name))
+    assert len(allocator) == 2
+    assert str(allocator.next_free()).zfill(5) == system.accounts.next_account_number() == "01008"
+    assert AccountAllocator.from_file(str(tmp_path / "missing.txt")).next_free() == EMPTY_NEXT
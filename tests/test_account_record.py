@@ -0,0 +1,43 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the dict-style view of the compact AccountRecord in account_record.py
+# -------------------------------------------------------------------------------------------
+
+import pytest
+from account_record import AccountRecord
+
+
+@pytest.fixture
+def record():
+    return AccountRecord(1002, "disha_padia", "A", 250000, 3, "SP")
+
+
+def test_dict_view_matches_old_account_dict(record):
+    assert dict(record) == {
+        "account_number": "01002",
+        "name": "disha_padia",
+        "status": "A",
+        "balance": 2500.0,
+        "total_transactions": 3,
+        "plan": "SP",
+    }
+
+
+def test_balance_view_is_stored_in_cents(record):
+    record["balance"] -= 0.15
+    assert record.balance_cents == 249985
+    assert record["balance"] == 2499.85
+
+
+def test_from_mapping_round_trip(record):
+    assert AccountRecord.from_mapping(dict(record)) == record
+
+
+def test_unknown_key_and_delete_rejected(record):
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(TypeError):
+        del record["name"]
+
+
+def test_record_has_no_instance_dict(record):
+    assert not hasattr(record, "__dict__")
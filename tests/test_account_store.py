@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the name index and account number allocation in account_store.py
+# -------------------------------------------------------------------------------------------
+
+import pytest
+import print_error as error_logger
+from account_record import AccountRecord
+from account_store import AccountStore
+from account_manager import AccountManager
+
+
+def make_account(number, name):
+    return {"account_number": number, "name": name, "status": "A",
+            "balance": 100.0, "total_transactions": 0, "plan": "NP"}
+
+
+def test_empty_store_starts_at_10001():
+    store = AccountStore()
+    assert store.next_account_number() == "10001"
+    assert store.highest_account_number() is None
+
+
+def test_name_index_follows_create_and_delete():
+    store = AccountStore({"01000": make_account("01000", "alice")})
+    assert store.has_name("alice")
+
+    del store["01000"]
+    assert not store.has_name("alice")
+    assert "01000" not in store
+
+
+def test_highest_number_walks_down_after_delete():
+    store = AccountStore({
+        "01000": make_account("01000", "alice"),
+        "01001": make_account("01001", "bob"),
+        "01005": make_account("01005", "carol"),
+    })
+    assert store.next_account_number() == "01006"
+
+    del store["01005"]
+    assert store.next_account_number() == "01002"
+
+    del store["01001"]
+    del store["01000"]
+    assert store.next_account_number() == "10001"
+
+
+def test_replacing_account_updates_name_index():
+    store = AccountStore({"01000": make_account("01000", "alice")})
+    store["01000"] = make_account("01000", "alicia")
+    assert not store.has_name("alice")
+    assert store.has_name("alicia")
+
+
+def test_rejected_insert_leaves_the_store_unchanged():
+    store = AccountStore({"01000": make_account("01000", "alice")})
+    store.clear_changes()
+
+    with pytest.raises(ValueError):
+        store["100000"] = AccountRecord(100000, "bob", "A", 500, 0, "NP")
+    assert len(store) == 1 and "100000" not in store and not store.has_name("bob")
+    assert not store.structure_changed and not store.dirty
+    assert store.next_account_number() == "01001"
+
+
+def test_create_account_rejects_duplicate_name():
+    manager = AccountManager({"01000": make_account("01000", "alice")})
+
+    assert not manager.create_account({"name": "alice", "amount": 5.0, "misc": "NP"})
+    assert manager.create_account({"name": "bob", "amount": 5.0, "misc": "NP"})
+    assert manager.accounts["01001"]["name"] == "bob"
+    assert manager.accounts.has_name("bob")
+
+
+def test_create_after_99999_takes_the_lowest_free_number():
+    manager = AccountManager({"01000": make_account("01000", "alice"), "99999": make_account("99999", "zed")})
+
+    assert manager.create_account({"name": "bob", "amount": 500, "misc": "NP"})
+    assert manager.accounts["01001"]["name"] == "bob"
+    assert manager.accounts.next_account_number() == "01002"
+
+
+def test_create_with_no_numbers_left_is_rejected():
+    manager = AccountManager({})
+    for number in range(1000, 100000):
+        manager.accounts[f"{number:05d}"] = AccountRecord(number, f"user_{number}", "A", 0, 0, "NP")
+    previous = error_logger.sink
+    error_logger.configure(echo=False)
+    try:
+        assert not manager.apply_transaction({"code": "05", "name": "bob", "account_number": "00000",
+                                              "amount": 500, "misc": "NP"})
+        assert error_logger.sink.categories == {"No Account Numbers Left": 1}
+    finally:
+        error_logger.sink = previous
+    assert len(manager.accounts) == 99000 and not manager.accounts.has_name("bob")
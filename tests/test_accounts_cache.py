@@ -0,0 +1,42 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the frontend accounts cache in Frontend/models/accounts_cache.py
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Frontend"))
+
+from models.accounts_cache import AccountsCache
+
+
+def test_parses_accounts_and_reloads_on_change(tmp_path):
+    path = tmp_path / "current.txt"
+    path.write_text("01000 User_One             A 00100.00 NP\n"
+                    "01001 user_two             D 00250.00 SP\n"
+                    "00000 END_OF_FILE          A 00000.00 NP\n")
+    cache = AccountsCache(str(path))
+    assert cache.refresh()
+    assert cache.names == {"user_one", "user_two"}
+    assert cache.name_map == {"01000": "user_one", "01001": "user_two"}
+    assert cache.is_active("01000") and not cache.is_active("01001") and not cache.is_active("09999")
+
+    path.write_text("01002 user_three           A 00100.00 NP\n")
+    os.utime(path, ns=(0, 0))  # force a new mtime even within the timestamp granularity
+    assert cache.refresh()
+    assert cache.numbers == {"01002"}
+
+    path.unlink()
+    assert not cache.refresh()
+    assert cache.names == set() and cache.status_map == {}
+
+
+def test_plan_only_read_from_unterminated_last_line(tmp_path):
+    path = tmp_path / "current.txt"
+    path.write_text("01000 user_one             A 00100.00 SP\n"
+                    "01001 user_two             A 00250.00 SP")
+    cache = AccountsCache(str(path))
+    cache.refresh()
+    assert cache.plan("01000") == "NP"
+    assert cache.plan("01001") == "SP"
@@ -3,6 +3,7 @@
 # -------------------------------------------------------------------------------------------
 
 import pytest
+import print_error as error_logger
 from banking_system import BankingSystem
 
 @pytest.fixture
@@ -72,4 +73,38 @@ def test_apply_transactions_statement_coverage(setup_accounts_and_transactions):
     # No assertion needed — just making sure it didn't crash
 
     # Confirm transaction with invalid code led to SystemExit
-    # Already handled via try-except above
\ No newline at end of file
+    # Already handled via try-except above
+
+def test_apply_batch_counts_each_transaction_once(tmp_path):
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+    master.write_text(
+        "01000 user_one             A 01000.00 0000 NP\n"
+        "01001 user_two             A 00500.00 0000 SP\n"
+        "01002 END_OF_FILE          A 00000.00 0000 NP\n"
+    )
+    transactions.write_text(
+        "05 new_user             01000 00100.00 SP\n"        # Create, the number is ignored
+        "05 ghost_creator        99999 00100.00 SP\n"        # Create with an unused number
+        "05 user_two             01000 00100.00 SP\n"        # Duplicate name
+        "06 user_two             01001 00000.00 SP\n"        # Delete
+        "07 user_one             01000 00000.00 SP\n"        # Disable
+        "08 user_one             01000 00000.00 SP\n"        # Disabled, rejected
+        "04 ghost                99999 00100.00 NP\n"        # Missing account
+    )
+    previous = error_logger.sink
+    error_logger.configure(echo=False)
+    try:
+        system = BankingSystem(str(master), str(transactions))
+        system.apply_transactions()
+        errors = error_logger.sink.categories
+    finally:
+        error_logger.sink = previous
+
+    counts = system.transaction_counts
+    assert counts.applied == {"05": 2, "06": 1, "07": 1}
+    assert counts.rejected == {"05": 1, "08": 1, "04": 1}
+    assert sorted(system.accounts) == ["01000", "01002", "01003"]
+    assert system.accounts["01000"]["total_transactions"] == 1
+    # One message per rejected transaction, none from a second pass over 05-08
+    assert errors == {"Invalid Account": 1, "Disabled Account": 1}
@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------------------------
+# This code round-trips the binary columnar sidecar in columnar.py against the text formats
+# -------------------------------------------------------------------------------------------
+
+import pytest
+import columnar
+from banking_system import BankingSystem
+
+MASTER = (
+    "01000 andrew_hunter        D 00100.00 0000 NP\n"
+    "01001 darshil_patel        A 00250.00 0007 NP\n"
+    "01002 disha_padia          A 02500.00 0012 SP\n"
+    "01003 END_OF_FILE          A 00000.00 0000 NP\n"
+)
+
+TRANSACTIONS = (
+    "04 disha_padia          01002 00300.00 NP\n"
+    "05 john_wick            01000 00300.00 NP\n"
+    "07 darshil_patel        01001 00000.00 NP\n"
+    "00                      00000 00000.00 00\n"
+)
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "master.txt").write_text(MASTER)
+    (tmp_path / "transactions.txt").write_text(TRANSACTIONS)
+    bs = BankingSystem("master.txt", "transactions.txt", write_sidecars=True)
+    bs.apply_transactions()
+    bs.calculate_transaction_fee()
+    bs.update_master_file()
+    bs.update_current_file()
+    return bs
+
+
+@pytest.mark.parametrize("name", ["new_master_accounts", "new_current_accounts"])
+def test_written_sidecar_renders_same_text(system, tmp_path, name):
+    columnar.sidecar_to_text(f"{name}.bin", "rendered.txt")
+    assert (tmp_path / "rendered.txt").read_bytes() == (tmp_path / f"{name}.txt").read_bytes()
+
+
+@pytest.mark.parametrize("name", ["new_master_accounts", "new_current_accounts", "master"])
+def test_text_round_trip(system, tmp_path, name):
+    columnar.text_to_sidecar(f"{name}.txt", "converted.bin")
+    assert columnar.is_sidecar("converted.bin")
+    columnar.sidecar_to_text("converted.bin", "back.txt")
+    assert (tmp_path / "back.txt").read_bytes() == (tmp_path / f"{name}.txt").read_bytes()
+
+
+def test_master_sidecar_loads_like_text(system):
+    from_text = system.read_old_bank_accounts("new_master_accounts.txt")
+    from_sidecar = system.read_old_bank_accounts("new_master_accounts.bin")
+    assert {n: dict(a) for n, a in from_sidecar.items()} == {n: dict(a) for n, a in from_text.items()}
+
+
+def test_sidecar_columns(system):
+    kind, accounts, eof_number = columnar.read_sidecar("new_master_accounts.bin")
+    assert kind == "master"
+    assert eof_number == 1004
+    assert [a.number for a in accounts] == [1000, 1001, 1002, 1003]
+    assert accounts[3].name == "john_wick"
+
+
+def test_rejects_non_sidecar(system):
+    with pytest.raises(ValueError):
+        columnar.read_sidecar("new_master_accounts.txt")
+
+
+def test_full_width_name_loads_like_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "master.txt").write_text(MASTER.replace("darshil_patel       ", "d" * 20))
+    (tmp_path / "transactions.txt").write_text(TRANSACTIONS.replace("john_wick           ", "j" * 20))
+    bs = BankingSystem("master.txt", "transactions.txt", write_sidecars=True)
+    bs.apply_transactions()
+    bs.write_output_files()
+    columnar.text_to_sidecar("master.txt", "master.bin")
+
+    for text, sidecar in (("new_master_accounts.txt", "new_master_accounts.bin"), ("master.txt", "master.bin")):
+        from_text = bs.read_old_bank_accounts(text)
+        from_sidecar = bs.read_old_bank_accounts(sidecar)
+        assert {n: dict(a) for n, a in from_sidecar.items()} == {n: dict(a) for n, a in from_text.items()}
+        assert from_sidecar.has_name("d" * 19) and not from_sidecar.has_name("d" * 20)
+    assert bs.read_old_bank_accounts("new_master_accounts.bin").has_name("j" * 19)
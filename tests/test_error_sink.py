@@ -0,0 +1,79 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the batched error sink in print_error.py
+# -------------------------------------------------------------------------------------------
+
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import print_error as error_logger
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def sink():
+    previous = error_logger.sink
+    yield error_logger.configure
+    error_logger.sink = previous
+
+
+def test_counts_and_bulk_report(sink, tmp_path, capsys):
+    report = tmp_path / "errors.txt"
+    active = sink(report_path=str(report), echo=False, buffer_size=2)
+
+    error_logger.log_constraint_error("Insufficient Funds", "Account 01000 has 1.0", account="01000")
+    assert report.read_text() == ""  # still buffered
+    error_logger.log_constraint_error("Insufficient Funds", "Account 01001 has 2.0", account="01001")
+    error_logger.log_constraint_error("Cannot deposit into disabled account 01000.", "account_manager.py",
+                                      category="Disabled Account", account="01000")
+    assert report.read_text() == ("ERROR: Account 01000 has 1.0: Insufficient Funds\n"
+                                  "ERROR: Account 01001 has 2.0: Insufficient Funds\n")
+
+    assert active.categories == {"Insufficient Funds": 2, "Disabled Account": 1}
+    assert active.accounts == {"01000": 2, "01001": 1}
+
+    active.close()
+    assert report.read_text().splitlines()[2:] == [
+        "ERROR: account_manager.py: Cannot deposit into disabled account 01000.",
+        "Error summary: 3 errors (0 fatal)",
+        "  Insufficient Funds: 2",
+        "  Disabled Account: 1",
+        "  Accounts with the most errors: 01000 (2), 01001 (1)",
+    ]
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.splitlines() == report.read_text().splitlines()[3:]
+
+
+def test_echo_keeps_error_line_format(sink, capsys):
+    sink()
+    error_logger.log_constraint_error("Invalid Payee", "Account 01000 tried to pay XX.")
+    assert capsys.readouterr().out == "ERROR: Account 01000 tried to pay XX.: Invalid Payee\n"
+
+
+def test_fatal_raises_system_exit(sink, capsys):
+    active = sink()
+    with pytest.raises(error_logger.FatalError) as raised:
+        error_logger.log_constraint_error("Unknown transaction code 09", "banking_system.py", fatal=True)
+    assert isinstance(raised.value, SystemExit)
+    assert raised.value.code == 1
+    assert active.fatal == 1
+    assert capsys.readouterr().out == "ERROR: Fatal error - File banking_system.py - Unknown transaction code 09\n"
+
+
+def test_fatal_run_writes_report_and_no_output_files(tmp_path):
+    (tmp_path / "master.txt").write_text("01000 user_one             A 01000.00 0000 NP\n"
+                                         "01001 END_OF_FILE          A 00000.00 0000 NP\n")
+    (tmp_path / "transactions.txt").write_text("09 user_one             01000 00000.00 NP\n")
+
+    result = subprocess.run([sys.executable, str(ROOT / "main.py"), "master.txt", "transactions.txt",
+                             "--error-report", "errors.txt"],
+                            cwd=tmp_path, capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert result.stderr == "Error summary: 1 errors (1 fatal)\n  Unknown Transaction Code: 1\n"
+    assert "Error summary" not in result.stdout
+    assert (tmp_path / "errors.txt").read_text().startswith(
+        "ERROR: Fatal error - File banking_system.py - Unknown transaction code 09 in merged transaction file.\n")
+    assert not (tmp_path / "new_master_accounts.txt").exists()
@@ -0,0 +1,58 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the vectorized fee engine against the loop in calculate_transaction_fee
+# -------------------------------------------------------------------------------------------
+
+import random
+import pytest
+from account_record import AccountRecord
+from account_store import AccountStore
+from banking_system import BankingSystem
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def make_system(tmp_path):
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+    master.write_text("00000 END_OF_FILE          A 00000.00 0000 NP\n")
+    transactions.write_text("00 END_OF_SESSION       00000 00000.00 NP\n")
+
+    def build(vectorized):
+        return BankingSystem(str(master), str(transactions), vectorized_fees=vectorized)
+    return build
+
+
+def random_store(seed, plans=("SP", "NP")):
+    rng = random.Random(seed)
+    store = AccountStore()
+    for number in range(1000, 1500):
+        store[str(number).zfill(5)] = AccountRecord(
+            number, f"user_{number}", rng.choice("AD"), rng.randint(0, 300),
+            rng.randint(-1, 40), rng.choice(plans))
+    return store
+
+
+def run_fees(system, accounts, capsys):
+    system.accounts = accounts
+    capsys.readouterr()
+    try:
+        system.calculate_transaction_fee()
+    except SystemExit:
+        pass
+    return {n: acc.balance_cents for n, acc in accounts.items()}, capsys.readouterr().out
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vectorized_matches_loop(make_system, capsys, seed):
+    loop = run_fees(make_system(False), random_store(seed), capsys)
+    vectorized = run_fees(make_system(True), random_store(seed), capsys)
+    assert vectorized == loop
+    assert "Insufficient funds" in loop[1]
+
+
+def test_vectorized_matches_loop_on_invalid_plan(make_system, capsys):
+    loop = run_fees(make_system(False), random_store(4, plans=("SP", "NP", "SP", "XX")), capsys)
+    vectorized = run_fees(make_system(True), random_store(4, plans=("SP", "NP", "SP", "XX")), capsys)
+    assert vectorized == loop
+    assert "Invalid account plan type: XX" in loop[1]
@@ -0,0 +1,65 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the backend log levels and that disabled messages are never formatted
+# -------------------------------------------------------------------------------------------
+
+import pytest
+import log
+from banking_system import BankingSystem
+
+
+@pytest.fixture
+def level():
+    yield log.set_level
+    log.set_level(log.INFO)
+
+
+@pytest.fixture
+def system(tmp_path):
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+    master.write_text("01000 user_one             A 01000.00 0000 NP\n"
+                      "01001 END_OF_FILE          A 00000.00 0000 NP\n")
+    transactions.write_text("07 user_one             01000 00000.00 NP\n"
+                            "00                      00000 00000.00 00\n")
+    return str(master), str(transactions)
+
+
+class Counted:
+    formatted = 0
+
+    def __str__(self):
+        Counted.formatted += 1
+        return "counted"
+
+
+def test_disabled_level_is_not_formatted(level, capsys):
+    level(log.INFO)
+    log.debug("%s", Counted())
+    assert Counted.formatted == 0
+    assert capsys.readouterr().out == ""
+
+    level(log.DEBUG)
+    log.debug("%s", Counted())
+    assert Counted.formatted >= 1
+    assert capsys.readouterr().out == "counted\n"
+
+
+def test_default_hides_per_record_output(system, level, capsys):
+    bs = BankingSystem(*system)
+    bs.apply_transactions()
+    out = capsys.readouterr().out
+    assert "AccountRecord(" not in out
+    assert out == "✅ Account 01000 has been disabled.\n"
+
+
+def test_verbose_prints_each_account(system, level, capsys):
+    level(log.DEBUG)
+    BankingSystem(*system)
+    assert "AccountRecord({'account_number': '01000'" in capsys.readouterr().out
+
+
+def test_quiet_keeps_errors(level, capsys):
+    level(log.ERROR)
+    log.info("hidden")
+    log.error("ERROR: %s: %s", "context", "description")
+    assert capsys.readouterr().out == "ERROR: context: description\n"
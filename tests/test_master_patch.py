@@ -0,0 +1,74 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the incremental master update in master_patch.py against a full rewrite
+# -------------------------------------------------------------------------------------------
+
+import random
+import pytest
+from banking_system import BankingSystem
+
+
+def write_day(tmp_path, seed, codes=("01", "03", "04", "07", "08"), transactions=40, newline="\n",
+              long_name=False):
+    rng = random.Random(seed)
+    master = tmp_path / "master.txt"
+    merged = tmp_path / "transactions.txt"
+    lines = []
+    for number in range(1000, 1500):
+        name = "x" * 20 if long_name and number == 1250 else f"user_{number}"
+        lines.append(f"{number:05d} {name:<20} {rng.choice('AAAD')} {rng.randint(0, 50000):05d}.{rng.randint(0, 99):02d} "
+                     f"0000 {rng.choice(['SP', 'NP'])}{newline}")
+    lines.append(f"01500 END_OF_FILE          A 00000.00 0000 NP{newline}")
+    master.write_bytes("".join(lines).encode())
+
+    with open(merged, "w") as file:
+        for _ in range(transactions):
+            code = rng.choice(codes)
+            number = rng.randint(995, 1505)
+            misc = "EC" if code == "03" else rng.choice(["SP", "NP"])
+            file.write(f"{code} {'user_' + str(number):<20} {number:05d} {rng.randint(0, 900):05d}.00 {misc}\n")
+        file.write("00                      00000 00000.00 00\n")
+    return str(master), str(merged)
+
+
+def run(files, tmp_path, name, **options):
+    out = tmp_path / name
+    out.mkdir()
+    system = BankingSystem(*files, **options)
+    system.new_master_file = str(out / "new_master_accounts.txt")
+    system.new_current_file = str(out / "new_current_accounts.txt")
+    system.apply_transactions()
+    system.calculate_transaction_fee()
+    system.write_output_files()
+    return system, (out / "new_master_accounts.txt").read_bytes(), (out / "new_current_accounts.txt").read_bytes()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_patch_matches_full_rewrite(tmp_path, seed, workers):
+    files = write_day(tmp_path, seed)
+    _, master, current = run(files, tmp_path, "full")
+    patched, patched_master, patched_current = run(files, tmp_path, "patched", patch_master=True,
+                                                   workers=workers)
+
+    assert patched.master_patched_bytes is not None
+    assert 0 < patched.master_patched_bytes < len(master)
+    assert patched_master == master
+    assert patched_current == current
+
+
+@pytest.mark.parametrize("reason", ["create", "delete", "threshold", "crlf", "long_name"])
+def test_falls_back_to_full_rewrite(tmp_path, reason):
+    options = {
+        "create": dict(codes=("04", "05")),
+        "delete": dict(codes=("04", "06")),
+        "threshold": dict(transactions=400),
+        "crlf": dict(newline="\r\n"),
+        "long_name": dict(long_name=True),
+    }[reason]
+    files = write_day(tmp_path, 5, **options)
+    _, master, current = run(files, tmp_path, "full")
+    patched, patched_master, patched_current = run(files, tmp_path, "patched", patch_master=True)
+
+    assert patched.master_patched_bytes is None
+    assert patched_master == master
+    assert patched_current == current
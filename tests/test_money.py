@@ -0,0 +1,28 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the integer-cents helpers in money.py
+# -------------------------------------------------------------------------------------------
+
+import pytest
+import money
+
+
+@pytest.mark.parametrize("cents", [0, 1, 10, 99, 100, 9990, 42460, 9999999, 12345678, -5, -12345])
+def test_format_cents_matches_float_formatting(cents):
+    assert money.format_cents(cents) == f"{cents / 100:08.2f}"
+
+
+def test_parse_fixed_width_field():
+    assert money.parse_cents("00300.00") == 30000
+    assert money.parse_cents("99999.99") == 9999999
+
+
+def test_parse_free_form_amount():
+    assert money.parse_cents("300") == 30000
+    assert money.parse_cents("0.1") == 10
+    with pytest.raises(ValueError):
+        money.parse_cents("abc")
+
+
+def test_repeated_fees_do_not_drift():
+    # 0.05 * n in floats drifts; 5 * n cents does not
+    assert money.format_cents(10000 - 5 * 3) == "00099.85"
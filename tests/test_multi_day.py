@@ -0,0 +1,187 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the in-memory multi-day runner in multi_day.py against chained main.py runs
+# -------------------------------------------------------------------------------------------
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from account_record import AccountRecord
+from banking_system import BankingSystem
+import print_error as error_logger
+import write
+from multi_day import MultiDayRunner, carry_accounts
+
+ROOT = Path(__file__).resolve().parent.parent
+END_OF_SESSION = "00                      00000 00000.00 00\n"
+
+
+@pytest.fixture(autouse=True)
+def sink():
+    previous = error_logger.sink
+    yield
+    error_logger.sink = previous
+
+
+def transaction(code, name, number, amount, misc):
+    return f"{code} {name:<20} {number:05d} {amount:08.2f} {misc}\n"
+
+
+def random_day(rng, transactions=60):
+    lines = []
+    for _ in range(transactions):
+        code = rng.choice(["01", "03", "04", "04", "05", "06", "07", "08"])
+        number = rng.randint(995, 1105)
+        misc = "EC" if code == "03" else rng.choice(["SP", "NP"])
+        name = f"new_{rng.randint(0, 20)}" if code == "05" else f"user_{number}"
+        lines.append(transaction(code, name, number, rng.randint(0, 900), misc))
+        if rng.random() < 0.2:
+            lines.append(END_OF_SESSION)
+    return "".join(lines) + END_OF_SESSION
+
+
+def write_week(tmp_path, days):
+    rng = random.Random(7)
+    master = tmp_path / "old_master.txt"
+    master.write_text("".join(
+        f"{number:05d} {'user_' + str(number):<20} {'A' if number < 1010 else rng.choice('AAAD')} "
+        f"{rng.randint(0, 5000):05d}.00 {rng.randint(0, 20):04d} {rng.choice(['SP', 'NP'])}\n"
+        for number in range(1000, 1100))
+        + "01100 END_OF_FILE          A 00000.00 0000 NP\n")
+    merged_files = []
+    for day, text in enumerate(days, 1):
+        merged = tmp_path / f"merged_day{day}.txt"
+        merged.write_text(text if text is not None else random_day(rng))
+        merged_files.append(merged)
+    return master, merged_files
+
+
+# Sets every transaction count to 0, so a day charges fees on few accounts and
+# leaves few enough records changed for patch_master
+def zero_counts(master):
+    master.write_text("".join(line[:38] + "0000" + line[42:] for line in master.read_text().splitlines(True)))
+
+
+# weekly.sh's backend steps: main.py on the working master, then the new master copied over it
+def run_chain(tmp_path, master, merged_files, *flags):
+    work = tmp_path / "chain"
+    work.mkdir()
+    shutil.copyfile(master, work / "master_input.txt")
+    days = []
+    for merged in merged_files:
+        result = subprocess.run([sys.executable, str(ROOT / "main.py"), "master_input.txt", str(merged), *flags],
+                                cwd=work, capture_output=True, text=True)
+        files = None
+        if result.returncode == 0:
+            files = ((work / "new_master_accounts.txt").read_bytes(), (work / "new_current_accounts.txt").read_bytes())
+            shutil.copyfile(work / "new_master_accounts.txt", work / "master_input.txt")
+        days.append((result.returncode == 0, result.stdout, files))
+    return days
+
+
+def run_in_memory(tmp_path, master, merged_files, **options):
+    work = tmp_path / "memory"
+    work.mkdir()
+    runner = MultiDayRunner(str(master), **options)
+    days = []
+    for merged in merged_files:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            ok = runner.run_day(str(merged), str(work / "new_master_accounts.txt"),
+                                str(work / "new_current_accounts.txt"))
+        files = None
+        if ok:
+            files = ((work / "new_master_accounts.txt").read_bytes(), (work / "new_current_accounts.txt").read_bytes())
+            (work / "new_master_accounts.txt").unlink()
+            (work / "new_current_accounts.txt").unlink()
+        days.append((ok, output.getvalue(), files))
+    return days
+
+
+def test_week_matches_chained_main(tmp_path):
+    master, merged_files = write_week(tmp_path, [None] * 7)
+
+    assert run_in_memory(tmp_path, master, merged_files) == run_chain(tmp_path, master, merged_files)
+
+
+def test_patched_week_matches_chained_main(tmp_path):
+    days = [transaction("04", "user_1000", 1000, 1, "NP") + END_OF_SESSION,
+            transaction("01", "user_1001", 1001, 1, "NP") + END_OF_SESSION,
+            transaction("05", "newbie", 0, 3, "NP") + END_OF_SESSION,  # created: rewritten in full
+            transaction("01", "user_1001", 1001, 1, "NP") + transaction("99", "user_1001", 1001, 2, "NP")
+            + END_OF_SESSION,
+            transaction("04", "user_1002", 1002, 2, "NP") + END_OF_SESSION]
+    master, merged_files = write_week(tmp_path, days)
+    zero_counts(master)
+
+    assert run_in_memory(tmp_path, master, merged_files, patch_master=True) \
+        == run_chain(tmp_path, master, merged_files, "--patch-master")
+
+
+def test_master_changed_between_days_is_rewritten_not_patched(tmp_path):
+    master, merged_files = write_week(tmp_path, [transaction("04", "user_1000", 1000, 1, "NP") + END_OF_SESSION] * 2)
+    zero_counts(master)
+    runner = MultiDayRunner(str(master), patch_master=True)
+    new_master, new_current = tmp_path / "new_master.txt", tmp_path / "new_current.txt"
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert runner.run_day(str(merged_files[0]), str(new_master), str(new_current))
+        new_master.write_text(new_master.read_text().replace("user_1050", "edited_50"))  # same size
+        assert runner.run_day(str(merged_files[1]), str(new_master), str(new_current))
+
+    assert "user_1050" in new_master.read_text()
+    assert new_master.read_bytes().startswith(write.format_master_line(runner.accounts["01000"]).encode())
+
+
+def test_failed_days_and_reread_rules_match_chained_main(tmp_path):
+    days = [
+        # 10000th transaction (too long a master line), 20-character and END_OF_FILE names
+        transaction("04", "user_1000", 1000, 1, "NP") * 10000 + END_OF_SESSION
+        + transaction("05", "x" * 20, 0, 5, "SP") + transaction("05", "END_OF_FILE", 0, 1, "NP") + END_OF_SESSION,
+        transaction("04", "user_1000", 1000, 1, "NP") + transaction("04", "user_1001", 1001, 2, "NP") + END_OF_SESSION,
+        transaction("04", "user_1001", 1001, 2, "NP") + transaction("99", "user_1001", 1001, 2, "NP") + END_OF_SESSION,
+        transaction("04", "user_1002", 1002, 99999, "NP") + END_OF_SESSION,  # balance too large to write
+        transaction("05", "newbie", 0, 3, "NP") + transaction("04", "user_1003", 1003, 3, "NP") + END_OF_SESSION,
+    ]
+    master, merged_files = write_week(tmp_path, days)
+
+    chain = run_chain(tmp_path, master, merged_files)
+    assert [ok for ok, _, _ in chain] == [True, True, False, False, True]
+    assert "Invalid length (46 chars, expected 45)" in chain[1][1]
+    assert run_in_memory(tmp_path, master, merged_files) == chain
+
+
+def test_carry_accounts_matches_reading_back_the_master(tmp_path, capsys):
+    master, _ = write_week(tmp_path, [])
+    accounts = MultiDayRunner(str(master)).accounts
+    accounts["99999"] = AccountRecord(99999, "x" * 20, "A", 500, 0, "SP")
+    accounts["01050"] = AccountRecord(1050, "END_OF_FILE", "A", 0, 0, "NP")
+    accounts["00999"] = AccountRecord(999, "busy", "A", 500, 10000, "NP")
+    write.write_account_files(accounts.values(), str(tmp_path / "new_master.txt"), str(tmp_path / "new_current.txt"))
+    expected = BankingSystem(str(tmp_path / "new_master.txt"), os.devnull).accounts
+    expected_output = capsys.readouterr().out
+
+    carry_accounts(accounts)
+
+    assert capsys.readouterr().out == expected_output
+    assert list(accounts) == list(expected)
+    assert [dict(acc) for acc in accounts.values()] == [dict(acc) for acc in expected.values()]
+    assert accounts.has_name("xxxxxxxxxxxxxxxxxxx") and not accounts.has_name("x" * 20)
+    assert accounts.next_account_number() == expected.next_account_number()
+    assert not accounts.dirty and not accounts.structure_changed
+
+
+def test_copy_is_independent(tmp_path):
+    master, _ = write_week(tmp_path, [])
+    accounts = MultiDayRunner(str(master)).accounts
+    copied = accounts.copy()
+    copied["01000"].balance_cents += 100
+    del copied["01099"]
+
+    assert accounts["01000"].balance_cents + 100 == copied["01000"].balance_cents
+    assert "01099" in accounts and accounts.has_name("user_1099") and not copied.has_name("user_1099")
+    assert accounts.highest_account_number() == 1099 and copied.highest_account_number() == 1098
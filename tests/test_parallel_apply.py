@@ -0,0 +1,68 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the account-sharded parallel apply against the serial apply_transactions
+# -------------------------------------------------------------------------------------------
+
+import random
+import pytest
+from banking_system import BankingSystem
+
+
+def random_workload(tmp_path, seed):
+    rng = random.Random(seed)
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+
+    with open(master, "w") as file:
+        for number in range(1000, 1400):
+            file.write(f"{number:05d} {('user_' + str(number)).ljust(20)} {rng.choice('AAAD')} "
+                       f"{rng.randint(0, 99999):05d}.{rng.randint(0, 99):02d} {rng.randint(0, 20):04d} "
+                       f"{rng.choice(['SP', 'NP'])}\n")
+        file.write("01400 END_OF_FILE          A 00000.00 0000 NP\n")
+
+    with open(transactions, "w") as file:
+        for i in range(3000):
+            code = rng.choice(["01", "03", "04", "04", "05", "06", "07", "08"])
+            number = rng.randint(990, 1450)  # some accounts do not exist
+            name = f"new_{rng.randint(0, 300)}" if code == "05" else f"user_{number}"
+            misc = rng.choice(["EC", "CQ", "XX"]) if code == "03" else rng.choice(["SP", "NP"])
+            file.write(f"{code} {name.ljust(20)} {number:05d} {rng.randint(0, 2000):05d}.00 {misc}\n")
+            if i % 10 == 9:
+                file.write("00                      00000 00000.00 00\n")
+    return str(master), str(transactions)
+
+
+def final_state(system):
+    return [(number, acc.name, acc.status, acc.balance_cents, acc.total_transactions, acc.plan)
+            for number, acc in system.accounts.items()]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_parallel_matches_serial(tmp_path, seed, workers):
+    master, transactions = random_workload(tmp_path, seed)
+
+    serial = BankingSystem(master, transactions)
+    serial.apply_transactions()
+
+    parallel = BankingSystem(master, transactions, workers=workers)
+    parallel.apply_transactions()
+
+    assert final_state(parallel) == final_state(serial)
+    assert parallel.transaction_counts == serial.transaction_counts
+
+
+def test_unknown_code_is_fatal_after_prefix(tmp_path):
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+    master.write_text("01000 user_one             A 01000.00 0000 NP\n"
+                      "01001 user_two             A 00500.00 0000 SP\n"
+                      "01002 END_OF_FILE          A 00000.00 0000 NP\n")
+    transactions.write_text("04 user_two             01001 00100.00 NP\n"
+                            "09 user_one             01000 00000.00 NP\n"
+                            "04 user_one             01000 00100.00 NP\n")
+
+    system = BankingSystem(str(master), str(transactions), workers=2)
+    with pytest.raises(SystemExit):
+        system.apply_transactions()
+    assert system.accounts["01001"]["balance"] == 600.00
+    assert system.accounts["01000"]["balance"] == 1000.00
@@ -0,0 +1,121 @@
+# -------------------------------------------------------------------------------------------
+# This code tests hits, misses and eviction of the parsed-input cache in parse_cache.py
+# -------------------------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+from parse_cache import ParseCache
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("line one\nline two\n")
+    return path
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, file_path):
+        self.calls += 1
+        print("ERROR: parsed", os.path.basename(file_path))
+        return open(file_path).read().splitlines()
+
+
+def test_hit_skips_parser_and_replays_output(cache, input_file, capsys):
+    parser = CountingParser()
+    first = cache.load(str(input_file), "lines", parser)
+    second = cache.load(str(input_file), "lines", parser)
+
+    assert first == second == ["line one", "line two"]
+    assert parser.calls == 1
+    assert capsys.readouterr().out == "ERROR: parsed input.txt\n" * 2
+
+
+def test_failing_parser_output_is_kept(cache, input_file, capsys):
+    def parser(file_path):
+        print("ERROR: Malformed transaction - Line 1: Invalid length")
+        raise ValueError("could not convert string to float: ''")
+
+    with pytest.raises(ValueError):
+        cache.load(str(input_file), "lines", parser)
+    assert capsys.readouterr().out == "ERROR: Malformed transaction - Line 1: Invalid length\n"
+    assert not os.path.exists(cache.directory) or os.listdir(cache.directory) == []
+
+
+def test_changed_content_misses(cache, input_file):
+    parser = CountingParser()
+    cache.load(str(input_file), "lines", parser)
+    input_file.write_text("line three\n")
+
+    assert cache.load(str(input_file), "lines", parser) == ["line three"]
+    assert parser.calls == 2
+
+
+def test_disabled_cache_always_parses(tmp_path, input_file):
+    cache = ParseCache(str(tmp_path / "cache"), enabled=False)
+    parser = CountingParser()
+    cache.load(str(input_file), "lines", parser)
+    cache.load(str(input_file), "lines", parser)
+
+    assert parser.calls == 2
+    assert not os.path.exists(cache.directory)
+
+
+def test_evicts_old_entries(cache, input_file):
+    cache.load(str(input_file), "lines", CountingParser())
+    entry = os.path.join(cache.directory, os.listdir(cache.directory)[0])
+    old = time.time() - cache.max_age - 10
+    os.utime(entry, (old, old))
+
+    cache.evict()
+    assert os.listdir(cache.directory) == []
+
+
+def test_evicts_least_recently_used_over_size(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"input{i}.txt"
+        path.write_text(f"content {i}\n" * 50)
+        cache.load(str(path), "lines", CountingParser())
+        paths.append(path)
+
+    entries = sorted(os.listdir(cache.directory))
+    sizes = [os.path.getsize(os.path.join(cache.directory, e)) for e in entries]
+    cache.max_bytes = sum(sizes) - 1
+    for age, entry in enumerate(entries):
+        stamp = time.time() - 100 + age
+        os.utime(os.path.join(cache.directory, entry), (stamp, stamp))
+
+    cache.evict()
+    assert sorted(os.listdir(cache.directory)) == entries[1:]
+
+
+@pytest.mark.parametrize("flags", [[], ["--cache"]])
+def test_main_reads_inputs_once_and_caches_only_when_asked(tmp_path, flags):
+    (tmp_path / "master.txt").write_text("01000 user_one             A 01000.00 0000 NP\n"
+                                         "bad line\n"
+                                         "01001 END_OF_FILE          A 00000.00 0000 NP\n")
+    (tmp_path / "transactions.txt").write_text("04 user_one             01000 00001.00 NP\n")
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "xdg"))
+
+    result = subprocess.run([sys.executable, str(ROOT / "main.py"), "master.txt", "transactions.txt", *flags],
+                            cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert result.stdout.count("Line 2: Invalid length") == 1
+    assert (tmp_path / "xdg" / "sqa_banking").exists() == bool(flags)
@@ -0,0 +1,70 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the per-stage profiling hooks in profiler.py and BankingSystem
+# -------------------------------------------------------------------------------------------
+
+import json
+import pstats
+import pytest
+from banking_system import BankingSystem
+from profiler import NULL_PROFILER, StageProfiler
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "master.txt").write_text("01000 user_one             A 01000.00 0000 NP\n"
+                                         "01001 END_OF_FILE          A 00000.00 0000 NP\n")
+    (tmp_path / "transactions.txt").write_text("04 user_one             01000 00100.00 NP\n"
+                                               "00                      00000 00000.00 00\n")
+    return "master.txt", "transactions.txt"
+
+
+def run_pipeline(system):
+    system.read_input_files()
+    system.apply_transactions()
+    system.calculate_transaction_fee()
+    system.write_output_files()
+
+
+def test_default_profiler_is_null(files):
+    system = BankingSystem(*files)
+    assert system.profiler is NULL_PROFILER
+    run_pipeline(system)
+
+
+def test_records_each_stage(files, tmp_path):
+    profiler = StageProfiler(cprofile_stages=["apply_transactions"], pstats_dir=str(tmp_path))
+    try:
+        run_pipeline(BankingSystem(*files, profiler=profiler))
+    finally:
+        profiler.close()
+
+    assert [entry["stage"] for entry in profiler.stages] == [
+        "read_input_files", "read_input_files", "apply_transactions",
+        "calculate_transaction_fee", "write_output_files"]
+    for entry in profiler.stages:
+        assert entry["wall_seconds"] >= 0 and entry["cpu_seconds"] >= 0
+        assert entry["peak_bytes"] >= entry["current_bytes"] >= 0
+
+    stats = pstats.Stats(profiler.last("apply_transactions")["pstats"])
+    assert any(func[2] == "apply_transaction" for func in stats.stats)
+    assert "pstats" not in profiler.last("calculate_transaction_fee")
+
+
+def test_json_report(files, tmp_path):
+    profiler = StageProfiler(memory=False)
+    run_pipeline(BankingSystem(*files, profiler=profiler))
+    profiler.write_json(str(tmp_path / "profile.json"))
+
+    report = json.loads((tmp_path / "profile.json").read_text())
+    assert len(report["stages"]) == 5
+    assert "peak_bytes" not in report and "peak_bytes" not in report["stages"][0]
+    assert report["total_wall_seconds"] == pytest.approx(sum(s["wall_seconds"] for s in report["stages"]))
+
+
+def test_stage_recorded_when_it_raises():
+    profiler = StageProfiler(memory=False)
+    with pytest.raises(SystemExit):
+        with profiler.stage("apply_transactions"):
+            raise SystemExit(1)
+    assert profiler.last("apply_transactions")["wall_seconds"] >= 0
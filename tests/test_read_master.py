@@ -0,0 +1,87 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the mmap master file loader against the per-line reader in read.py
+# -------------------------------------------------------------------------------------------
+
+import random
+import pytest
+import read
+
+VALID = [
+    "01000 andrew_hunter        D 00100.00 0000 NP",
+    "01001 darshil_patel        A 00250.00 0012 NP",
+    "01002 abcdefghijklmnopqrst A 02500.00 0003 SP",
+    "01003 END_OF_FILE          A 00000.00 0000 NP",
+]
+
+BROKEN = [
+    "01004 short_line A 00100.00 0000 NP",
+    "0100X bad_number           A 00100.00 0000 NP",
+    "01005 bad_status           X 00100.00 0000 NP",
+    "01006 negative             A -0100.00 0000 NP",
+    "01007 bad_balance          A 001000.0 0000 NP",
+    "01008 bad_count            A 00100.00 00x0 NP",
+    "01009 bad_plan             A 00100.00 0000 XP",
+    "01010 odd|separators       A|00100.00|0000|NP",
+    "01011 tab\tname            A 00100.00 0000 NP",
+    "01012 café_owner           A 00100.00 0000 NP",
+]
+
+
+@pytest.fixture(autouse=True, params=["numpy", "regex"])
+def decoder(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(read, "np", None)
+    return request.param
+
+
+def load_both(path, capsys):
+    expected = read.read_old_bank_accounts(path)
+    expected_out = capsys.readouterr().out
+    actual = read.read_old_bank_accounts_mmap(path)
+    actual_out = capsys.readouterr().out
+    return (expected, expected_out), (actual, actual_out)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("trailing", [True, False])
+def test_matches_line_reader(tmp_path, capsys, newline, trailing):
+    path = tmp_path / "master.txt"
+    text = newline.join(VALID + BROKEN + VALID) + (newline if trailing else "")
+    path.write_bytes(text.encode())
+
+    expected, actual = load_both(str(path), capsys)
+    assert actual == expected
+    assert "Line 5:" in expected[1]
+
+
+def test_layout_failure_falls_back(tmp_path, capsys):
+    path = tmp_path / "master.txt"
+    path.write_bytes(("\n".join(VALID) + "\n\n" + VALID[0] + "\r\n").encode())
+
+    expected, actual = load_both(str(path), capsys)
+    assert actual == expected
+    assert "Invalid length (0 chars" in expected[1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_corruption(tmp_path, capsys, seed):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(200):
+        line = list(rng.choice(VALID))
+        if rng.random() < 0.3:
+            line[rng.randrange(45)] = rng.choice("0A -.SPX\t")
+        lines.append("".join(line))
+    path = tmp_path / "master.txt"
+    path.write_text("\n".join(lines) + "\n")
+
+    expected, actual = load_both(str(path), capsys)
+    assert actual == expected
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "master.txt"
+    path.write_text("")
+    assert read.read_old_bank_accounts_mmap(str(path)) == []
@@ -0,0 +1,139 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the merged transaction file readers in banking_system.py and read.py
+# -------------------------------------------------------------------------------------------
+
+import random
+import types
+import pytest
+from banking_system import BankingSystem
+import money
+import read
+from transaction_record import TransactionRecord
+
+MASTER = (
+    "01000 user_one             A 01000.00 0000 NP\n"
+    "01001 user_two             A 00500.00 0000 SP\n"
+    "01002 END_OF_FILE          A 00000.00 0000 NP\n"
+)
+
+TRANSACTIONS = (
+    "04 user_one             01000 00100.00 NP\n"
+    "01 user_two             01001 00050.25 SP\n"
+    "00                      00000 00000.00 00\n"
+    "05 new_user             01000 00020.00 NP\n"
+    "07 user_two             01001 00000.00 SP\n"
+    "00                      00000 00000.00 00\n"
+)
+
+
+@pytest.fixture
+def files(tmp_path):
+    master = tmp_path / "master.txt"
+    transactions = tmp_path / "transactions.txt"
+    master.write_text(MASTER)
+    transactions.write_text(TRANSACTIONS)
+    return str(master), str(transactions)
+
+
+def test_read_transactions_skips_session_ends(files):
+    system = BankingSystem(*files)
+    assert [t["code"] for t in system.transactions] == ["04", "01", "05", "07"]
+    assert system.transactions[1]["amount"] == 5025  # cents
+
+
+def test_streaming_mode_uses_generator(files):
+    system = BankingSystem(*files, streaming=True)
+    assert isinstance(system.transactions, types.GeneratorType)
+
+
+def test_streaming_matches_eager(files):
+    eager = BankingSystem(*files)
+    eager.apply_transactions()
+
+    streaming = BankingSystem(*files, streaming=True)
+    streaming.apply_transactions()
+
+    assert {n: dict(acc) for n, acc in streaming.accounts.items()} == \
+        {n: dict(acc) for n, acc in eager.accounts.items()}
+    assert streaming.accounts["01002"]["name"] == "new_user"
+
+
+def test_records_are_compact_and_read_like_dicts(files):
+    system = BankingSystem(*files)
+    record = system.transactions[0]
+    assert isinstance(record, TransactionRecord)
+    assert record.code == record["code"] == "04"
+    assert record._asdict() == {"code": "04", "name": "user_one", "account_number": "01000", "amount": 10000,
+                                "misc": "NP"}
+    with pytest.raises(KeyError):
+        record["balance"]
+
+
+# The line reader read.iter_transactions replaced
+def read_lines(path):
+    with open(path, "r") as file:
+        for line in file:
+            if line.startswith("00"):
+                continue
+            yield {"code": line[:2].strip(), "name": line[3:23].strip(), "account_number": line[24:29].strip(),
+                   "amount": money.parse_cents(line[30:38].strip()), "misc": line[39:].strip()}
+
+
+MALFORMED = [
+    "04 user_one             01000 00100.00 NP  ",
+    "04 user_one             01000 00100.00",
+    "04 user_one             01x00 00100.00 NP",
+    "04 user_one             01000 0100.50  NP",
+    "4  user_one             01000 00100.00 NP",
+    "04 user_one             01000|00100.00 NP",
+    "00 user_one             01000 00100.00 NP trailing",
+]
+
+
+@pytest.mark.parametrize("bulk", ["numpy", "strings"])
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("chunk_size", [read.TRANSACTION_CHUNK_SIZE, 41, 100, 7])
+def test_matches_line_reader_and_flags_malformed_lines(tmp_path, capsys, monkeypatch, bulk, newline, chunk_size):
+    if bulk == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(read, "np", None)
+    rng = random.Random(3)
+    lines = TRANSACTIONS.splitlines() * 20
+    malformed_lines = sorted(rng.sample(range(len(lines)), len(MALFORMED)))
+    for line_num, line in zip(malformed_lines, MALFORMED):
+        lines[line_num] = line
+    lines.append("05 café                 01000 00020.00 NP")
+    path = tmp_path / "transactions.txt"
+    path.write_bytes((newline.join(lines) + newline).encode())
+
+    records = list(read.iter_transactions(str(path), chunk_size))
+
+    assert [record._asdict() for record in records] == list(read_lines(str(path)))
+    reported = [int(line.split()[5].rstrip(":")) for line in capsys.readouterr().out.splitlines()]
+    assert reported == [line_num + 1 for line_num in malformed_lines]
+
+
+@pytest.mark.parametrize("bulk", ["numpy", "strings"])
+@pytest.mark.parametrize("short_line", ["", "04 user_one", "04 user_one             01000"])
+def test_blank_or_short_line_is_reported_and_skipped(tmp_path, capsys, monkeypatch, bulk, short_line):
+    if bulk == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(read, "np", None)
+    lines = TRANSACTIONS.splitlines()
+    path = tmp_path / "transactions.txt"
+    path.write_text("\n".join(lines[:1] + [short_line] + lines[1:]) + "\n")
+
+    records = list(read.iter_transactions(str(path)))
+
+    assert [record.code for record in records] == ["04", "01", "05", "07"]
+    assert capsys.readouterr().out == (f"ERROR: Malformed transaction - Line 2: Invalid length "
+                                       f"({len(short_line)} chars, expected 41); line skipped\n")
+
+
+def test_last_line_without_line_ending(tmp_path, capsys):
+    path = tmp_path / "transactions.txt"
+    path.write_text(TRANSACTIONS.rstrip("\n").replace("07 user_two", "01 user_two"))
+    assert [record.code for record in read.iter_transactions(str(path))] == ["04", "01", "05", "01"]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the merged transaction file session index in session_index.py
+# -------------------------------------------------------------------------------------------
+
+import os
+import random
+import pytest
+import read
+import session_index
+
+END_OF_SESSION = "00                      00000 00000.00 00\n"
+
+
+def transaction(code, name, number, amount, misc):
+    return f"{code} {name:<20} {number:05d} {amount:08.2f} {misc}\n"
+
+
+def random_sessions(rng, sessions=40):
+    text = []
+    for _ in range(sessions):
+        for _ in range(rng.randint(0, 12)):
+            number = rng.randint(1000, 1100)
+            text.append(transaction(rng.choice(["01", "04", "05", "06"]), f"user_{number}", number,
+                                    rng.randint(0, 900), rng.choice(["SP", "NP"])))
+        if rng.random() < 0.1:
+            text.append(transaction("04", "user_1000", 1000, 1, "NPX"))  # malformed: 42 characters
+        text.append(END_OF_SESSION)
+    return "".join(text)
+
+
+@pytest.fixture
+def merged(tmp_path):
+    path = tmp_path / "merged_transactions.txt"
+    path.write_text(random_sessions(random.Random(3)))
+    return path
+
+
+def full_parse(path, capsys):
+    records = list(read.iter_transactions(str(path)))
+    return records, capsys.readouterr().out
+
+
+def test_index_round_trips_through_the_sidecar(merged):
+    built = session_index.load_index(str(merged))
+    sidecar = session_index.index_path(str(merged))
+
+    assert sidecar.endswith("merged_transactions.idx") and os.path.exists(sidecar)
+    loaded = session_index.read_index(sidecar)
+    assert list(loaded.offsets) == list(built.offsets) and list(loaded.counts) == list(built.counts)
+    assert (loaded.size, loaded.mtime_ns) == (built.size, built.mtime_ns)
+    assert len(loaded) == 40 and loaded.offsets[-1] == merged.stat().st_size
+
+
+def test_stale_or_corrupt_sidecar_is_rebuilt(merged):
+    session_index.load_index(str(merged))
+    with open(merged, "a") as file:
+        file.write(transaction("04", "user_1000", 1000, 1, "NP") + END_OF_SESSION)
+
+    assert len(session_index.load_index(str(merged))) == 41
+    with open(session_index.index_path(str(merged)), "wb") as file:
+        file.write(b"not an index")
+    assert len(session_index.load_index(str(merged))) == 41
+
+
+def test_read_session_matches_the_full_parse(merged, capsys):
+    records, _ = full_parse(merged, capsys)
+    index = session_index.load_index(str(merged))
+
+    sessions = [index.read_session(str(merged), n) for n in range(len(index))]
+    assert [len(session) for session in sessions] == list(index.counts)
+    assert [record for session in sessions for record in session] == records
+
+
+def test_read_session_reports_file_line_numbers(tmp_path, capsys):
+    path = tmp_path / "merged.txt"
+    path.write_text(transaction("04", "a", 1000, 1, "NP") + END_OF_SESSION + transaction("04", "b", 1001, 2, "NP")
+                    + transaction("04", "bad", 1002, 1, "NPX") + END_OF_SESSION)
+    index = session_index.load_index(str(path))
+    capsys.readouterr()
+
+    assert [record.name for record in index.read_session(str(path), 1)] == ["b", "bad"]
+    assert "Line 4:" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_unterminated_last_session(tmp_path, capsys, newline):
+    path = tmp_path / "merged.txt"
+    text = transaction("04", "a", 1000, 1, "NP") + END_OF_SESSION + transaction("04", "b", 1001, 2, "NP") * 2
+    path.write_bytes(text.rstrip("\n").replace("\n", newline).encode())
+    records, _ = full_parse(path, capsys)
+    index = session_index.build_index(str(path))
+
+    assert list(index.counts) == [1, 2]
+    assert index.read_session(str(path), 1) == records[1:]
+
+
+def test_empty_file_has_no_sessions(tmp_path):
+    path = tmp_path / "merged.txt"
+    path.write_text("")
+
+    index = session_index.load_index(str(path))
+    assert len(index) == 0 and list(index.offsets) == [0]
+    assert session_index.parse_parallel(str(path), 3, index) == []
+
+
+@pytest.mark.parametrize("workers", [2, 3, 7])
+def test_parse_parallel_matches_the_serial_parse(merged, capsys, workers):
+    records, output = full_parse(merged, capsys)
+    assert "ERROR: Malformed transaction" in output
+
+    assert session_index.parse_parallel(str(merged), workers) == records
+    assert capsys.readouterr().out == output
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parse_parallel_skips_blank_and_short_lines_like_the_serial_parse(tmp_path, capsys, workers):
+    path = tmp_path / "merged.txt"
+    sessions = [transaction("04", "a", 1000, 1, "NP") + END_OF_SESSION] * 3
+    sessions[1] = transaction("04", "b", 1001, 2, "NP") + "\n04 x\n" + END_OF_SESSION
+    path.write_text("".join(sessions))
+    records, output = full_parse(path, capsys)
+
+    assert [record.name for record in records] == ["a", "b", "a"]
+    assert "Line 4: Invalid length (0 chars, expected 41); line skipped" in output
+    assert session_index.parse_parallel(str(path), workers) == records
+    assert capsys.readouterr().out == output
+
+
+def test_parse_parallel_failure_keeps_the_serial_output(tmp_path, capsys):
+    path = tmp_path / "merged.txt"
+    sessions = [transaction("04", "a", 1000, 1, "NP") + END_OF_SESSION] * 3
+    filler = transaction("04", "a", 1000, 1, "NP") * (read.TRANSACTION_CHUNK_SIZE // 42 + 1)
+    sessions[1] = transaction("04", "bad", 1000, 1, "NPX") + filler + "04 \xff\n" + END_OF_SESSION  # not decodable
+    path.write_bytes("".join(sessions).encode("latin-1"))
+    with pytest.raises(ValueError):
+        list(read.iter_transactions(str(path)))
+    serial_output = capsys.readouterr().out
+
+    with pytest.raises(ValueError):
+        session_index.parse_parallel(str(path), 3)
+    assert capsys.readouterr().out == serial_output
+    assert "Line 3:" in serial_output
+
+
+def test_split_covers_every_session_in_order(merged):
+    index = session_index.load_index(str(merged))
+    for parts in (1, 2, 5, 40, 100):
+        runs = index.split(parts)
+        assert 1 <= len(runs) <= parts
+        assert runs[0][0] == 0 and runs[-1][1] == index.offsets[-1]
+        assert all(a[1] == b[0] for a, b in zip(runs, runs[1:]))
+        assert all(start in index.offsets for start, _, _ in runs)
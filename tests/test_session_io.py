@@ -0,0 +1,78 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the in-process session runner (Frontend/services/session_io.py) against
+# one bank-atm.py process per session
+# -------------------------------------------------------------------------------------------
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+FRONTEND = Path(__file__).resolve().parent.parent / "Frontend"
+sys.path.insert(0, str(FRONTEND))
+
+from models.transaction import Transaction
+from services.session_io import run_script, run_session_dir, run_sessions
+import session_index
+
+SCRIPTS = {
+    "admin": "admin\ndeposit\nandrew_hunter\n01000\n20\ncreate\nnew_user\n100\ncreate\nother_user\n50\nlogout\n",
+    "standard": "standard\ndisha_padia\nwithdrawal\n01002\n200\nwithdrawal\n01002\n400\nlogout\n",
+    "bad_login": "standard\nnobody\n",
+    "eof": "admin\ndeposit\ndisha_padia\n01002\n",
+}
+
+
+@pytest.mark.parametrize("name", SCRIPTS)
+def test_matches_per_process_run(tmp_path, name):
+    accounts = str(FRONTEND / "Current_Bank_Accounts.txt")
+    expected = subprocess.run([sys.executable, "bank-atm.py", accounts, str(tmp_path / "process.txt")],
+                              input=SCRIPTS[name], cwd=FRONTEND, capture_output=True, text=True)
+
+    output = io.StringIO()
+    # A previous session's state must not leak into this one
+    Transaction.is_logged_in = True
+    status = run_script(SCRIPTS[name], accounts, str(tmp_path / "batch.txt"), output)
+
+    assert status == expected.returncode
+    assert output.getvalue() == expected.stdout
+    process_file, batch_file = tmp_path / "process.txt", tmp_path / "batch.txt"
+    assert batch_file.exists() == process_file.exists()
+    if process_file.exists():
+        assert batch_file.read_bytes() == process_file.read_bytes()
+    assert not Transaction.is_logged_in
+
+
+def test_pool_matches_in_process_order(tmp_path):
+    accounts = str(FRONTEND / "Current_Bank_Accounts.txt")
+    names = sorted(SCRIPTS)
+    scripts = [SCRIPTS[name] for name in names]
+    results = {}
+    for workers in (1, 2):
+        out = tmp_path / f"workers_{workers}"
+        out.mkdir()
+        files = [str(out / f"{name}.txt") for name in names]
+        outcome = [(status, output) for status, output, _ in run_sessions(scripts, accounts, files, workers)]
+        written = [(out / f"{name}.txt").read_bytes() if (out / f"{name}.txt").exists() else None for name in names]
+        results[workers] = outcome, written
+
+    assert results[2] == results[1]
+    assert [status for status, _ in results[1][0]] == [0, 1, 1, 0]  # admin, bad_login, eof, standard
+
+
+def test_session_dir_merges_sessions_that_ended_normally(tmp_path, capsys):
+    accounts = str(FRONTEND / "Current_Bank_Accounts.txt")
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    for name, script in SCRIPTS.items():
+        (scripts / f"{name}.txt").write_text(script)
+    merged = tmp_path / "merged_transactions.txt"
+
+    assert run_session_dir(accounts, str(scripts), str(tmp_path / "out"), str(merged)) == 2
+    assert "Malformed session" not in capsys.readouterr().out
+    assert merged.read_bytes() == (tmp_path / "out" / "admin.txt").read_bytes() \
+        + (tmp_path / "out" / "standard.txt").read_bytes()
+    index = session_index.read_index(session_index.index_path(str(merged)))
+    assert index.matches(str(merged)) and len(index) == 2
+    assert list(index.counts) == list(session_index.build_index(str(merged)).counts)
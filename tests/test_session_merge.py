@@ -0,0 +1,106 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the streaming session merger in session_merge.py
+# -------------------------------------------------------------------------------------------
+
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import session_index
+from session_merge import SessionMerger
+
+ROOT = Path(__file__).resolve().parent.parent
+END_OF_SESSION = "00                      00000 00000.00 00\n"
+
+
+def transaction(code, name, number, amount, misc):
+    return f"{code} {name:<20} {number:05d} {amount:08.2f} {misc}\n"
+
+
+def write_sessions(directory, texts):
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for number, text in enumerate(texts):
+        path = directory / f"session{number:03d}.txt"
+        path.write_bytes(text.encode())
+        paths.append(path)
+    return paths
+
+
+def merge(merged, paths, chunk_size=1 << 20):
+    with SessionMerger(str(merged), chunk_size) as merger:
+        problems = [merger.add(str(path)) for path in paths]
+    return problems
+
+
+def assert_index_is_fresh(merged):
+    index = session_index.read_index(session_index.index_path(str(merged)))
+    rebuilt = session_index.build_index(str(merged))
+    assert index.matches(str(merged))
+    assert list(index.offsets) == list(rebuilt.offsets) and list(index.counts) == list(rebuilt.counts)
+    return index
+
+
+@pytest.mark.parametrize("chunk_size", [1, 42, 100, 1 << 20])
+def test_valid_sessions_merge_like_cat(tmp_path, capsys, chunk_size):
+    texts = ["".join(transaction("04", f"user_{n}", 1000 + n, n, "NP") for n in range(count)) + END_OF_SESSION
+             for count in (3, 0, 7, 1, 30)]
+    paths = write_sessions(tmp_path / "sessions", texts)
+    merged = tmp_path / "merged_transactions.txt"
+    merged.write_text("left over from yesterday\n")
+
+    assert merge(merged, paths, chunk_size) == [0] * 5
+    assert merged.read_text() == "".join(texts)
+    assert capsys.readouterr().out == ""
+    assert list(assert_index_is_fresh(merged).counts) == [3, 0, 7, 1, 30]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50, 1 << 20])
+def test_problems_are_reported_and_terminators_repaired(tmp_path, capsys, chunk_size):
+    record = transaction("04", "user_one", 1000, 5, "NP")
+    texts = [
+        record + transaction("04", "user_one", 1000, 5, "NPX") + END_OF_SESSION,  # 42 characters
+        record + END_OF_SESSION + record + END_OF_SESSION,  # two sessions in one file
+        record + record,  # no end-of-session record
+        record + END_OF_SESSION.rstrip("\n"),  # no line ending
+        (record + END_OF_SESSION).replace("\n", "\r\n"),
+        transaction("04", "Zoë", 1000, 5, "NP") + END_OF_SESSION,  # 41 characters, 42 bytes
+        "",
+    ]
+    paths = write_sessions(tmp_path / "sessions", texts)
+    merged = tmp_path / "merged_transactions.txt"
+
+    assert merge(merged, paths, chunk_size) == [1, 1, 1, 0, 0, 0, 1]
+    assert capsys.readouterr().out.splitlines() == [
+        f"ERROR: Malformed session - {paths[0]} line 2: Invalid length (42 chars, expected 41)",
+        f"ERROR: Malformed session - {paths[1]} line 2: End-of-session record before the end of the session",
+        f"ERROR: Malformed session - {paths[2]} line 2: No end-of-session record, one is appended",
+        f"ERROR: Malformed session - {paths[6]} line 1: Empty session file",
+    ]
+    assert merged.read_bytes() == "".join(texts[:2] + [record * 2 + END_OF_SESSION, record + END_OF_SESSION]
+                                          + texts[4:]).encode()
+    assert list(assert_index_is_fresh(merged).counts) == [2, 1, 1, 2, 1, 1, 1]
+
+
+def test_many_sessions_read_back_through_the_index(tmp_path):
+    texts = [transaction("01", f"user_{n}", n, n % 500, "NP") * (n % 4) + END_OF_SESSION for n in range(2000)]
+    paths = write_sessions(tmp_path / "sessions", texts)
+    merged = tmp_path / "merged_transactions.txt"
+    merge(merged, paths)
+
+    index = session_index.load_index(str(merged))
+    assert len(index) == 2000
+    assert [record.name for record in index.read_session(str(merged), 1999)] == ["user_1999"] * 3
+
+
+def test_command_line_merges_a_directory_in_name_order(tmp_path):
+    texts = [transaction("04", "b", 1001, 2, "NP") + END_OF_SESSION, transaction("04", "a", 1000, 1, "NP")]
+    write_sessions(tmp_path / "sessions", texts)
+    merged = tmp_path / "merged.txt"
+    result = subprocess.run([sys.executable, str(ROOT / "session_merge.py"), str(merged), str(tmp_path / "sessions")],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 1  # the second session has no end record
+    assert result.stdout.endswith(f"2 sessions, 2 transactions merged into {merged}\n")
+    assert merged.read_text() == texts[0] + texts[1] + END_OF_SESSION
+    assert_index_is_fresh(merged)
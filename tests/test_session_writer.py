@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------------------
+# This code tests the buffered session writer in Frontend/models/transaction_logger.py
+# -------------------------------------------------------------------------------------------
+
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+FRONTEND = Path(__file__).resolve().parent.parent / "Frontend"
+sys.path.insert(0, str(FRONTEND))
+
+from models.transaction_logger import SessionWriter, TransactionLogger
+
+
+@pytest.fixture
+def output_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(SessionWriter, "max_age", 3600.0)
+    yield tmp_path / "session.txt"
+    SessionWriter.close_all()
+
+
+def test_lines_are_buffered_until_end_of_session(output_file):
+    logger = TransactionLogger("user_one", 10.0, str(output_file))
+    logger.log_transaction("04", "user_one", "01000", 10.0, "NP")
+    logger.log_transaction("01", "user_one", "01000", 5.5, "NP")
+    assert not output_file.exists()
+
+    logger.write_end_of_session()
+    assert output_file.read_text() == ("04 user_one             01000 00010.00 NP\n"
+                                       "01 user_one             01000 00005.50 NP\n"
+                                       "00                      00000 00000.00 00\n")
+    assert str(output_file) not in SessionWriter.writers
+
+
+def test_size_threshold_flushes(output_file, monkeypatch):
+    monkeypatch.setattr(SessionWriter, "max_bytes", 80)
+    writer = SessionWriter.for_file(str(output_file))
+    writer.write("a" * 41)
+    assert not output_file.exists()
+    writer.write("b" * 41)
+    assert output_file.read_text() == "a" * 41 + "b" * 41
+
+
+def test_fsync_per_flush(output_file, monkeypatch):
+    synced = []
+    monkeypatch.setattr(SessionWriter, "fsync", True)
+    monkeypatch.setattr("os.fsync", synced.append)
+    writer = SessionWriter.for_file(str(output_file))
+    writer.write("line\n")
+    writer.flush()
+    assert synced == [writer.file.fileno()]
+
+
+def test_abnormal_exit_flushes_buffer(tmp_path):
+    output_file = tmp_path / "session.txt"
+    script = ("from models.transaction_logger import TransactionLogger\n"
+              f"TransactionLogger('user_one', 1.0, {str(output_file)!r}).log_transaction('04', 'user_one', '01000', 1.0, 'NP')\n"
+              "raise EOFError\n")
+    result = subprocess.run([sys.executable, "-c", script], cwd=FRONTEND, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert output_file.read_text() == "04 user_one             01000 00001.00 NP\n"
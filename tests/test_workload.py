@@ -0,0 +1,65 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the seeded workload generator in benchmarks/workload.py
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+from banking_system import BankingSystem
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import workload  # noqa: E402
+
+
+@pytest.fixture
+def generated(tmp_path):
+    def generate(seed, accounts=300, transactions=3000, directory=tmp_path):
+        master = directory / f"master_{seed}.txt"
+        merged = directory / f"transactions_{seed}.txt"
+        book = workload.write_master(str(master), accounts, seed)
+        workload.write_transactions(str(merged), book, transactions, seed)
+        return master, merged
+    return generate
+
+
+def test_same_seed_same_files(generated, tmp_path):
+    first = generated(5)
+    (tmp_path / "again").mkdir()
+    second = generated(5, directory=tmp_path / "again")
+    assert first[0].read_bytes() == second[0].read_bytes()
+    assert first[1].read_bytes() == second[1].read_bytes()
+    assert generated(6)[1].read_bytes() != first[1].read_bytes()
+
+
+def test_record_layout(generated):
+    master, merged = generated(1)
+    assert all(len(line) == 45 for line in master.read_text().splitlines())
+
+    lines = merged.read_text().splitlines()
+    assert all(len(line) == 41 for line in lines)
+    assert lines[-1] == "00                      00000 00000.00 00"
+    assert sum(line.startswith("00") for line in lines) > 1
+    assert {line[:2] for line in lines} == {"00", "01", "03", "04", "05", "06", "07", "08"}
+
+
+def test_backend_runs_generated_day(generated, tmp_path):
+    master, merged = generated(2, accounts=2000, transactions=20000)
+    system = BankingSystem(str(master), str(merged))
+    system.new_master_file = str(tmp_path / "new_master.txt")
+    system.new_current_file = str(tmp_path / "new_current.txt")
+    system.apply_transactions()
+    system.calculate_transaction_fee()
+    system.write_output_files()  # validates every current record
+
+    assert all(len(line) == 45 for line in (tmp_path / "new_master.txt").read_text().splitlines())
+
+
+def test_full_number_space_never_overflows(generated, tmp_path):
+    master, merged = generated(3, accounts=99990, transactions=2000)
+    system = BankingSystem(str(master), str(merged))
+    system.new_master_file = str(tmp_path / "new_master.txt")
+    system.new_current_file = str(tmp_path / "new_current.txt")
+    system.apply_transactions()
+    system.write_output_files()  # raises ValueError on an account number above 99999
+
+    assert max(int(number) for number in system.accounts) <= 99999
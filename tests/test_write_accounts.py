@@ -0,0 +1,72 @@
+# -------------------------------------------------------------------------------------------
+# This code checks the single-pass write.write_account_files against the per-file writers
+# -------------------------------------------------------------------------------------------
+
+import random
+import pytest
+import write
+from account_record import AccountRecord
+from account_store import AccountStore
+from banking_system import BankingSystem
+
+
+def random_store(seed, shuffled=False):
+    rng = random.Random(seed)
+    numbers = list(range(1000, 1300))
+    if shuffled:
+        rng.shuffle(numbers)
+    store = AccountStore()
+    for number in numbers:
+        store[str(number).zfill(5)] = AccountRecord(
+            number, f"user_{number}", rng.choice("AD"), rng.randint(0, 9999999),
+            rng.randint(0, 9999), rng.choice(["SP", "NP"]))
+    return store
+
+
+def legacy_files(tmp_path, accounts):
+    system = BankingSystem.__new__(BankingSystem)
+    system.accounts = accounts
+    system.write_master_file(list(accounts.values()), str(tmp_path / "legacy_master.txt"))
+    write.write_new_current_accounts(accounts.values(), str(tmp_path / "legacy_current.txt"))
+    return (tmp_path / "legacy_master.txt").read_bytes(), (tmp_path / "legacy_current.txt").read_bytes()
+
+
+@pytest.mark.parametrize("shuffled", [False, True])
+def test_matches_per_file_writers(tmp_path, shuffled):
+    accounts = random_store(7, shuffled)
+    write.write_account_files(accounts.values(), str(tmp_path / "master.txt"), str(tmp_path / "current.txt"))
+
+    master, current = legacy_files(tmp_path, accounts)
+    assert (tmp_path / "master.txt").read_bytes() == master
+    assert (tmp_path / "current.txt").read_bytes() == current
+
+
+def test_plain_dicts_and_empty_book(tmp_path):
+    accounts = [{"account_number": "00042", "name": "joe", "status": "A", "balance": 12.5,
+                 "total_transactions": 3, "plan": "SP"}]
+    write.write_account_files(accounts, str(tmp_path / "master.txt"), str(tmp_path / "current.txt"))
+    assert (tmp_path / "master.txt").read_text() == (
+        "00042 joe                  A 00012.50 0003 SP\n"
+        "00043 END_OF_FILE          A 00000.00 0000 NP\n")
+    assert (tmp_path / "current.txt").read_text() == (
+        "00042 joe                  A 00012.50 SP\n" + write.CURRENT_EOF_LINE)
+
+    write.write_account_files([], str(tmp_path / "master.txt"), str(tmp_path / "current.txt"))
+    assert (tmp_path / "master.txt").read_text() == "10001 END_OF_FILE          A 00000.00 0000 NP\n"
+    assert (tmp_path / "current.txt").read_text() == write.CURRENT_EOF_LINE
+
+
+def test_invalid_record_leaves_old_files(tmp_path):
+    master = tmp_path / "master.txt"
+    current = tmp_path / "current.txt"
+    master.write_text("old master\n")
+    current.write_text("old current\n")
+
+    accounts = random_store(3)
+    accounts["01100"].balance_cents = -1
+    with pytest.raises(ValueError, match="Negative balance"):
+        write.write_account_files(accounts.values(), str(master), str(current))
+
+    assert master.read_text() == "old master\n"
+    assert current.read_text() == "old current\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["current.txt", "master.txt"]
@@ -0,0 +1,33 @@
+from typing import NamedTuple
+
+
+class TransactionRecord(NamedTuple):
+    """
+    Compact merged-file transaction: a tuple of the two-digit code, the
+    account holder name, the account number as written (5 digits), the
+    amount in integer cents and the misc field (plan type or payee), in
+    less than half the memory of the dict per line it replaces. Fields are
+    read as attributes; record["amount"] style access still works like the
+    old transaction dict.
+    """
+    code: str
+    name: str
+    account_number: str
+    amount: int
+    misc: str
+
+    def __getitem__(self, key):
+        if type(key) is str:
+            if key not in TransactionRecord._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in TransactionRecord._fields else default
+
+    # Builds a record from a transaction dict (or any mapping with the same keys)
+    @classmethod
+    def from_mapping(cls, transaction) -> "TransactionRecord":
+        return cls(transaction["code"], transaction.get("name", ""), transaction.get("account_number", ""),
+                   transaction.get("amount", 0), transaction.get("misc", ""))
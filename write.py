@@ -1,3 +1,10 @@
+import os
+from account_record import AccountRecord, balance_cents
+import money
+
+CHUNK_LINES = 16384  # lines joined per file.write call (about 700 KB of master records)
+
+
 def write_new_current_accounts(accounts, file_path):
     """
     Writes Current Bank Accounts File with strict validation
@@ -6,40 +13,135 @@ def write_new_current_accounts(accounts, file_path):
     """
     with open(file_path, 'w') as file:
         for acc in accounts:
-            # Validate account number
-            if not isinstance(acc['account_number'], str) or not acc['account_number'].isdigit():
-                raise ValueError(f"Account number must be numeric string, got {acc['account_number']}")
-            if len(acc['account_number']) > 5:
-                raise ValueError(f"Account number exceeds 5 digits: {acc['account_number']}")
-
-            # Validate name
-            if len(acc['name']) > 20:
-                raise ValueError(f"Account name exceeds 20 characters: {acc['name']}")
-
-            # Validate status
-            if acc['status'] not in ('A', 'D'):
-                raise ValueError(f"Invalid status '{acc['status']}'. Must be 'A' or 'D'")
-
-            # Validate balance with explicit negative check
-            if not isinstance(acc['balance'], (int, float)):
-                raise ValueError(f"Balance must be numeric, got {type(acc['balance'])}")
-            if acc['balance'] < 0:
-                raise ValueError(f"Negative balance detected: {acc['balance']}")
-            if acc['balance'] > 99999.99:
-                raise ValueError(f"Balance exceeds maximum $99999.99: {acc['balance']}")
-
-            # Validate plan type
-            plan = acc.get('plan', 'NP')
-            if plan not in ('SP', 'NP'):
-                raise ValueError(f"Invalid plan type '{plan}'. Must be SP or NP")
-
-            # Format fields
-            acc_num = acc['account_number'].zfill(5)
-            name = acc['name'].ljust(20)[:20]
-            balance = f"{acc['balance']:08.2f}"
+            validate_current_account(acc)
 
             # Write line (37 chars + plan type = 39 chars total)
-            file.write(f"{acc_num} {name} {acc['status']} {balance} {plan}\n")
+            file.write(format_current_line(acc))
 
         # Add END_OF_FILE marker
-        file.write("00000 END_OF_FILE          A 00000.00 NP\n")
\ No newline at end of file
+        file.write(CURRENT_EOF_LINE)
+
+
+def validate_current_account(acc):
+    """
+    Raises ValueError if the account cannot be written to the Current Bank
+    Accounts File
+    """
+    if type(acc) is AccountRecord and 0 <= acc.number <= 99999 and len(acc.name) <= 20 \
+            and acc.status in ('A', 'D') and 0 <= acc.balance_cents <= 9999999 and acc.plan in ('SP', 'NP'):
+        return  # record fast path; anything else goes through the full checks
+
+    # Validate account number
+    if not isinstance(acc['account_number'], str) or not acc['account_number'].isdigit():
+        raise ValueError(f"Account number must be numeric string, got {acc['account_number']}")
+    if len(acc['account_number']) > 5:
+        raise ValueError(f"Account number exceeds 5 digits: {acc['account_number']}")
+
+    # Validate name
+    if len(acc['name']) > 20:
+        raise ValueError(f"Account name exceeds 20 characters: {acc['name']}")
+
+    # Validate status
+    if acc['status'] not in ('A', 'D'):
+        raise ValueError(f"Invalid status '{acc['status']}'. Must be 'A' or 'D'")
+
+    # Validate balance with explicit negative check
+    if not isinstance(acc['balance'], (int, float)):
+        raise ValueError(f"Balance must be numeric, got {type(acc['balance'])}")
+    if acc['balance'] < 0:
+        raise ValueError(f"Negative balance detected: {acc['balance']}")
+    if acc['balance'] > 99999.99:
+        raise ValueError(f"Balance exceeds maximum $99999.99: {acc['balance']}")
+
+    # Validate plan type
+    plan = acc.get('plan', 'NP')
+    if plan not in ('SP', 'NP'):
+        raise ValueError(f"Invalid plan type '{plan}'. Must be SP or NP")
+
+
+CURRENT_EOF_LINE = "00000 END_OF_FILE          A 00000.00 NP\n"
+
+
+def format_current_line(acc):
+    """
+    Formats one Current Bank Accounts File line (no validation)
+    Format: NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP TT
+    """
+    if type(acc) is AccountRecord:
+        return f"{acc.number:05d} {acc.name[:20]:<20} {acc.status} {money.format_cents(acc.balance_cents)} {acc.plan}\n"
+    acc_num = acc['account_number'].zfill(5)
+    name = acc['name'].ljust(20)[:20]
+    balance = money.format_cents(balance_cents(acc))
+    return f"{acc_num} {name} {acc['status']} {balance} {acc.get('plan', 'NP')}\n"
+
+
+def format_master_line(acc):
+    """
+    Formats one Master Bank Accounts File line
+    Format: NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP CCCC TT
+    Where CCCC is the transaction count
+    """
+    if type(acc) is AccountRecord:
+        return (f"{acc.number:05d} {acc.name:<20} {acc.status} {money.format_cents(acc.balance_cents)} "
+                f"{acc.total_transactions:04d} {acc.plan}\n")
+    return (f"{acc['account_number'].zfill(5)} {acc['name'].ljust(20, ' ')} {acc['status']} "
+            f"{money.format_cents(balance_cents(acc))} {str(acc['total_transactions']).zfill(4)} {acc['plan']}\n")
+
+
+def format_master_eof_line(last_account_number):
+    """
+    Formats the Master Bank Accounts File END_OF_FILE record, numbered one
+    past the last account
+    """
+    return f"{str(last_account_number + 1).zfill(5)} END_OF_FILE          A 00000.00 0000 NP\n"
+
+
+def write_account_files(accounts, master_path, current_path):
+    """
+    Writes the Master and Current Bank Accounts Files from one pass over the
+    accounts in account number order. The master file is sorted with the
+    END_OF_FILE record numbered one past the highest account; the current
+    file keeps the given order, which is normally already sorted, so both
+    lines come from the same pass (otherwise the current lines take a second
+    pass in the given order). Current records are validated like
+    write_new_current_accounts before either file is touched. Each file is
+    written to a temp file in large chunks and renamed over the old one.
+    With master_path None only the current file is written.
+    """
+    accounts = list(accounts)
+    numbers = [acc.number if type(acc) is AccountRecord else int(acc['account_number']) for acc in accounts]
+    in_order = all(a < b for a, b in zip(numbers, numbers[1:]))
+    ordered = accounts if in_order else [acc for _, acc in sorted(zip(numbers, accounts), key=lambda pair: pair[0])]
+
+    master_lines = []
+    current_lines = []
+    for acc in ordered if master_path is not None else ():
+        master_lines.append(format_master_line(acc))
+        if in_order:
+            validate_current_account(acc)
+            current_lines.append(format_current_line(acc))
+    if not in_order or master_path is None:
+        for acc in accounts:
+            validate_current_account(acc)
+            current_lines.append(format_current_line(acc))
+
+    master_lines.append(format_master_eof_line(max(numbers) if numbers else 10000))
+    current_lines.append(CURRENT_EOF_LINE)
+
+    if master_path is not None:
+        _replace_file(master_path, master_lines)
+    _replace_file(current_path, current_lines)
+
+
+# Writes lines to a temp file next to file_path, then renames it into place
+def _replace_file(file_path, lines):
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w') as file:
+            for start in range(0, len(lines), CHUNK_LINES):
+                file.write("".join(lines[start:start + CHUNK_LINES]))
+        os.replace(temp_path, file_path)  # readers never see a partial file
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise